@@ -1,6 +1,6 @@
 from .base_client import BaseAIClient
 from .deepseek_client import DeepSeekClient
 from .openai_client import OpenAIClient
+from .factory import get_ai_client, get_provider
 
-__all__ = ['BaseAIClient', 'DeepSeekClient', 'OpenAIClient']
-
+__all__ = ['BaseAIClient', 'DeepSeekClient', 'OpenAIClient', 'get_ai_client', 'get_provider']
@@ -0,0 +1,32 @@
+"""
+AI客户端工厂
+"""
+from .deepseek_client import DeepSeekClient
+from .openai_client import OpenAIClient
+
+
+def get_provider(model: str) -> str:
+    """模型所属的服务商（与 get_ai_client 的选择规则一致），用于按服务商限制并发"""
+    if model and 'gpt' in model.lower() and 'deepseek' not in model.lower():
+        return 'openai'
+    return 'deepseek'
+
+
+def get_ai_client(model: str, api_key: str, api_endpoint: str = None):
+    """
+    根据模型名选择AI客户端
+
+    Args:
+        model: 模型名（deepseek-chat、deepseek-reasoner、gpt-5等）
+        api_key: API Key
+        api_endpoint: 自定义API端点，为空时使用客户端默认值
+    """
+    model = model or 'deepseek-chat'
+    if 'deepseek' in model.lower():
+        # DeepSeek系列：deepseek-chat, deepseek-reasoner
+        return DeepSeekClient(api_key=api_key, api_endpoint=api_endpoint, model=model)
+    if 'gpt' in model.lower():
+        # OpenAI系列：gpt-5
+        return OpenAIClient(api_key=api_key, api_endpoint=api_endpoint, model=model)
+    # 默认使用DeepSeek-Chat
+    return DeepSeekClient(api_key=api_key, api_endpoint=api_endpoint, model='deepseek-chat')
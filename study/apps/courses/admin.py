@@ -2,7 +2,8 @@
 课程模块Admin配置
 """
 from django.contrib import admin
-from .models import Subject, Course, KnowledgeSummary, StudyProgress
+from apps.search.admin import IndexedSearchMixin
+from .models import Subject, Course, Textbook, TextbookPage, KnowledgeSummary, StudyProgress
 
 
 @admin.register(Subject)
@@ -29,6 +30,9 @@ class CourseAdmin(admin.ModelAdmin):
         ('课程内容', {
             'fields': ('outline', 'keywords', 'cover_image')
         }),
+        ('课本来源', {
+            'fields': ('pdf_source', 'pdf_page_range')
+        }),
         ('其他设置', {
             'fields': ('difficulty', 'order', 'is_active')
         }),
@@ -39,11 +43,38 @@ class CourseAdmin(admin.ModelAdmin):
     )
 
 
+class TextbookPageInline(admin.TabularInline):
+    model = TextbookPage
+    fields = ['page_number', 'char_count']
+    readonly_fields = ['page_number', 'char_count']
+    extra = 0
+    show_change_link = True
+
+
+@admin.register(Textbook)
+class TextbookAdmin(admin.ModelAdmin):
+    list_display = ['id', 'pdf_source', 'subject', 'page_count', 'char_count', 'updated_at']
+    list_filter = ['subject']
+    search_fields = ['pdf_source']
+    readonly_fields = ['page_count', 'char_count', 'created_at', 'updated_at']
+    inlines = [TextbookPageInline]
+
+
+@admin.register(TextbookPage)
+class TextbookPageAdmin(IndexedSearchMixin, admin.ModelAdmin):
+    list_display = ['id', 'textbook', 'page_number', 'char_count']
+    list_filter = ['textbook']
+    search_fields = ['textbook__pdf_source']
+    search_doc_type = 'textbook_page'
+    readonly_fields = ['start_offset', 'char_count']
+
+
 @admin.register(KnowledgeSummary)
-class KnowledgeSummaryAdmin(admin.ModelAdmin):
+class KnowledgeSummaryAdmin(IndexedSearchMixin, admin.ModelAdmin):
     list_display = ['id', 'course', 'version', 'generated_at']
     list_filter = ['generated_at']
-    search_fields = ['course__title', 'content']
+    search_fields = ['course__title']
+    search_doc_type = 'summary'
     readonly_fields = ['generated_at']
 
 
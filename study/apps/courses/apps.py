@@ -6,3 +6,6 @@ class CoursesConfig(AppConfig):
     name = 'apps.courses'
     verbose_name = '课程管理'
 
+    def ready(self):
+        from .signals import connect_catalogue_signals
+        connect_catalogue_signals()
@@ -0,0 +1,105 @@
+"""
+课程目录缓存
+
+学科、课程列表、课程详情属于变化很少的目录数据，按查询参数和全局目录版本号缓存。
+Subject/Course/KnowledgeSummary/Exercise 任一变更都会递增版本号，旧缓存自然失效。
+"""
+import hashlib
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.http import parse_etags
+from rest_framework import status
+from rest_framework.response import Response
+from utils.response import APIResponse
+
+CATALOGUE_VERSION_KEY = 'catalogue:version'
+
+
+def get_catalogue_version():
+    """获取当前目录版本号（不存在时初始化为1）"""
+    version = cache.get(CATALOGUE_VERSION_KEY)
+    if version is None:
+        cache.add(CATALOGUE_VERSION_KEY, 1, timeout=None)
+        version = cache.get(CATALOGUE_VERSION_KEY, 1)
+    return version
+
+
+def bump_catalogue_version():
+    """递增目录版本号，使所有目录缓存失效"""
+    try:
+        return cache.incr(CATALOGUE_VERSION_KEY)
+    except ValueError:
+        # 版本号不存在（缓存被清空或刚启动），重新初始化
+        cache.add(CATALOGUE_VERSION_KEY, 1, timeout=None)
+        return cache.incr(CATALOGUE_VERSION_KEY)
+
+
+def catalogue_cache_key(name, params=None, *parts):
+    """
+    生成目录缓存键
+
+    Args:
+        name: 接口名称，如 subjects/courses/course-detail
+        params: 查询参数（QueryDict或dict），按键排序后参与计算
+        *parts: 其他需要区分的值（如课程ID、Host）
+    """
+    items = []
+    if params:
+        for key in sorted(params.keys()):
+            values = params.getlist(key) if hasattr(params, 'getlist') else [params[key]]
+            items.append((key, [str(v) for v in values]))
+    raw = json.dumps([items, [str(p) for p in parts]], ensure_ascii=False)
+    digest = hashlib.sha1(raw.encode('utf-8')).hexdigest()
+    return f"catalogue:v{get_catalogue_version()}:{name}:{digest}"
+
+
+def compute_etag(data):
+    """根据响应数据计算强ETag"""
+    raw = json.dumps(data, sort_keys=True, ensure_ascii=False, cls=DjangoJSONEncoder)
+    return '"%s"' % hashlib.sha256(raw.encode('utf-8')).hexdigest()
+
+
+def get_or_set_catalogue(cache_key, builder):
+    """
+    读取目录缓存，未命中时调用builder生成数据
+
+    Returns:
+        (data, etag)
+    """
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    data = builder()
+    cached = (data, compute_etag(data))
+    cache.set(cache_key, cached, settings.CATALOGUE_CACHE_TIMEOUT)
+    return cached
+
+
+def etag_response(request, data, etag=None, message="success"):
+    """
+    返回带ETag的成功响应，If-None-Match命中时返回304
+
+    Args:
+        request: 请求对象
+        data: 响应数据
+        etag: 已计算好的ETag，为空时根据data计算
+        message: 响应消息
+    """
+    etag = etag or compute_etag(data)
+
+    if_none_match = request.META.get('HTTP_IF_NONE_MATCH')
+    if if_none_match:
+        # 弱比较：去掉W/前缀后比较
+        client_etags = [tag[2:] if tag.startswith('W/') else tag for tag in parse_etags(if_none_match)]
+        if '*' in client_etags or etag in client_etags:
+            response = Response(status=status.HTTP_304_NOT_MODIFIED)
+            response['ETag'] = etag
+            return response
+
+    response = APIResponse.success(data, message=message)
+    response['ETag'] = etag
+    return response
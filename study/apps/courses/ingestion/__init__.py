@@ -0,0 +1,11 @@
+"""
+课本导入流程（manage.py ingest_textbooks）
+
+- manifest: 课本清单（学科/年级/学期 -> PDF）
+- extraction: PDF逐页文字并行提取和缓存（不依赖Django，可在子进程中直接导入）
+- normalize: 课本文字规范化（去页眉页脚、接断行等，减少发送给AI的token）
+- toc: 目录解析，生成课程CSV
+- importer: 课程CSV批量导入
+- page_ranges: 课程页码范围定位
+- pipeline: 分阶段、可续跑的导入流程
+"""
@@ -0,0 +1,221 @@
+"""
+PDF文字并行提取
+
+- 按页分块，使用多进程并行调用 pdfplumber 的 extract_text()
+- 每页结果写入磁盘缓存，缓存键为：文件sha256 + 提取器版本 + 页码
+- 文件未变化时直接读取缓存；中途中断后重新运行只提取缺失的页面
+
+本模块不依赖Django（子进程中会直接导入），配置由调用方传入。
+"""
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+try:
+    import pdfplumber
+except ImportError:
+    pdfplumber = None
+
+# 提取逻辑变化时递增，旧缓存自动失效
+EXTRACTOR_VERSION = 'pdfplumber-1'
+
+# 每个子任务处理的页数（子进程每个任务打开一次PDF）
+DEFAULT_CHUNK_SIZE = 16
+
+# 未配置Django时使用的缓存目录（与settings.PDF_TEXT_CACHE_DIR默认值一致）
+DEFAULT_CACHE_DIR = Path(os.environ.get('PDF_TEXT_CACHE_DIR', Path(__file__).resolve().parents[3] / 'pdf_cache'))
+
+
+def _require_pdfplumber():
+    if pdfplumber is None:
+        raise ImportError("缺少依赖 pdfplumber，请先安装: pip install pdfplumber")
+
+
+def file_sha256(path, chunk_size=1024 * 1024):
+    """计算文件sha256"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class PageTextCache:
+    """
+    逐页文字缓存
+
+    目录结构：<cache_dir>/<sha256>/<提取器版本>/0001.txt（页码从1开始），
+    meta.json 记录总页数。
+    """
+
+    def __init__(self, cache_dir, sha256, version=EXTRACTOR_VERSION):
+        self.path = Path(cache_dir) / sha256 / version
+
+    def _page_path(self, page_number):
+        return self.path / f'{page_number:04d}.txt'
+
+    def get_page_count(self):
+        try:
+            with open(self.path / 'meta.json', encoding='utf-8') as f:
+                return json.load(f)['page_count']
+        except (OSError, ValueError, KeyError):
+            return None
+
+    def set_page_count(self, page_count, source=''):
+        self._write(self.path / 'meta.json', json.dumps({'page_count': page_count, 'source': source},
+                                                        ensure_ascii=False))
+
+    def get(self, page_number):
+        """读取某页缓存，不存在时返回None"""
+        try:
+            return self._page_path(page_number).read_text(encoding='utf-8')
+        except OSError:
+            return None
+
+    def set(self, page_number, text):
+        self._write(self._page_path(page_number), text)
+
+    def _write(self, path, text):
+        # 先写临时文件再替换，中断时不会留下不完整的缓存
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(f'{path.name}.{os.getpid()}.tmp')
+        tmp_path.write_text(text, encoding='utf-8')
+        os.replace(tmp_path, path)
+
+
+class ExtractionResult:
+    """单本PDF的提取结果"""
+
+    def __init__(self, source, sha256, pages, cached_pages, extracted_pages, elapsed):
+        self.source = source
+        self.sha256 = sha256
+        self.pages = pages  # [(页码, 文字), ...]，页码为PDF物理页码（从1开始）
+        self.cached_pages = cached_pages
+        self.extracted_pages = extracted_pages
+        self.elapsed = elapsed
+
+    @property
+    def page_count(self):
+        return len(self.pages)
+
+    @property
+    def pages_per_second(self):
+        return self.page_count / self.elapsed if self.elapsed > 0 else float('inf')
+
+    def non_empty_pages(self):
+        """去掉空白页"""
+        return [(number, text) for number, text in self.pages if text.strip()]
+
+    def summary(self):
+        return (f"{self.page_count} 页（缓存 {self.cached_pages}，新提取 {self.extracted_pages}），"
+                f"用时 {self.elapsed:.1f} 秒，{self.pages_per_second:.1f} 页/秒")
+
+
+def _extract_page_chunk(pdf_path, page_numbers):
+    """子进程任务：打开一次PDF，提取一组页面"""
+    _require_pdfplumber()
+    results = []
+    with pdfplumber.open(pdf_path) as pdf:
+        for page_number in page_numbers:
+            try:
+                text = pdf.pages[page_number - 1].extract_text() or ''
+            except Exception:
+                text = ''  # 个别页面解析失败时按空白页处理，与原脚本一致
+            results.append((page_number, text))
+    return results
+
+
+def _count_pages(pdf_path):
+    _require_pdfplumber()
+    with pdfplumber.open(pdf_path) as pdf:
+        return len(pdf.pages)
+
+
+def extract_pages(pdf_path, cache_dir=DEFAULT_CACHE_DIR, workers=0, max_pages=None, chunk_size=DEFAULT_CHUNK_SIZE, progress=None):
+    """
+    提取PDF每页文字（优先读取缓存）
+
+    Args:
+        pdf_path: PDF路径
+        cache_dir: 缓存目录
+        workers: 进程数，0表示CPU核数，1表示在当前进程中串行提取
+        max_pages: 只提取前N页（如读取目录），为None时提取全部
+        chunk_size: 每个子任务的页数
+        progress: 进度回调 progress(已完成页数, 总页数)
+
+    Returns:
+        ExtractionResult
+    """
+    start = time.perf_counter()
+    pdf_path = Path(pdf_path)
+    sha256 = file_sha256(pdf_path)
+    cache = PageTextCache(cache_dir, sha256)
+
+    page_count = cache.get_page_count()
+    if page_count is None:
+        page_count = _count_pages(pdf_path)
+        cache.set_page_count(page_count, source=pdf_path.name)
+    if max_pages is not None:
+        page_count = min(page_count, max_pages)
+
+    texts = {}
+    missing = []
+    for page_number in range(1, page_count + 1):
+        text = cache.get(page_number)
+        if text is None:
+            missing.append(page_number)
+        else:
+            texts[page_number] = text
+    cached_pages = len(texts)
+
+    chunks = [missing[i:i + chunk_size] for i in range(0, len(missing), chunk_size)]
+    workers = workers or os.cpu_count() or 1
+
+    def collect(results):
+        for page_number, text in results:
+            cache.set(page_number, text)
+            texts[page_number] = text
+        if progress:
+            progress(len(texts), page_count)
+
+    if workers == 1 or len(chunks) <= 1:
+        for chunk in chunks:
+            collect(_extract_page_chunk(str(pdf_path), chunk))
+    elif chunks:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            futures = [executor.submit(_extract_page_chunk, str(pdf_path), chunk) for chunk in chunks]
+            for future in as_completed(futures):
+                collect(future.result())
+
+    pages = [(page_number, texts[page_number]) for page_number in range(1, page_count + 1)]
+    return ExtractionResult(
+        source=pdf_path.name,
+        sha256=sha256,
+        pages=pages,
+        cached_pages=cached_pages,
+        extracted_pages=len(missing),
+        elapsed=time.perf_counter() - start
+    )
+
+
+def extract_pages_with_settings(pdf_path, **kwargs):
+    """使用Django配置（缓存目录、进程数）提取PDF文字"""
+    from django.conf import settings
+
+    kwargs.setdefault('workers', settings.PDF_EXTRACT_WORKERS)
+    return extract_pages(pdf_path, settings.PDF_TEXT_CACHE_DIR, **kwargs)
+
+
+def progress_printer(every=20):
+    """生成进度回调：每完成every页输出一次"""
+    state = {'last': 0}
+
+    def report(done, total):
+        if done == total or done - state['last'] >= every:
+            state['last'] = done
+            print(f"     进度: {done}/{total} 页")
+
+    return report
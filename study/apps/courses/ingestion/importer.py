@@ -0,0 +1,214 @@
+"""
+课程目录批量导入
+
+读取课程CSV，按 (学科, 年级, 学期, 课程序号) 与数据库对比（一次查询），
+只写入有变化的行：新课程插入，已存在的课程更新标题和关键词
+（不覆盖大纲、难度等在后台维护的字段），全部写入在一个事务中完成。
+"""
+import csv
+
+from django.db import connection, transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from apps.courses.models import Course, Subject
+from apps.courses.signals import courses_bulk_saved
+from .manifest import GRADE_LABELS, SEMESTER_LABELS, SUBJECT_NAMES
+
+SUBJECT_CODES = {name: code for code, name in SUBJECT_NAMES.items()}
+GRADE_CODES = {label: code for code, label in GRADE_LABELS.items()}
+GRADE_CODES.update({'七年级': 'grade1', '八年级': 'grade2', '九年级': 'grade3'})
+SEMESTER_CODES = {label: code for code, label in SEMESTER_LABELS.items()}
+
+UPSERT_BATCH_SIZE = 500
+
+
+def read_course_csv(path):
+    """
+    读取课程CSV
+
+    CSV格式：
+    年级,学期,学科,课程号,标题,关键词
+    初一,上,英语,1,Unit 1 School life,school|daily routine
+
+    Returns:
+        [{'subject', 'grade', 'semester', 'course_number', 'title', 'keywords'}, ...]
+
+    Raises:
+        ValueError: 年级/学期/学科无法识别或课程号不是整数
+    """
+    rows = []
+    with open(path, encoding='utf-8-sig', newline='') as f:
+        for line_number, record in enumerate(csv.DictReader(f), 2):
+            def lookup(mapping, column):
+                value = (record.get(column) or '').strip()
+                if value not in mapping:
+                    raise ValueError(f'{path.name} 第{line_number}行：无法识别的{column} "{value}"')
+                return mapping[value]
+
+            try:
+                course_number = int(record['课程号'])
+            except (TypeError, ValueError):
+                raise ValueError(f'{path.name} 第{line_number}行：课程号必须是整数') from None
+
+            rows.append({
+                'subject': lookup(SUBJECT_CODES, '学科'),
+                'grade': lookup(GRADE_CODES, '年级'),
+                'semester': lookup(SEMESTER_CODES, '学期'),
+                'course_number': course_number,
+                'title': (record.get('标题') or '').strip(),
+                'keywords': (record.get('关键词') or '').strip(),
+            })
+    return rows
+
+
+def resolve_subjects(codes):
+    """一次查询取出学科，不存在的学科按默认名称创建"""
+    subjects = Subject.objects.in_bulk(codes, field_name='code')
+    for code in set(codes) - set(subjects):
+        subjects[code], _ = Subject.objects.get_or_create(
+            code=code, defaults={'name': SUBJECT_NAMES[code], 'is_active': True}
+        )
+    return subjects
+
+
+def course_key(row):
+    return row['subject'], row['grade'], row['semester'], row['course_number']
+
+
+def course_label(row):
+    """如：初一上 英语 第1课 Unit 1 School life"""
+    return (f"{GRADE_LABELS[row['grade']]}{SEMESTER_LABELS[row['semester']]} {SUBJECT_NAMES[row['subject']]} "
+            f"第{row['course_number']}课 {row['title']}")
+
+
+def course_keys_filter(rows):
+    """匹配rows中所有 (学科, 年级, 学期, 课程序号) 的查询条件"""
+    groups = {}
+    for row in rows:
+        groups.setdefault((row['subject'], row['grade'], row['semester']), []).append(row['course_number'])
+
+    condition = Q(pk__in=[])
+    for (subject, grade, semester), numbers in groups.items():
+        condition |= Q(subject__code=subject, grade=grade, semester=semester, course_number__in=numbers)
+    return condition
+
+
+class CourseDiff:
+    """CSV与数据库中课程的差异"""
+
+    def __init__(self):
+        self.created = []  # 新课程 [row, ...]
+        self.updated = []  # 有变化的课程 [(row, {字段: (旧值, 新值)}), ...]
+        self.unchanged = []  # 无变化的课程 [row, ...]
+        self.course_ids = []  # 实际写入的课程ID（dry_run时为空）
+
+    @property
+    def changed_rows(self):
+        return self.created + [row for row, _ in self.updated]
+
+    def summary(self):
+        return f'新增 {len(self.created)}，更新 {len(self.updated)}，未变化 {len(self.unchanged)}'
+
+
+def diff_courses(rows, pdf_source=None):
+    """
+    对比CSV与数据库（一次查询）
+
+    Args:
+        rows: read_course_csv 的返回值（重复的课程以最后一行为准）
+        pdf_source: 为None时不比较pdf_source
+    """
+    rows = list({course_key(row): row for row in rows}.values())
+    fields = ['title', 'keywords'] + (['pdf_source'] if pdf_source is not None else [])
+
+    existing = {}
+    values = Course.objects.filter(course_keys_filter(rows)).values(
+        'subject__code', 'grade', 'semester', 'course_number', *fields
+    )
+    for course in values:
+        existing[(course['subject__code'], course['grade'], course['semester'], course['course_number'])] = course
+
+    diff = CourseDiff()
+    for row in rows:
+        course = existing.get(course_key(row))
+        if course is None:
+            diff.created.append(row)
+            continue
+        new_values = dict(row, pdf_source=pdf_source)
+        changes = {field: (course[field], new_values[field]) for field in fields if course[field] != new_values[field]}
+        if changes:
+            diff.updated.append((row, changes))
+        else:
+            diff.unchanged.append(row)
+    return diff
+
+
+def import_courses(rows, pdf_source=None, dry_run=False):
+    """
+    导入课程：对比后只写入新增和有变化的行
+
+    Args:
+        rows: read_course_csv 的返回值
+        pdf_source: 课程对应的PDF文件名，为None时不修改已有课程的pdf_source
+        dry_run: 只对比不写入
+
+    Returns:
+        CourseDiff
+    """
+    diff = diff_courses(rows, pdf_source)
+    if not dry_run:
+        diff.course_ids = upsert_courses(diff.changed_rows, pdf_source)
+    return diff
+
+
+def upsert_courses(rows, pdf_source=None):
+    """
+    批量插入/更新课程
+
+    Args:
+        rows: read_course_csv 的返回值
+        pdf_source: 课程对应的PDF文件名，为None时不修改已有课程的pdf_source
+
+    Returns:
+        写入的课程ID列表
+    """
+    if not rows:
+        return []
+
+    update_fields = ['title', 'keywords', 'updated_at']
+    if pdf_source is not None:
+        update_fields.append('pdf_source')
+    options = {'update_conflicts': True, 'update_fields': update_fields}
+    # MySQL的 ON DUPLICATE KEY UPDATE 不能指定冲突字段（按唯一索引自动判断）
+    if connection.features.supports_update_conflicts_with_target:
+        options['unique_fields'] = ['subject', 'grade', 'semester', 'course_number']
+
+    now = timezone.now()
+    with transaction.atomic():
+        subjects = resolve_subjects({row['subject'] for row in rows})
+        courses = [
+            Course(
+                subject=subjects[row['subject']],
+                grade=row['grade'],
+                semester=row['semester'],
+                course_number=row['course_number'],
+                title=row['title'],
+                keywords=row['keywords'],
+                outline=f"{row['title']} - 知识点待AI生成",
+                difficulty='easy',
+                is_active=True,
+                content='',
+                pdf_source=pdf_source or '',
+                pdf_page_range='',
+                created_at=now,
+                updated_at=now,
+            )
+            for row in rows
+        ]
+        Course.objects.bulk_create(courses, batch_size=UPSERT_BATCH_SIZE, **options)
+        # bulk_create在MySQL上不返回主键，按唯一键重新查询
+        course_ids = list(Course.objects.filter(course_keys_filter(rows)).values_list('id', flat=True))
+
+    courses_bulk_saved.send(sender=Course, course_ids=course_ids)
+    return course_ids
@@ -0,0 +1,89 @@
+"""
+课本清单
+
+每本课本对应一个 学科/年级/学期 -> PDF文件 的条目，导入流程的所有阶段都从这里读取，
+新增课本时只需在 TEXTBOOKS 中添加一行。
+
+PDF路径：<TEXTBOOK_DIR>/<学科名>/<PDF文件名>
+CSV路径：<COURSE_CSV_DIR>/<学科名>/<学科名>-<年级><学期>.csv
+"""
+from pathlib import Path
+
+SUBJECT_NAMES = {
+    'chinese': '语文',
+    'math': '数学',
+    'english': '英语',
+}
+
+GRADE_LABELS = {
+    'grade1': '初一',
+    'grade2': '初二',
+    'grade3': '初三',
+}
+
+SEMESTER_LABELS = {
+    'first': '上',
+    'second': '下',
+    'all': '全',
+}
+
+
+class TextbookEntry:
+    """清单中的一本课本"""
+
+    def __init__(self, subject, grade, semester, pdf_name):
+        self.subject = subject
+        self.grade = grade
+        self.semester = semester
+        self.pdf_name = pdf_name
+
+    def __repr__(self):
+        return f'<TextbookEntry {self.key}>'
+
+    @property
+    def key(self):
+        """唯一标识，如 math-grade1-first"""
+        return f'{self.subject}-{self.grade}-{self.semester}'
+
+    @property
+    def subject_name(self):
+        return SUBJECT_NAMES[self.subject]
+
+    @property
+    def label(self):
+        """展示名称，如 数学-初一上"""
+        return f'{self.subject_name}-{GRADE_LABELS[self.grade]}{SEMESTER_LABELS[self.semester]}'
+
+    def pdf_path(self, textbook_dir):
+        return Path(textbook_dir) / self.subject_name / self.pdf_name
+
+    def csv_path(self, csv_dir):
+        return Path(csv_dir) / self.subject_name / f'{self.label}.csv'
+
+
+TEXTBOOKS = [
+    TextbookEntry('math', 'grade1', 'first', '7上-沪教版初中数学课本（2024新版）上海.pdf'),
+    TextbookEntry('math', 'grade1', 'second', '【沪教版五四制】七年级下册(2025春版)数学电子课本.pdf'),
+    TextbookEntry('math', 'grade2', 'first', '【沪教版五四制】八年级上册(2025秋版)数学电子课本.pdf'),
+
+    TextbookEntry('chinese', 'grade1', 'first', '【人教版五四制】七年级上册(2024秋版)语文电子课本.pdf'),
+    TextbookEntry('chinese', 'grade1', 'second', '【人教版五四制】七年级下册(2025春版)语文电子课本.pdf'),
+    TextbookEntry('chinese', 'grade2', 'first', '【人教版五四制】八年级上册(2025秋版)语文电子课本.pdf'),
+    TextbookEntry('chinese', 'grade2', 'second', '【人教版五四制】八年级下册语文电子课本.pdf'),
+    TextbookEntry('chinese', 'grade3', 'first', '【人教版五四制】九年级上册语文电子课本.pdf'),
+    TextbookEntry('chinese', 'grade3', 'second', '【人教版五四制】九年级下册语文电子课本.pdf'),
+
+    TextbookEntry('english', 'grade1', 'first', '【沪外教版】七年级上册(2024秋版)英语电子课本.pdf'),
+    TextbookEntry('english', 'grade1', 'second', '【沪外教版】七年级下册(2025春版)英语电子课本.pdf'),
+    TextbookEntry('english', 'grade2', 'first', '【沪外教版】八年级上册(2025秋版)英语电子课本.pdf'),
+    TextbookEntry('english', 'grade2', 'second', '【沪外教版】八年级下册英语电子课本.pdf'),
+    TextbookEntry('english', 'grade3', 'first', '【沪外教版】九年级上册英语电子课本.pdf'),
+    TextbookEntry('english', 'grade3', 'second', '【沪外教版】九年级下册英语电子课本.pdf'),
+]
+
+
+def get_entries(subjects=None):
+    """按学科筛选清单，subjects为空时返回全部"""
+    if not subjects:
+        return list(TEXTBOOKS)
+    return [entry for entry in TEXTBOOKS if entry.subject in subjects]
@@ -0,0 +1,166 @@
+"""
+课本文字规范化
+
+pdfplumber 提取的原始文字带有大量对AI无用、却要按token计费的内容，
+保存课本页面前依次处理：
+1. 页眉/页脚：每页首尾几行中，在多页重复出现的行（数字视为相同）以及单独的页码行
+2. 图片/排版噪声：(cid:123) 等无法解码的字形、替换字符、只有符号没有文字的行
+3. 空白：合并连续空格，去掉汉字之间被插入的空格
+4. 断行：汉字行被版面折断的地方重新接上；英文行尾连字符断词（exam-\\nple）恢复为整词
+
+本模块不依赖Django。
+"""
+import math
+import re
+from collections import Counter
+
+# 规范化规则变化时递增，已导入的课本会重新处理
+NORMALIZER_VERSION = 1
+
+# 每页首尾各取几行判断页眉页脚
+EDGE_LINES = 2
+# 同一行至少在这么多页、且不少于这个比例的页面中重复出现才视为页眉页脚
+REPEAT_MIN_PAGES = 3
+REPEAT_MIN_RATIO = 0.3
+
+_CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'  # 中日韩统一表意文字
+# 可以与下一行直接相接的中文标点（句末标点后保留换行）
+_CJK_JOINABLE_PUNCT = '，、；（《“‘—'
+_CJK_START_PUNCT = '，、；：。！？）》”’…—'
+
+CJK_RE = re.compile(f'[{_CJK}]')
+CJK_SPACE_RE = re.compile(f'(?<=[{_CJK}{_CJK_START_PUNCT}{_CJK_JOINABLE_PUNCT}]) +(?=[{_CJK}{_CJK_START_PUNCT}])')
+# 无法解码的字形 (cid:N)、替换字符、几何图形符号、私有区字符（图标字体）
+NOISE_RE = re.compile(r'\(cid:\d+\)|[\ufffd\u25a0-\u25ff\ue000-\uf8ff]')
+CONTENT_CHAR_RE = re.compile(f'[0-9A-Za-z{_CJK}\uff10-\uff19\uff21-\uff3a\uff41-\uff5a]')
+PAGE_NUMBER_RE = re.compile(r'^[-—·\s]*(?:第\s*)?\d{1,3}(?:\s*页)?[-—·\s]*$')
+SPACES_RE = re.compile(r'[ \t\u3000\xa0]+')
+
+
+def estimate_tokens(text):
+    """
+    粗略估算token数（不依赖具体模型的分词器，用于对比处理前后的变化）
+
+    汉字按每字1个token，其余字符（英文、数字、标点、空白）按每4个字符1个token。
+    """
+    text = text or ''
+    cjk_count = len(CJK_RE.findall(text))
+    return cjk_count + math.ceil((len(text) - cjk_count) / 4)
+
+
+def _line_signature(line):
+    """页眉页脚比较用：数字统一替换（页码、章节号不同的页眉视为同一行），去掉空白"""
+    return re.sub(r'\d+', '#', re.sub(r'\s+', '', line))
+
+
+def find_repeated_lines(pages):
+    """
+    找出在多页首尾重复出现的行
+
+    Args:
+        pages: [(页码, 文字), ...]
+
+    Returns:
+        页眉页脚行的签名集合
+    """
+    counts = Counter()
+    text_pages = 0
+    for _, text in pages:
+        lines = [line for line in (text or '').splitlines() if line.strip()]
+        if not lines:
+            continue
+        text_pages += 1
+        edges = lines[:EDGE_LINES] + lines[-EDGE_LINES:]
+        counts.update({_line_signature(line) for line in edges})
+
+    threshold = max(REPEAT_MIN_PAGES, math.ceil(text_pages * REPEAT_MIN_RATIO))
+    return {signature for signature, count in counts.items() if count >= threshold and signature}
+
+
+def _is_noise(line):
+    """没有任何文字/数字的行（分隔线、项目符号、图片残留等）"""
+    return not CONTENT_CHAR_RE.search(line)
+
+
+def _join_lines(lines):
+    """接上被版面折断的行"""
+    joined = []
+    for line in lines:
+        if joined:
+            previous = joined[-1]
+            # 英文断词：exam- + ple -> example
+            if re.search(r'[A-Za-z]-$', previous) and re.match(r'[a-z]', line):
+                joined[-1] = previous[:-1] + line
+                continue
+            # 中文折行：上一行以汉字或非句末标点结尾，下一行以汉字或标点开头
+            last, first = previous[-1], line[0]
+            if (CJK_RE.match(last) or last in _CJK_JOINABLE_PUNCT) and (CJK_RE.match(first) or first in _CJK_START_PUNCT):
+                joined[-1] = previous + line
+                continue
+        joined.append(line)
+    return joined
+
+
+def normalize_page(text, repeated_lines=frozenset()):
+    """
+    规范化一页文字
+
+    Args:
+        text: 原始文字
+        repeated_lines: find_repeated_lines 的返回值
+    """
+    lines = [SPACES_RE.sub(' ', NOISE_RE.sub('', line)).strip() for line in (text or '').splitlines()]
+    lines = [line for line in lines if line]
+
+    edge_count = min(EDGE_LINES, len(lines))
+    edges = set(range(edge_count)) | set(range(len(lines) - edge_count, len(lines)))
+    kept = []
+    for index, line in enumerate(lines):
+        if index in edges and (_line_signature(line) in repeated_lines or PAGE_NUMBER_RE.match(line)):
+            continue
+        if _is_noise(line):
+            continue
+        kept.append(CJK_SPACE_RE.sub('', line))
+
+    return '\n'.join(_join_lines(kept))
+
+
+class NormalizationReport:
+    """单本课本的规范化统计"""
+
+    def __init__(self, tokens_before, tokens_after, chars_before, chars_after, repeated_lines):
+        self.tokens_before = tokens_before
+        self.tokens_after = tokens_after
+        self.chars_before = chars_before
+        self.chars_after = chars_after
+        self.repeated_lines = repeated_lines
+
+    @property
+    def saved_ratio(self):
+        return 1 - self.tokens_after / self.tokens_before if self.tokens_before else 0.0
+
+    def summary(self):
+        return (f"估算token {self.tokens_before} -> {self.tokens_after}（减少 {self.saved_ratio:.1%}），"
+                f"识别页眉页脚 {self.repeated_lines} 种")
+
+
+def normalize_pages(pages):
+    """
+    规范化整本课本
+
+    Args:
+        pages: [(页码, 文字), ...]
+
+    Returns:
+        (规范化后的 [(页码, 文字), ...]，NormalizationReport)
+    """
+    repeated_lines = find_repeated_lines(pages)
+    normalized = [(number, normalize_page(text, repeated_lines)) for number, text in pages]
+    report = NormalizationReport(
+        tokens_before=sum(estimate_tokens(text) for _, text in pages),
+        tokens_after=sum(estimate_tokens(text) for _, text in normalized),
+        chars_before=sum(len(text or '') for _, text in pages),
+        chars_after=sum(len(text) for _, text in normalized),
+        repeated_lines=len(repeated_lines)
+    )
+    return normalized, report
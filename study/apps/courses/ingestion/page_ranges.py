@@ -0,0 +1,194 @@
+"""
+课程页码范围定位
+
+目录中印刷的页码和PDF物理页码之间通常有固定偏移（封面、前言、目录页不计页码），
+定位分三步：
+1. 估计偏移：识别每页页眉/页脚中的页码，取 物理页码-印刷页码 的中位数；
+   识别不到页码时，改用目录标题在正文中出现的位置估计
+2. 起始页：目录页码+偏移，再在附近几页的页眉中查找标题进行校正；
+   目录中没有页码的课程按顺序在正文中查找标题
+3. 结束页：下一课起始页的前一页，最后一课延续到全书末尾
+"""
+import re
+import statistics
+import unicodedata
+
+# 定位规则变化时递增，已导入的课本会重新计算页码范围
+PAGE_RANGE_VERSION = 2
+
+# 页眉/页脚取每页前后几行
+HEADER_LINES = 3
+# 按目录页码推算起始页后，在前后几页内查找标题进行校正
+REFINE_WINDOW = 2
+# 至少识别到这么多页的页码才用页码估计偏移
+MIN_PAGE_NUMBER_VOTES = 3
+
+# 同一页出现这么多课程标题时视为目录页
+TOC_TITLE_THRESHOLD = 3
+TOC_SEARCH_PAGES = 20
+
+PAGE_NUMBER_RE = re.compile(r'^[-—·\s]*(?:第\s*)?(\d{1,3})(?:\s*页)?[-—·\s]*$')
+
+
+def _compact(text):
+    """全角转半角并去掉空白，用于标题匹配"""
+    return re.sub(r'\s+', '', unicodedata.normalize('NFKC', text or '')).lower()
+
+
+def _lines(text):
+    return [line.strip() for line in (text or '').splitlines() if line.strip()]
+
+
+def _header_text(text):
+    lines = _lines(text)
+    return _compact(''.join(lines[:HEADER_LINES] + lines[-HEADER_LINES:]))
+
+
+def printed_page_number(text):
+    """识别页面首行或末行的页码（如 "12"、"- 12 -"、"第12页"），识别不到时返回None"""
+    lines = _lines(text)
+    for line in lines[-1:] + lines[:1]:
+        match = PAGE_NUMBER_RE.match(line)
+        if match:
+            return int(match.group(1))
+    return None
+
+
+def _body_start_index(pages, titles):
+    """目录页之后的第一个页面下标"""
+    start = 0
+    for index, (_, text) in enumerate(pages[:TOC_SEARCH_PAGES]):
+        text = _compact(text)
+        if sum(1 for title in titles if title and title in text) >= TOC_TITLE_THRESHOLD:
+            start = index + 1
+    return start
+
+
+def estimate_page_offset(pages, entries):
+    """
+    估计 物理页码 - 印刷页码 的偏移
+
+    Args:
+        pages: [(物理页码, 文字), ...]
+        entries: [{'title', 'printed_page'}, ...]
+
+    Returns:
+        偏移量，无法估计时返回None
+    """
+    votes = []
+    for number, text in pages:
+        printed = printed_page_number(text)
+        if printed is not None and printed <= number:
+            votes.append(number - printed)
+    if len(votes) >= MIN_PAGE_NUMBER_VOTES:
+        # 中位数可以排除正文中偶尔出现的独立数字
+        return statistics.median_low(votes)
+
+    # 页面没有可识别的页码：用标题在正文中出现的位置估计
+    titles = [_compact(entry['title']) for entry in entries]
+    body = pages[_body_start_index(pages, titles):]
+    votes = []
+    for entry, title in zip(entries, titles):
+        if not title or not entry.get('printed_page'):
+            continue
+        for number, text in body:
+            if title in _header_text(text) and number >= entry['printed_page']:
+                votes.append(number - entry['printed_page'])
+                break
+    return statistics.median_low(votes) if votes else None
+
+
+def _refine_start(pages_by_number, expected, title):
+    """在推算的起始页附近查找页眉中包含标题的页面（优先离推算位置最近的）"""
+    if not title:
+        return expected if expected in pages_by_number else None
+    candidates = sorted(range(expected - REFINE_WINDOW, expected + REFINE_WINDOW + 1),
+                        key=lambda number: abs(number - expected))
+    for number in candidates:
+        if number in pages_by_number and title in _header_text(pages_by_number[number]):
+            return number
+    for number in candidates:
+        if number in pages_by_number and title in _compact(pages_by_number[number]):
+            return number
+    return expected if expected in pages_by_number else None
+
+
+def detect_page_ranges(pages, entries, offset=None):
+    """
+    定位每门课程的页码范围
+
+    Args:
+        pages: [(物理页码, 文字), ...]，按页码排序
+        entries: 按课程顺序排列的 [{'title', 'printed_page'}, ...]，printed_page为目录中的页码（可为None）
+        offset: 物理页码-印刷页码的偏移，为None时自动估计
+
+    Returns:
+        与entries一一对应的 (起始页, 结束页) 列表（物理页码），未能定位的课程为None
+    """
+    if not pages:
+        return [None] * len(entries)
+    if offset is None:
+        offset = estimate_page_offset(pages, entries)
+
+    pages_by_number = dict(pages)
+    numbers = [number for number, _ in pages]
+    titles = [_compact(entry['title']) for entry in entries]
+    body_start = numbers[min(_body_start_index(pages, titles), len(numbers) - 1)]
+
+    starts = []
+    previous = body_start
+    for entry, title in zip(entries, titles):
+        start = None
+        if entry.get('printed_page') and offset is not None:
+            start = _refine_start(pages_by_number, entry['printed_page'] + offset, title)
+        elif title:
+            start = next(
+                (number for number in numbers if number >= previous and title in _compact(pages_by_number[number])),
+                None
+            )
+        # 起始页必须按课程顺序递增，否则视为误匹配
+        if start is not None and start < previous:
+            start = None
+        if start is not None:
+            previous = start
+        starts.append(start)
+
+    ranges = [None] * len(entries)
+    found = [position for position, start in enumerate(starts) if start is not None]
+    for order, position in enumerate(found):
+        start = starts[position]
+        if order + 1 < len(found):
+            end = max(start, starts[found[order + 1]] - 1)
+        else:
+            end = numbers[-1]
+        ranges[position] = (start, end)
+    return ranges
+
+
+def match_toc_entries(courses, toc):
+    """
+    把目录解析结果对应到课程上（按标题匹配，标题对不上时按课程序号）
+
+    Args:
+        courses: [(课程序号, 标题), ...]
+        toc: parse_toc 的返回值
+
+    Returns:
+        与courses一一对应的 [{'title', 'printed_page'}, ...]
+    """
+    by_title = {_compact(lesson['title']): lesson for lesson in toc}
+    by_number = {lesson['course_number']: lesson for lesson in toc}
+
+    entries = []
+    for course_number, title in courses:
+        lesson = by_title.get(_compact(title)) or by_number.get(course_number)
+        entries.append({'title': title, 'printed_page': lesson['printed_page'] if lesson else None})
+    return entries
+
+
+def format_page_range(page_range):
+    """(18, 50) -> '18-50'，与 parse_page_range 对应"""
+    if not page_range:
+        return ''
+    start, end = page_range
+    return str(start) if start == end else f'{start}-{end}'
@@ -0,0 +1,244 @@
+"""
+课本导入流程
+
+按清单逐本处理，每本课本依次经过以下阶段：
+    toc      解析PDF目录，生成课程CSV（CSV已存在时保留，可能经过人工修正）
+    courses  读取CSV，批量写入课程
+    content  提取整本PDF文字，规范化（去页眉页脚、接断行等）后按页写入课本表
+    pages    定位每门课程在PDF中的页码范围
+
+每个阶段完成后在 IngestionState 中记录输入指纹（PDF/CSV的sha256、解析规则版本等），
+再次运行时指纹未变化且产出仍在的阶段直接跳过；某本课本中途失败时，下次从失败的阶段继续。
+"""
+import hashlib
+import time
+from functools import cached_property
+
+from django.conf import settings
+from django.utils import timezone
+
+from apps.courses.models import Course, IngestionState, Textbook
+from apps.courses.signals import courses_bulk_saved
+from .extraction import EXTRACTOR_VERSION, extract_pages, file_sha256
+from .importer import import_courses, read_course_csv, resolve_subjects
+from .normalize import NORMALIZER_VERSION, normalize_pages
+from .page_ranges import (
+    PAGE_RANGE_VERSION, detect_page_ranges, estimate_page_offset, format_page_range, match_toc_entries
+)
+from .toc import TOC_PARSER_VERSION, get_toc_page_limit, parse_toc, write_toc_csv
+
+PHASES = ['toc', 'courses', 'content', 'pages']
+
+PHASE_LABELS = {
+    'toc': '目录CSV',
+    'courses': '课程',
+    'content': '课本文字',
+    'pages': '页码范围',
+}
+
+
+def fingerprint(*parts):
+    """把各项输入拼接后取sha256"""
+    return hashlib.sha256('\n'.join(str(part) for part in parts).encode('utf-8')).hexdigest()
+
+
+class Book:
+    """导入过程中的一本课本（缓存文件指纹和提取结果，供各阶段共用）"""
+
+    def __init__(self, entry, pdf_path, csv_path, cache_dir, workers, progress=None):
+        self.entry = entry
+        self.pdf_path = pdf_path
+        self.csv_path = csv_path
+        self.cache_dir = cache_dir
+        self.workers = workers
+        self.progress = progress
+
+    @cached_property
+    def sha256(self):
+        return file_sha256(self.pdf_path)
+
+    @cached_property
+    def extraction(self):
+        return extract_pages(self.pdf_path, self.cache_dir, workers=self.workers, progress=self.progress)
+
+    def toc_pages(self):
+        limit = get_toc_page_limit(self.entry.subject)
+        if 'extraction' in self.__dict__:
+            return self.extraction.pages[:limit]
+        return extract_pages(self.pdf_path, self.cache_dir, workers=self.workers, max_pages=limit).pages
+
+    def courses(self):
+        """数据库中属于本书的课程（按课程序号排序）"""
+        return list(
+            Course.objects.filter(
+                subject__code=self.entry.subject, grade=self.entry.grade, semester=self.entry.semester
+            ).defer('content').order_by('course_number')
+        )
+
+
+class IngestionPipeline:
+    """
+    课本导入流程
+
+    Args:
+        entries: 要处理的课本清单条目
+        phases: 要执行的阶段（默认全部，按PHASES顺序执行）
+        force: 忽略指纹，强制重新执行（toc阶段会覆盖已有CSV）
+        workers: PDF提取进程数，默认使用 settings.PDF_EXTRACT_WORKERS
+        stdout: 输出进度的流（管理命令传入）
+    """
+
+    def __init__(self, entries, phases=None, force=False, workers=None, stdout=None):
+        self.entries = entries
+        self.phases = [phase for phase in PHASES if not phases or phase in phases]
+        self.force = force
+        self.workers = settings.PDF_EXTRACT_WORKERS if workers is None else workers
+        self.stdout = stdout
+        self.stats = {'run': 0, 'skipped': 0, 'failed': 0, 'missing': 0}
+        self._progress_reported = 0
+
+    def log(self, message):
+        if self.stdout is not None:
+            self.stdout.write(message)
+
+    def run(self):
+        for entry in self.entries:
+            self.run_entry(entry)
+        return self.stats
+
+    def run_entry(self, entry):
+        self.log(f'\n📖 {entry.label}  {entry.pdf_name}')
+        pdf_path = entry.pdf_path(settings.TEXTBOOK_DIR)
+        if not pdf_path.exists():
+            self.log(f'   ⚠️  PDF不存在: {pdf_path}')
+            self.stats['missing'] += 1
+            return
+
+        book = Book(entry, pdf_path, entry.csv_path(settings.COURSE_CSV_DIR), settings.PDF_TEXT_CACHE_DIR,
+                    self.workers, progress=self.report_progress)
+        for phase in self.phases:
+            try:
+                self.run_phase(book, phase)
+            except Exception as e:
+                # 后续阶段依赖前面的产出，本书停止，下次运行从失败的阶段继续
+                self.log(f'   ❌ {PHASE_LABELS[phase]}: {e}')
+                self.stats['failed'] += 1
+                return
+
+    def run_phase(self, book, phase):
+        label = PHASE_LABELS[phase]
+        phase_fingerprint = getattr(self, f'{phase}_fingerprint')(book)
+        state = IngestionState.objects.filter(book_key=book.entry.key, phase=phase).first()
+        if (not self.force and state and state.fingerprint == phase_fingerprint
+                and getattr(self, f'{phase}_output_exists')(book)):
+            self.log(f'   ⏭️  {label}: 未变化，跳过（{state.detail}）')
+            self.stats['skipped'] += 1
+            return
+
+        start = time.perf_counter()
+        detail = getattr(self, f'run_{phase}')(book)
+        IngestionState.objects.update_or_create(
+            book_key=book.entry.key, phase=phase,
+            defaults={'fingerprint': phase_fingerprint, 'detail': detail[:200]}
+        )
+        self.log(f'   ✅ {label}: {detail}（{time.perf_counter() - start:.1f} 秒）')
+        self.stats['run'] += 1
+
+    def report_progress(self, done, total):
+        if done < self._progress_reported:
+            self._progress_reported = 0  # 开始提取下一本
+        if done == total or done - self._progress_reported >= 50:
+            self._progress_reported = done
+            self.log(f'      进度: {done}/{total} 页')
+
+    # ------------------------------------------------------------ toc
+
+    def toc_fingerprint(self, book):
+        return fingerprint(book.sha256, TOC_PARSER_VERSION)
+
+    def toc_output_exists(self, book):
+        return book.csv_path.exists()
+
+    def run_toc(self, book):
+        if book.csv_path.exists() and not self.force:
+            return f'保留已有CSV {book.csv_path.name}（使用 --force 重新生成）'
+
+        lessons = parse_toc(book.entry.subject, book.toc_pages())
+        if not lessons:
+            raise ValueError('未从目录中解析到课程，请手动创建CSV')
+        write_toc_csv(book.csv_path, book.entry, lessons)
+        return f'解析到 {len(lessons)} 门课程，已写入 {book.csv_path.name}'
+
+    # ------------------------------------------------------------ courses
+
+    def courses_fingerprint(self, book):
+        csv_hash = file_sha256(book.csv_path) if book.csv_path.exists() else ''
+        return fingerprint(csv_hash, book.entry.pdf_name)
+
+    def courses_output_exists(self, book):
+        return bool(book.courses())
+
+    def run_courses(self, book):
+        if not book.csv_path.exists():
+            raise FileNotFoundError(f'CSV不存在: {book.csv_path}')
+        rows = read_course_csv(book.csv_path)
+        for row in rows:
+            if (row['subject'], row['grade'], row['semester']) != (
+                    book.entry.subject, book.entry.grade, book.entry.semester):
+                raise ValueError(f'{book.csv_path.name} 中的课程不属于 {book.entry.label}')
+        return import_courses(rows, pdf_source=book.entry.pdf_name).summary()
+
+    # ------------------------------------------------------------ content
+
+    def content_fingerprint(self, book):
+        return fingerprint(book.sha256, EXTRACTOR_VERSION, NORMALIZER_VERSION)
+
+    def content_output_exists(self, book):
+        return Textbook.objects.filter(pdf_source=book.entry.pdf_name).exists()
+
+    def run_content(self, book):
+        result = book.extraction
+        normalized, report = normalize_pages(result.pages)
+        pages = [(number, text) for number, text in normalized if text]
+        if not pages:
+            raise ValueError('PDF中没有可提取的文字')
+        subject = resolve_subjects([book.entry.subject])[book.entry.subject]
+        Textbook.store_pages(book.entry.pdf_name, pages, subject=subject)
+        self.log(f'      提取: {result.summary()}')
+        return f'{len(pages)} 页、{report.chars_after} 字，{report.summary()}'
+
+    # ------------------------------------------------------------ pages
+
+    def pages_fingerprint(self, book):
+        courses = [(course.course_number, course.title) for course in book.courses()]
+        return fingerprint(book.sha256, EXTRACTOR_VERSION, TOC_PARSER_VERSION, PAGE_RANGE_VERSION, courses)
+
+    def pages_output_exists(self, book):
+        return True
+
+    def run_pages(self, book):
+        courses = book.courses()
+        if not courses:
+            raise ValueError('没有课程，请先执行courses阶段')
+
+        # 重新解析目录取得印刷页码（CSV可能经过人工修正，只用来对应课程）
+        pages = book.extraction.pages
+        toc = parse_toc(book.entry.subject, pages)
+        entries = match_toc_entries([(course.course_number, course.title) for course in courses], toc)
+        offset = estimate_page_offset(pages, entries)
+        ranges = detect_page_ranges(pages, entries, offset)
+
+        now = timezone.now()
+        for course, page_range in zip(courses, ranges):
+            course.pdf_page_range = format_page_range(page_range)
+            course.updated_at = now
+        Course.objects.bulk_update(courses, ['pdf_page_range', 'updated_at'], batch_size=500)
+        courses_bulk_saved.send(sender=Course, course_ids=[course.id for course in courses])
+
+        found = [page_range for page_range in ranges if page_range]
+        detail = f'{len(found)}/{len(courses)} 门课程定位到页码范围'
+        if found:
+            average = sum(end - start + 1 for start, end in found) / len(found)
+            detail += f'，平均每课 {average:.1f} 页（全书 {len(pages)} 页）'
+        detail += f'，页码偏移 {offset:+d}' if offset is not None else '，未识别页码偏移'
+        return detail
@@ -0,0 +1,257 @@
+"""
+课本目录解析
+
+从PDF前几页的文字中解析课文/小节/单元列表，生成课程目录CSV。
+各学科目录格式不同，分别使用各自的解析函数，解析结果统一为：
+    {'course_number': 课程序号, 'title': 标题, 'keywords': 关键词（|分隔）, 'printed_page': 目录中印刷的页码或None}
+"""
+import csv
+import re
+
+from .manifest import GRADE_LABELS, SEMESTER_LABELS
+
+# 解析规则变化时递增，已生成的CSV不会被自动覆盖（见 ingest_textbooks --force）
+TOC_PARSER_VERSION = 2
+
+CSV_HEADER = ['年级', '学期', '学科', '课程号', '标题', '关键词']
+
+
+def _to_int(value):
+    return int(value) if value else None
+
+
+# ---------------------------------------------------------------- 语文
+
+CHINESE_SKIP_KEYWORDS = ['阅读综合实践', '写作', '整本书阅读', '专题学习', '课外古诗词', '活动·探究', '任务', '目 录',
+                         '单元', '注：']
+
+
+def parse_chinese_toc(pages):
+    """
+    语文目录：每行形如 "1 春/朱自清 2" 或 "4 古代诗歌四首 14"
+
+    Args:
+        pages: [(页码, 文字), ...]，PDF前10页
+    """
+    lessons = []
+    seen_lessons = set()
+
+    for index, (_, text) in enumerate(pages):
+        # 只处理包含"目录"或"目 录"的页面
+        if not text or '目' not in text or index > 8:
+            continue
+
+        for line in text.split('\n'):
+            line = line.strip()
+
+            # 跳过包含"阅 读"这种分开格式的行
+            if '阅 读' in line or '读 第' in line:
+                continue
+
+            # 先移除"阅读"前缀（连在一起的）
+            line = re.sub(r'^阅读\s+', '', line)
+
+            # 带作者的格式: "1 标题/作者 页码"
+            match = re.match(r'^(\d+)\*?\s+(.+?)\s*/\s*(.+?)(?:\s+(\d+))?$', line)
+            if match:
+                lesson_number, title, author, printed_page = match.groups()
+            else:
+                # 无作者的格式: "1 标题 页码"
+                match = re.match(r'^(\d+)\*?\s+([^/\d]+?)(?:\s+(\d+))?$', line)
+                if not match:
+                    continue
+                lesson_number, title, printed_page = match.groups()
+                author = ''
+
+            title = title.strip()
+            author = author.strip()
+
+            # 过滤掉非课文内容和太短的标题（可能是误匹配）
+            if any(keyword in title for keyword in CHINESE_SKIP_KEYWORDS) or len(title) < 2:
+                continue
+
+            # 移除副标题和末尾的页码
+            if '——' in title:
+                title = title.split('——')[0].strip()
+            title = re.sub(r'\s+\d+$', '', title)
+
+            lesson_key = (lesson_number, title)
+            if lesson_key in seen_lessons:
+                continue
+            seen_lessons.add(lesson_key)
+
+            lessons.append({
+                'course_number': int(lesson_number),
+                'title': title,
+                'keywords': chinese_keywords(title, author),
+                'printed_page': _to_int(printed_page),
+            })
+
+    lessons.sort(key=lambda lesson: lesson['course_number'])
+    return lessons
+
+
+def chinese_keywords(title, author):
+    """根据标题和作者生成关键词（作者|体裁）"""
+    keywords = []
+
+    if author:
+        # 清理作者名（去掉书名号等）
+        keywords.append(re.sub(r'[《》（）]', '', author))
+
+    if '诗' in title or '词' in title:
+        keywords.append('诗歌')
+    elif '文言' in title or any(classic in author for classic in ['资治通鉴', '论语', '孟子', '列子']):
+        keywords.append('文言文')
+    elif '散文' in title:
+        keywords.append('散文')
+    elif '小说' in title:
+        keywords.append('小说')
+    elif '记' in title:
+        keywords.append('记叙文')
+    elif '说' in title:
+        keywords.append('说明文')
+    else:
+        keywords.append('现代文')
+
+    return '|'.join(keywords)
+
+
+# ---------------------------------------------------------------- 数学
+
+MATH_SKIP_KEYWORDS = ['内容提要', '复习题', '阅读材料', '综合与实践', '附录']
+
+
+def parse_math_toc(pages):
+    """
+    数学目录：每行形如 "15.1 不等式及其性质 2"
+
+    课程序号按小节顺序从1编号，标题保留小节编号（如 "15.1 不等式及其性质"）。
+
+    Args:
+        pages: [(页码, 文字), ...]，PDF前15页
+    """
+    sections = []
+    seen_sections = set()
+
+    for index, (_, text) in enumerate(pages):
+        if not text or index > 12:
+            continue
+
+        # 不包含"目"字但包含章节编号格式的页面也处理（数学目录可能跨多页）
+        if '目' not in text and not re.search(r'\d+\.\d+\s+.+\s+\d+', text):
+            continue
+
+        for line in text.split('\n'):
+            match = re.match(r'^(\d+)\.(\d+)\s+(.+?)\s+(\d+)$', line.strip())
+            if not match:
+                continue
+
+            chapter, section, title, printed_page = match.groups()
+            title = title.strip()
+            if any(keyword in title for keyword in MATH_SKIP_KEYWORDS):
+                continue
+
+            section_key = (int(chapter), int(section))
+            if section_key in seen_sections:
+                continue
+            seen_sections.add(section_key)
+            sections.append((section_key, title, int(printed_page)))
+
+    sections.sort(key=lambda item: item[0])
+    return [
+        {
+            'course_number': number,
+            'title': f'{chapter}.{section} {title}',
+            'keywords': title,
+            'printed_page': printed_page,
+        }
+        for number, ((chapter, section), title, printed_page) in enumerate(sections, 1)
+    ]
+
+
+# ---------------------------------------------------------------- 英语
+
+ENGLISH_MAX_UNITS = 15
+
+
+def parse_english_toc(pages):
+    """
+    英语目录：每行形如 "Unit 1 Language Learning 2" 或 "1 Language Learning"
+
+    Args:
+        pages: [(页码, 文字), ...]，PDF前15页
+    """
+    units = {}
+
+    for _, text in pages:
+        # 包含"Unit"或"UNIT"的页面可能是目录页
+        if not text or ('Unit' not in text and 'UNIT' not in text):
+            continue
+
+        for line in text.split('\n'):
+            line = line.strip()
+
+            match = re.match(r'^Unit\s+(\d+)\s+(.+?)(?:\s+(\d+))?$', line, re.IGNORECASE)
+            if match:
+                unit_number, unit_title, printed_page = match.groups()
+                if len(unit_title.strip()) <= 3:
+                    continue
+            else:
+                match = re.match(r'^(\d+)\s+([A-Z][^0-9]+?)(?:\s+(\d+))?$', line)
+                if not match or int(match.group(1)) > ENGLISH_MAX_UNITS:
+                    continue
+                unit_number, unit_title, printed_page = match.groups()
+                # 排除"page/topic"等目录表头
+                if any(word in unit_title.lower() for word in ['page', 'topic', 'function', 'grammar']):
+                    continue
+
+            unit_number = int(unit_number)
+            if unit_number in units:
+                continue
+            unit_title = unit_title.strip()
+            units[unit_number] = {
+                'course_number': unit_number,
+                'title': f'Unit {unit_number} {unit_title}',
+                'keywords': unit_title,
+                'printed_page': _to_int(printed_page),
+            }
+
+    return [units[number] for number in sorted(units)]
+
+
+# ---------------------------------------------------------------- 通用
+
+TOC_PARSERS = {
+    'chinese': (parse_chinese_toc, 10),
+    'math': (parse_math_toc, 15),
+    'english': (parse_english_toc, 15),
+}
+
+
+def get_toc_page_limit(subject):
+    """解析目录需要读取的页数"""
+    return TOC_PARSERS[subject][1]
+
+
+def parse_toc(subject, pages):
+    """按学科解析目录"""
+    parser, page_limit = TOC_PARSERS[subject]
+    return parser(pages[:page_limit])
+
+
+def write_toc_csv(path, entry, lessons):
+    """把解析出的目录写成课程CSV（格式与 batch_import_csv 相同）"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with open(path, 'w', encoding='utf-8-sig', newline='') as f:
+        writer = csv.writer(f)
+        writer.writerow(CSV_HEADER)
+        for lesson in lessons:
+            writer.writerow([
+                GRADE_LABELS[entry.grade],
+                SEMESTER_LABELS[entry.semester],
+                entry.subject_name,
+                lesson['course_number'],
+                lesson['title'],
+                lesson['keywords'],
+            ])
@@ -0,0 +1,63 @@
+"""
+并行提取课本PDF文字并写入逐页缓存
+
+用法：
+    python manage.py extract_textbook_text                 # 提取 TEXTBOOK_DIR 下所有PDF
+    python manage.py extract_textbook_text 数学 --workers 8  # 只提取某个学科目录
+    python manage.py extract_textbook_text path/to/book.pdf
+
+已提取过且文件未变化的页面直接读取缓存，中断后重新运行会从缺失的页面继续。
+"""
+import time
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.courses.ingestion.extraction import extract_pages
+
+
+class Command(BaseCommand):
+    help = '并行提取课本PDF逐页文字（带磁盘缓存）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('targets', nargs='*', help='PDF文件或目录（相对路径基于TEXTBOOK_DIR），默认全部')
+        parser.add_argument('--workers', type=int, default=settings.PDF_EXTRACT_WORKERS,
+                            help='进程数，0表示CPU核数')
+
+    def handle(self, *args, **options):
+        pdf_files = self.find_pdfs(options['targets'])
+        if not pdf_files:
+            raise CommandError(f'未找到PDF文件（TEXTBOOK_DIR={settings.TEXTBOOK_DIR}）')
+
+        self.stdout.write(f'📚 共 {len(pdf_files)} 本PDF，缓存目录: {settings.PDF_TEXT_CACHE_DIR}\n')
+        start = time.perf_counter()
+        total_pages = 0
+        extracted_pages = 0
+
+        for pdf_path in pdf_files:
+            self.stdout.write(f'📖 {pdf_path.name}')
+            result = extract_pages(pdf_path, settings.PDF_TEXT_CACHE_DIR, workers=options['workers'])
+            total_pages += result.page_count
+            extracted_pages += result.extracted_pages
+            self.stdout.write(f'   ✅ {result.summary()}')
+
+        elapsed = time.perf_counter() - start
+        rate = total_pages / elapsed if elapsed > 0 else 0
+        self.stdout.write(self.style.SUCCESS(
+            f'\n✨ 完成：{total_pages} 页（新提取 {extracted_pages}），用时 {elapsed:.1f} 秒，{rate:.1f} 页/秒'
+        ))
+
+    def find_pdfs(self, targets):
+        base = Path(settings.TEXTBOOK_DIR)
+        paths = [Path(t) if Path(t).exists() else base / t for t in targets] or [base]
+
+        pdf_files = []
+        for path in paths:
+            if path.is_dir():
+                pdf_files.extend(sorted(path.rglob('*.pdf')))
+            elif path.suffix.lower() == '.pdf' and path.exists():
+                pdf_files.append(path)
+            else:
+                raise CommandError(f'路径不存在或不是PDF: {path}')
+        return pdf_files
@@ -0,0 +1,73 @@
+"""
+按课本清单导入课本：目录CSV -> 课程 -> 课本文字 -> 页码范围
+
+用法：
+    python manage.py ingest_textbooks                        # 导入清单中全部课本
+    python manage.py ingest_textbooks --subject math         # 只导入数学
+    python manage.py ingest_textbooks --phase courses        # 只执行某个阶段（可重复指定）
+    python manage.py ingest_textbooks --force                # 忽略指纹强制重新执行（会覆盖已有CSV）
+    python manage.py ingest_textbooks --status               # 查看各课本的导入状态
+
+清单见 apps/courses/ingestion/manifest.py。输入未变化的阶段会自动跳过，
+中途失败后重新运行会从失败的阶段继续。
+"""
+import time
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+
+from apps.courses.ingestion.manifest import SUBJECT_NAMES, get_entries
+from apps.courses.ingestion.pipeline import PHASE_LABELS, PHASES, IngestionPipeline
+from apps.courses.models import IngestionState
+
+
+class Command(BaseCommand):
+    help = '按课本清单分阶段导入课本（目录CSV、课程、课本文字、页码范围）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--subject', action='append', choices=list(SUBJECT_NAMES),
+                            help='只处理指定学科（可重复指定）')
+        parser.add_argument('--phase', action='append', choices=PHASES,
+                            help='只执行指定阶段（可重复指定）')
+        parser.add_argument('--force', action='store_true', help='忽略输入指纹，强制重新执行')
+        parser.add_argument('--workers', type=int, default=settings.PDF_EXTRACT_WORKERS,
+                            help='PDF提取进程数，0表示CPU核数')
+        parser.add_argument('--status', action='store_true', help='只显示导入状态，不执行')
+
+    def handle(self, *args, **options):
+        entries = get_entries(options['subject'])
+
+        if options['status']:
+            self.show_status(entries)
+            return
+
+        self.stdout.write(f'📚 共 {len(entries)} 本课本，阶段: {", ".join(options["phase"] or PHASES)}')
+        start = time.perf_counter()
+        pipeline = IngestionPipeline(
+            entries,
+            phases=options['phase'],
+            force=options['force'],
+            workers=options['workers'],
+            stdout=self.stdout
+        )
+        stats = pipeline.run()
+
+        message = (f'\n✨ 完成：执行 {stats["run"]} 个阶段，跳过 {stats["skipped"]} 个，'
+                   f'失败 {stats["failed"]} 本，缺少PDF {stats["missing"]} 本，用时 {time.perf_counter() - start:.1f} 秒')
+        self.stdout.write(self.style.ERROR(message) if stats['failed'] else self.style.SUCCESS(message))
+
+    def show_status(self, entries):
+        states = {}
+        for state in IngestionState.objects.filter(book_key__in=[entry.key for entry in entries]):
+            states[(state.book_key, state.phase)] = state
+
+        for entry in entries:
+            pdf_exists = entry.pdf_path(settings.TEXTBOOK_DIR).exists()
+            self.stdout.write(f'\n📖 {entry.label}  {entry.pdf_name}{"" if pdf_exists else "  ⚠️ PDF不存在"}')
+            for phase in PHASES:
+                state = states.get((entry.key, phase))
+                if state:
+                    updated_at = state.updated_at.strftime('%Y-%m-%d %H:%M')
+                    self.stdout.write(f'   ✅ {PHASE_LABELS[phase]}: {state.detail}（{updated_at}）')
+                else:
+                    self.stdout.write(f'   ⏳ {PHASE_LABELS[phase]}: 未执行')
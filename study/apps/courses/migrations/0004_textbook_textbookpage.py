@@ -0,0 +1,110 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:52
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0003_alter_course_unique_together_course_semester_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="Textbook",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "pdf_source",
+                    models.CharField(
+                        help_text="原始PDF文件名",
+                        max_length=500,
+                        unique=True,
+                        verbose_name="PDF来源",
+                    ),
+                ),
+                ("page_count", models.IntegerField(default=0, verbose_name="页数")),
+                ("char_count", models.IntegerField(default=0, verbose_name="总字数")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="创建时间"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="更新时间"),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="textbooks",
+                        to="courses.subject",
+                        verbose_name="学科",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "课本",
+                "verbose_name_plural": "课本",
+                "db_table": "courses_textbook",
+                "ordering": ["pdf_source"],
+            },
+        ),
+        migrations.CreateModel(
+            name="TextbookPage",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "page_number",
+                    models.IntegerField(
+                        help_text="PDF物理页码，从1开始", verbose_name="页码"
+                    ),
+                ),
+                (
+                    "start_offset",
+                    models.IntegerField(
+                        default=0,
+                        help_text="在全书文字中的字符偏移",
+                        verbose_name="起始偏移",
+                    ),
+                ),
+                ("char_count", models.IntegerField(default=0, verbose_name="字数")),
+                ("content", models.TextField(blank=True, verbose_name="页面文字")),
+                (
+                    "textbook",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="pages",
+                        to="courses.textbook",
+                        verbose_name="课本",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "课本页面",
+                "verbose_name_plural": "课本页面",
+                "db_table": "courses_textbookpage",
+                "ordering": ["textbook", "page_number"],
+                "unique_together": {("textbook", "page_number")},
+            },
+        ),
+    ]
@@ -0,0 +1,96 @@
+"""
+把课程中重复存储的整本课本内容合并到 Textbook/TextbookPage
+
+旧的提取脚本会把同一本PDF的全文写入该学期每一门课程的content字段。
+这里按 pdf_source 每本只保留一份：全文按提取时使用的分隔符(两个换行)拆成页面，
+再清空内容完全相同的课程content。该PDF已有课本（如已运行过课本提取）时不重建页面，
+只清空与已有课本全文完全相同的课程，内容不同的课程保留自己的content。提取时空白页被跳过，因此这里的页码是近似值，
+重新运行课本提取即可得到准确的PDF物理页码。
+"""
+
+from django.db import migrations
+
+PAGE_SEPARATOR = "\n\n"
+
+
+def textbook_full_text(textbook):
+    """拼接整本课本文字（同 Textbook.get_full_text，迁移中的历史模型没有该方法）"""
+    return PAGE_SEPARATOR.join(
+        textbook.pages.order_by("page_number").values_list("content", flat=True)
+    )
+
+
+def collapse_course_content(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Textbook = apps.get_model("courses", "Textbook")
+    TextbookPage = apps.get_model("courses", "TextbookPage")
+
+    pdf_sources = (
+        Course.objects.exclude(pdf_source="")
+        .exclude(content="")
+        .order_by()
+        .values_list("pdf_source", flat=True)
+        .distinct()
+    )
+
+    for pdf_source in list(pdf_sources):
+        courses = Course.objects.filter(pdf_source=pdf_source).exclude(content="")
+        first = courses.order_by("id").only("id", "subject_id", "content").first()
+        full_text = first.content
+
+        textbook = Textbook.objects.filter(pdf_source=pdf_source).first()
+        if textbook is not None:
+            # 以已有课本为准：课程内容与课本页面不一致时不能清空，否则课程会改用不同的内容
+            full_text = textbook_full_text(textbook)
+        else:
+            textbook = Textbook.objects.create(
+                subject_id=first.subject_id,
+                pdf_source=pdf_source,
+            )
+            pages = []
+            offset = 0
+            for index, text in enumerate(full_text.split(PAGE_SEPARATOR), start=1):
+                pages.append(
+                    TextbookPage(
+                        textbook=textbook,
+                        page_number=index,
+                        start_offset=offset,
+                        char_count=len(text),
+                        content=text,
+                    )
+                )
+                offset += len(text) + len(PAGE_SEPARATOR)
+            TextbookPage.objects.bulk_create(pages, batch_size=200)
+            textbook.page_count = len(pages)
+            textbook.char_count = sum(page.char_count for page in pages)
+            textbook.save(update_fields=["page_count", "char_count"])
+
+        # 只清空与整本内容完全一致的课程，手工编辑过的内容保留
+        duplicate_ids = [
+            course_id
+            for course_id, content in courses.values_list("id", "content").iterator()
+            if content == full_text
+        ]
+        Course.objects.filter(id__in=duplicate_ids).update(content="")
+
+
+def restore_course_content(apps, schema_editor):
+    Course = apps.get_model("courses", "Course")
+    Textbook = apps.get_model("courses", "Textbook")
+
+    for textbook in Textbook.objects.all():
+        full_text = textbook_full_text(textbook)
+        Course.objects.filter(pdf_source=textbook.pdf_source, content="").update(
+            content=full_text
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0004_textbook_textbookpage"),
+    ]
+
+    operations = [
+        migrations.RunPython(collapse_course_content, restore_course_content),
+    ]
@@ -0,0 +1,56 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0005_collapse_course_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="IngestionState",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "book_key",
+                    models.CharField(
+                        help_text="如：math-grade1-first",
+                        max_length=100,
+                        verbose_name="课本标识",
+                    ),
+                ),
+                ("phase", models.CharField(max_length=20, verbose_name="导入阶段")),
+                (
+                    "fingerprint",
+                    models.CharField(max_length=64, verbose_name="输入指纹"),
+                ),
+                (
+                    "detail",
+                    models.CharField(
+                        blank=True, max_length=200, verbose_name="结果摘要"
+                    ),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="更新时间"),
+                ),
+            ],
+            options={
+                "verbose_name": "课本导入状态",
+                "verbose_name_plural": "课本导入状态",
+                "db_table": "courses_ingestionstate",
+                "unique_together": {("book_key", "phase")},
+            },
+        ),
+    ]
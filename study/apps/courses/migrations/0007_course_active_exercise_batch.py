@@ -0,0 +1,48 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def assign_existing_batches(apps, schema_editor):
+    """把每门课程已有的AI题目归入一个批次，并设为当前批次"""
+    Course = apps.get_model("courses", "Course")
+    Exercise = apps.get_model("exercises", "Exercise")
+    GenerationBatch = apps.get_model("exercises", "GenerationBatch")
+
+    course_ids = (
+        Exercise.objects.filter(is_ai_generated=True, batch__isnull=True)
+        .order_by()
+        .values_list("course_id", flat=True)
+        .distinct()
+    )
+    for course_id in list(course_ids):
+        batch = GenerationBatch.objects.create(course_id=course_id)
+        Exercise.objects.filter(
+            course_id=course_id, is_ai_generated=True, batch__isnull=True
+        ).update(batch=batch)
+        Course.objects.filter(pk=course_id).update(active_exercise_batch=batch)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("exercises", "0002_generationbatch"),
+        ("courses", "0006_ingestionstate"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="course",
+            name="active_exercise_batch",
+            field=models.ForeignKey(
+                blank=True,
+                null=True,
+                on_delete=django.db.models.deletion.SET_NULL,
+                related_name="+",
+                to="exercises.generationbatch",
+                verbose_name="当前练习题批次",
+            ),
+        ),
+        migrations.RunPython(assign_existing_batches, migrations.RunPython.noop),
+    ]
@@ -1,8 +1,22 @@
 """
 课程模块数据模型
 """
-from django.db import models
+import re
+
+from django.db import models, transaction
+from django.db.models import Count, F, Q, Sum
 from django.contrib.auth.models import User
+from .signals import textbook_pages_stored
+
+
+def parse_page_range(value):
+    """解析页码范围字符串，如 '18-50' -> (18, 50)，'18' -> (18, 18)，无法解析时返回None"""
+    match = re.match(r'^\s*(\d+)\s*(?:[-~—]\s*(\d+))?\s*$', value or '')
+    if not match:
+        return None
+    start = int(match.group(1))
+    end = int(match.group(2) or start)
+    return (start, end) if start <= end else (end, start)
 
 
 class Subject(models.Model):
@@ -69,6 +83,12 @@ class Course(models.Model):
     pdf_page_range = models.CharField('PDF页码范围', max_length=50, blank=True, help_text='如：18-50')
     pdf_source = models.CharField('PDF来源', max_length=500, blank=True, help_text='原始PDF文件名')
     
+    # 当前使用的AI练习题批次（重新生成时切换指针，旧批次的题目和答题记录保留）
+    active_exercise_batch = models.ForeignKey(
+        'exercises.GenerationBatch', on_delete=models.SET_NULL, null=True, blank=True,
+        verbose_name='当前练习题批次', related_name='+'
+    )
+    
     created_at = models.DateTimeField('创建时间', auto_now_add=True)
     updated_at = models.DateTimeField('更新时间', auto_now=True)
     
@@ -85,6 +105,178 @@ class Course(models.Model):
     
     def __str__(self):
         return f"{self.get_grade_display()} {self.subject.name} - {self.title}"
+    
+    @staticmethod
+    def current_exercises_q():
+        """查询课程时统计当前可用练习题的过滤条件（人工录入的题目 + 当前批次的AI题目）"""
+        return Q(exercises__batch__isnull=True) | Q(exercises__batch_id=F('active_exercise_batch_id'))
+    
+    def get_current_exercises(self):
+        """当前可用的练习题"""
+        return self.exercises.filter(Q(batch__isnull=True) | Q(batch_id=self.active_exercise_batch_id))
+    
+    def get_page_range(self):
+        """解析PDF页码范围，如 '18-50' -> (18, 50)，'18' -> (18, 18)，无法解析时返回None"""
+        return parse_page_range(self.pdf_page_range)
+    
+    def get_textbook_pages(self):
+        """获取本课程对应的课本页面（有页码范围时只取该范围）"""
+        pages = TextbookPage.objects.filter(textbook__pdf_source=self.pdf_source)
+        page_range = self.get_page_range()
+        if page_range:
+            pages = pages.filter(page_number__range=page_range)
+        return pages.order_by('page_number')
+    
+    def get_content_length(self):
+        """课本内容字数（课程自有内容优先，否则按课本页面统计）"""
+        own_length = getattr(self, 'content_length', None)
+        if own_length is None:
+            own_length = len(self.content.strip()) if self.content else 0
+        if own_length or not self.pdf_source:
+            return own_length or 0
+        # 同一对象上多次调用（如序列化 has_content 和 content_length）只统计一次
+        if not hasattr(self, '_textbook_length'):
+            stats = self.get_textbook_pages().aggregate(total=Sum('char_count'), pages=Count('id'))
+            self._textbook_length = (
+                stats['total'] + len(TextbookPage.SEPARATOR) * (stats['pages'] - 1) if stats['pages'] else 0
+            )
+        return self._textbook_length
+    
+    def get_course_content(self, max_length=None):
+        """
+        获取课本内容（供Prompt使用）
+        
+        课程自有content不为空时直接使用，否则按pdf_source和pdf_page_range从课本页面拼接。
+        
+        Args:
+            max_length: 最多返回的字数，为None时返回全部
+        """
+        if self.content and self.content.strip():
+            return self.content[:max_length] if max_length else self.content
+        if not self.pdf_source:
+            return ''
+        
+        parts = []
+        length = 0
+        for page_content in self.get_textbook_pages().values_list('content', flat=True).iterator():
+            parts.append(page_content)
+            length += len(page_content) + len(TextbookPage.SEPARATOR)
+            if max_length and length >= max_length:
+                break
+        
+        content = TextbookPage.SEPARATOR.join(parts)
+        return content[:max_length] if max_length else content
+
+
+class Textbook(models.Model):
+    """课本表（每本PDF的文字只存一份，课程通过pdf_source引用）"""
+    
+    subject = models.ForeignKey(Subject, on_delete=models.SET_NULL, verbose_name='学科', related_name='textbooks',
+                                null=True, blank=True)
+    pdf_source = models.CharField('PDF来源', max_length=500, unique=True, help_text='原始PDF文件名')
+    page_count = models.IntegerField('页数', default=0)
+    char_count = models.IntegerField('总字数', default=0)
+    created_at = models.DateTimeField('创建时间', auto_now_add=True)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+    
+    class Meta:
+        db_table = 'courses_textbook'
+        verbose_name = '课本'
+        verbose_name_plural = verbose_name
+        ordering = ['pdf_source']
+    
+    def __str__(self):
+        return self.pdf_source
+    
+    @classmethod
+    def store_pages(cls, pdf_source, pages, subject=None):
+        """
+        保存整本课本的页面文字（已存在时整体替换）
+        
+        Args:
+            pdf_source: PDF文件名
+            pages: [(页码, 文字), ...]，页码为PDF物理页码（从1开始）
+            subject: 所属学科
+            
+        Returns:
+            Textbook对象
+        """
+        page_objects = []
+        offset = 0
+        for page_number, text in pages:
+            text = text or ''
+            page_objects.append(TextbookPage(
+                page_number=page_number,
+                start_offset=offset,
+                char_count=len(text),
+                content=text
+            ))
+            offset += len(text) + len(TextbookPage.SEPARATOR)
+        
+        with transaction.atomic():
+            textbook, _ = cls.objects.update_or_create(
+                pdf_source=pdf_source,
+                defaults={
+                    'subject': subject,
+                    'page_count': len(page_objects),
+                    'char_count': sum(page.char_count for page in page_objects)
+                }
+            )
+            textbook.pages.all().delete()
+            for page in page_objects:
+                page.textbook = textbook
+            TextbookPage.objects.bulk_create(page_objects, batch_size=200)
+        
+        textbook_pages_stored.send(sender=cls, textbook=textbook)
+        return textbook
+    
+    def get_full_text(self):
+        """拼接整本课本文字"""
+        return TextbookPage.SEPARATOR.join(
+            self.pages.order_by('page_number').values_list('content', flat=True)
+        )
+
+
+class TextbookPage(models.Model):
+    """课本页面表"""
+    
+    # 页面之间的分隔符，start_offset按此计算
+    SEPARATOR = '\n\n'
+    
+    textbook = models.ForeignKey(Textbook, on_delete=models.CASCADE, verbose_name='课本', related_name='pages')
+    page_number = models.IntegerField('页码', help_text='PDF物理页码，从1开始')
+    start_offset = models.IntegerField('起始偏移', default=0, help_text='在全书文字中的字符偏移')
+    char_count = models.IntegerField('字数', default=0)
+    content = models.TextField('页面文字', blank=True)
+    
+    class Meta:
+        db_table = 'courses_textbookpage'
+        verbose_name = '课本页面'
+        verbose_name_plural = verbose_name
+        ordering = ['textbook', 'page_number']
+        unique_together = [['textbook', 'page_number']]
+    
+    def __str__(self):
+        return f"{self.textbook.pdf_source} - 第{self.page_number}页"
+
+
+class IngestionState(models.Model):
+    """课本导入状态表（记录每本课本各阶段的输入指纹，指纹未变化的阶段再次导入时跳过）"""
+
+    book_key = models.CharField('课本标识', max_length=100, help_text='如：math-grade1-first')
+    phase = models.CharField('导入阶段', max_length=20)
+    fingerprint = models.CharField('输入指纹', max_length=64)
+    detail = models.CharField('结果摘要', max_length=200, blank=True)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+
+    class Meta:
+        db_table = 'courses_ingestionstate'
+        verbose_name = '课本导入状态'
+        verbose_name_plural = verbose_name
+        unique_together = [['book_key', 'phase']]
+
+    def __str__(self):
+        return f"{self.book_key} - {self.phase}"
 
 
 class KnowledgeSummary(models.Model):
@@ -0,0 +1,115 @@
+"""
+学习进度原子更新
+
+学习时长使用 F() 表达式在数据库中累加，多个标签页同时上报也不会丢失；
+每次只写入变化的列，避免整行save()覆盖其他请求的修改。
+"""
+from datetime import timedelta
+
+from django.db import IntegrityError, transaction
+from django.db.models import Case, CharField, F, IntegerField, Value, When
+from django.db.models.functions import Least
+from django.utils import timezone
+
+from apps.users.dashboard import invalidate_dashboard
+from apps.users.models import UserProfile
+from .models import StudyProgress
+
+
+def apply_progress_delta(user, course_id, study_time=0, status=None, progress=None, progress_step=0):
+    """
+    原子更新某门课程的学习进度（记录不存在时创建）
+
+    Args:
+        user: 用户
+        course_id: 课程ID
+        study_time: 本次新增的学习时长（秒）
+        status: 学习状态，为None时不修改
+        progress: 学习进度（0-100），为None时不修改
+        progress_step: 在数据库中把进度增加多少（不超过100），同时把未完成的课程标记为学习中；
+            与 status/progress 不同时使用
+    """
+    updates = {'last_access': timezone.now()}  # update()不会触发auto_now
+    if study_time:
+        updates['study_time'] = F('study_time') + study_time
+    if status is not None:
+        updates['status'] = status
+    if progress is not None:
+        updates['progress'] = progress
+    if progress_step:
+        updates['progress'] = Least(F('progress') + progress_step, Value(100))
+        updates['status'] = Case(
+            When(status='completed', then=Value('completed')),
+            default=Value('in_progress'),
+            output_field=CharField()
+        )
+        status, progress = 'in_progress', min(progress_step, 100)
+
+    invalidate_dashboard(user.id)
+    queryset = StudyProgress.objects.filter(user=user, course_id=course_id)
+    if queryset.update(**updates):
+        return
+
+    try:
+        with transaction.atomic():
+            StudyProgress.objects.create(
+                user=user,
+                course_id=course_id,
+                status=status or 'not_started',
+                progress=progress or 0,
+                study_time=study_time
+            )
+    except IntegrityError:
+        # 并发请求已创建记录，改为累加
+        queryset.update(**updates)
+
+
+def record_study_activity(user, study_time, today=None):
+    """
+    累加用户总学习时长并更新连续学习天数
+
+    - 今天已学习过：天数不变
+    - 昨天学习过：天数+1
+    - 其他情况：重新从1开始计算
+
+    Args:
+        user: 用户
+        study_time: 新增的学习时长（秒），为0时不记录
+        today: 学习日期，默认当前日期
+    """
+    if study_time <= 0:
+        return
+    today = today or timezone.localdate()
+    invalidate_dashboard(user.id)
+
+    UserProfile.objects.filter(user=user).update(
+        total_study_hours=F('total_study_hours') + study_time,
+        continuous_days=Case(
+            When(last_study_date=today, then=F('continuous_days')),
+            When(last_study_date=today - timedelta(days=1), then=F('continuous_days') + 1),
+            default=Value(1),
+            output_field=IntegerField()
+        ),
+        last_study_date=today,
+        updated_at=timezone.now()
+    )
+
+
+def record_answer_stats(user, records):
+    """
+    累加用户的答题计数器（个人中心统计直接读取）
+
+    Args:
+        user: 用户
+        records: 本次写入的AnswerRecord列表
+    """
+    if not records:
+        return
+    UserProfile.objects.filter(user=user).update(
+        answer_count=F('answer_count') + len(records),
+        correct_answer_count=F('correct_answer_count') + sum(1 for record in records if record.is_correct),
+        answer_score_total=F('answer_score_total') + sum(record.score or 0 for record in records),
+        answer_time_spent=F('answer_time_spent') + sum(record.time_spent for record in records),
+        updated_at=timezone.now()
+    )
+    invalidate_dashboard(user.id)
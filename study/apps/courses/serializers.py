@@ -1,6 +1,8 @@
 """
 课程模块序列化器
 """
+from django.db.models import Count, Exists, OuterRef, Prefetch
+from django.db.models.functions import Length, Trim
 from rest_framework import serializers
 from .models import Subject, Course, KnowledgeSummary, StudyProgress
 
@@ -24,6 +26,11 @@ class CourseListSerializer(serializers.ModelSerializer):
         fields = ['id', 'subject', 'grade', 'grade_display', 'course_number', 
                   'title', 'outline', 'keywords', 'cover_image', 'difficulty', 
                   'difficulty_display', 'is_active', 'created_at']
+    
+    @staticmethod
+    def setup_eager_loading(queryset):
+        """预加载学科，避免每门课程单独查询"""
+        return queryset.select_related('subject')
 
 
 class CourseDetailSerializer(serializers.ModelSerializer):
@@ -33,6 +40,7 @@ class CourseDetailSerializer(serializers.ModelSerializer):
     difficulty_display = serializers.CharField(source='get_difficulty_display', read_only=True)
     has_summary = serializers.SerializerMethodField()
     has_content = serializers.SerializerMethodField()
+    content_length = serializers.SerializerMethodField()
     exercises_count = serializers.SerializerMethodField()
     user_progress = serializers.SerializerMethodField()
     
@@ -41,36 +49,75 @@ class CourseDetailSerializer(serializers.ModelSerializer):
         fields = ['id', 'subject', 'grade', 'grade_display', 'course_number', 
                   'title', 'outline', 'keywords', 'cover_image', 'difficulty', 
                   'difficulty_display', 'is_active', 'created_at', 'has_summary',
-                  'has_content', 'content', 'pdf_source', 'pdf_page_range',
+                  'has_content', 'content_length', 'pdf_source', 'pdf_page_range',
                   'exercises_count', 'user_progress']
     
+    @staticmethod
+    def setup_eager_loading(queryset, user=None):
+        """
+        预加载序列化所需的数据，使查询数与课程数量无关
+        
+        Args:
+            queryset: 课程查询集
+            user: 已登录用户，传入时一并预取其学习进度
+        """
+        queryset = queryset.select_related('subject').annotate(
+            has_summary=Exists(KnowledgeSummary.objects.filter(course=OuterRef('pk'))),
+            exercises_count=Count('exercises', filter=Course.current_exercises_q(), distinct=True),
+            content_length=Length(Trim('content'))
+        )
+        if user is not None and user.is_authenticated:
+            queryset = queryset.prefetch_related(Prefetch(
+                'progress_records',
+                queryset=StudyProgress.objects.filter(user=user),
+                to_attr='user_progress_records'
+            ))
+        return queryset
+    
     def get_has_summary(self, obj):
         """是否有知识点总结"""
+        if hasattr(obj, 'has_summary'):
+            return obj.has_summary
         return obj.summaries.exists()
     
     def get_has_content(self, obj):
         """是否有课本内容"""
-        return bool(obj.content and obj.content.strip())
+        return self.get_content_length(obj) > 0
+    
+    def get_content_length(self, obj):
+        """课本内容字数（优先使用查询时的annotate，课程无内容时按共享课本页面统计）"""
+        return obj.get_content_length()
     
     def get_exercises_count(self, obj):
-        """练习题数量"""
-        return obj.exercises.count()
+        """练习题数量（只统计当前批次和人工录入的题目）"""
+        if hasattr(obj, 'exercises_count'):
+            return obj.exercises_count
+        return obj.get_current_exercises().count()
     
     def get_user_progress(self, obj):
         """用户学习进度"""
         request = self.context.get('request')
         if request and request.user.is_authenticated:
-            try:
-                progress = StudyProgress.objects.get(user=request.user, course=obj)
-                return {
-                    'status': progress.status,
-                    'progress': progress.progress,
-                    'study_time': progress.study_time,
-                    'last_access': progress.last_access.isoformat()
-                }
-            except StudyProgress.DoesNotExist:
-                return None
+            return get_user_progress_data(request.user, obj)
+        return None
+
+
+def get_user_progress_data(user, course):
+    """获取用户在某门课程上的学习进度（无记录时返回None）"""
+    records = getattr(course, 'user_progress_records', None)
+    if records is not None:
+        # 已通过 setup_eager_loading 预取
+        progress = records[0] if records else None
+    else:
+        progress = StudyProgress.objects.filter(user=user, course=course).first()
+    if progress is None:
         return None
+    return {
+        'status': progress.status,
+        'progress': progress.progress,
+        'study_time': progress.study_time,
+        'last_access': progress.last_access.isoformat()
+    }
 
 
 class KnowledgeSummarySerializer(serializers.ModelSerializer):
@@ -101,3 +148,19 @@ class UpdateStudyProgressSerializer(serializers.Serializer):
     progress = serializers.IntegerField(min_value=0, max_value=100, required=False)
     study_time = serializers.IntegerField(min_value=0, required=False)
 
+
+class StudyHeartbeatEventSerializer(serializers.Serializer):
+    """学习心跳事件"""
+    course_id = serializers.IntegerField()
+    seconds = serializers.IntegerField(min_value=0, max_value=3600, default=0)
+    status = serializers.ChoiceField(choices=StudyProgress.STATUS_CHOICES, required=False)
+    progress = serializers.IntegerField(min_value=0, max_value=100, required=False)
+
+
+class StudyHeartbeatSerializer(serializers.Serializer):
+    """批量学习心跳序列化器"""
+    events = serializers.ListField(
+        child=StudyHeartbeatEventSerializer(),
+        min_length=1,
+        max_length=200
+    )
@@ -0,0 +1,41 @@
+"""
+课程模块信号处理
+"""
+from django.db.models.signals import post_save, post_delete
+from django.dispatch import Signal
+from .cache import bump_catalogue_version
+
+# Textbook.store_pages 批量写入页面后发送（bulk_create不触发post_save），参数：textbook
+textbook_pages_stored = Signal()
+
+# 批量导入/更新课程后发送（bulk_create/bulk_update不触发post_save），参数：course_ids
+courses_bulk_saved = Signal()
+
+
+def invalidate_catalogue(sender, **kwargs):
+    """目录数据变更时递增版本号，使课程目录缓存失效"""
+    bump_catalogue_version()
+
+
+def invalidate_catalogue_for_exercise(sender, instance, **kwargs):
+    """
+    单独添加/修改的题目使目录缓存失效
+
+    AI生成批次中的题目逐条写入，不在这里处理：批次切换为课程的当前批次时统一递增一次
+    （见 apps.exercises.batches.activate_batch），未启用的批次（题库补货）不影响目录。
+    """
+    if instance.batch_id is None:
+        bump_catalogue_version()
+
+
+def connect_catalogue_signals():
+    """为所有目录相关模型注册缓存失效信号"""
+    from apps.exercises.models import Exercise
+    from .models import Subject, Course, KnowledgeSummary
+
+    for model in (Subject, Course, KnowledgeSummary):
+        post_save.connect(invalidate_catalogue, sender=model, dispatch_uid=f'catalogue_save_{model.__name__}')
+        post_delete.connect(invalidate_catalogue, sender=model, dispatch_uid=f'catalogue_delete_{model.__name__}')
+    post_save.connect(invalidate_catalogue_for_exercise, sender=Exercise, dispatch_uid='catalogue_save_Exercise')
+    post_delete.connect(invalidate_catalogue_for_exercise, sender=Exercise, dispatch_uid='catalogue_delete_Exercise')
+    courses_bulk_saved.connect(invalidate_catalogue, dispatch_uid='catalogue_courses_bulk_saved')
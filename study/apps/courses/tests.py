@@ -0,0 +1,133 @@
+"""
+课程模块测试
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.exercises.models import Exercise
+from .models import Subject, Course, KnowledgeSummary, StudyProgress, Textbook
+
+User = get_user_model()
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CourseQueryCountTests(TestCase):
+    """课程列表和详情的查询数不随课程数量、题目数量增加（避免N+1查询）"""
+
+    # 课程列表：分页计数 + 课程（连同学科）
+    LIST_QUERIES = 2
+    # 课程详情：课程（连同学科、总结、题目数、内容长度）
+    DETAIL_QUERIES = 1
+    # 登录用户查看详情：另加学习进度
+    DETAIL_QUERIES_AUTHENTICATED = 2
+    # 课程没有自有内容、引用共享课本页面时，详情另加一条页面字数统计（列表不统计内容字数）
+    DETAIL_QUERIES_TEXTBOOK = 2
+
+    TEXTBOOK_PDF = 'textbook.pdf'
+    TEXTBOOK_PAGE = '课本第{}页'
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.user = User.objects.create_user(username='student', password='password123')
+
+    def create_courses(self, count, textbook=False):
+        """
+        创建count门课程（轮流分配到各学科），每门课程各有一条知识点总结、count道练习题和学习进度
+
+        Args:
+            textbook: 课程不保存自有内容，按页码范围引用共享课本的页面（合并课本内容后的数据形态）
+        """
+        if textbook:
+            Textbook.store_pages(self.TEXTBOOK_PDF, [(i + 1, self.TEXTBOOK_PAGE.format(i + 1)) for i in range(count)])
+        courses = []
+        for i in range(count):
+            code = [choice[0] for choice in Subject.CODE_CHOICES][i % len(Subject.CODE_CHOICES)]
+            subject, _ = Subject.objects.get_or_create(code=code, defaults={'name': code, 'order': i})
+            source = {'pdf_source': self.TEXTBOOK_PDF, 'pdf_page_range': str(i + 1)} if textbook else {'content': '课本内容'}
+            course = Course.objects.create(
+                subject=subject, grade='grade1', course_number=i + 1, title=f'第{i + 1}课',
+                outline='大纲', difficulty='easy', **source
+            )
+            KnowledgeSummary.objects.create(course=course, content='知识点')
+            Exercise.objects.bulk_create([
+                Exercise(course=course, question_type='fill', question_text=f'题目{j}', answer='1',
+                         explanation='', difficulty='basic')
+                for j in range(count)
+            ])
+            StudyProgress.objects.create(user=self.user, course=course, progress=10)
+            courses.append(course)
+        # 测试数据的写入会递增目录版本号，清空缓存确保下面的请求真正查询数据库
+        cache.clear()
+        return courses
+
+    def get_course_list(self):
+        with self.assertNumQueries(self.LIST_QUERIES):
+            response = self.client.get('/api/v1/courses/courses/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def get_course_detail(self, course, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get(f'/api/v1/courses/courses/{course.id}/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_course_list_with_one_course(self):
+        self.create_courses(1)
+        data = self.get_course_list()
+        self.assertEqual(len(data['results']), 1)
+
+    def test_course_list_with_fifteen_courses(self):
+        self.create_courses(15)
+        data = self.get_course_list()
+        self.assertEqual(len(data['results']), 15)
+        self.assertEqual(len({course['subject']['id'] for course in data['results']}),
+                         len(Subject.objects.all()))
+
+    def test_course_detail_with_one_course(self):
+        course, = self.create_courses(1)
+        data = self.get_course_detail(course, self.DETAIL_QUERIES)
+        self.assertTrue(data['has_summary'])
+        self.assertEqual(data['exercises_count'], 1)
+        self.assertIsNone(data['user_progress'])
+
+    def test_course_detail_with_fifteen_courses(self):
+        course = self.create_courses(15)[-1]
+        data = self.get_course_detail(course, self.DETAIL_QUERIES)
+        self.assertTrue(data['has_summary'])
+        self.assertEqual(data['exercises_count'], 15)
+        self.assertEqual(data['content_length'], len('课本内容'))
+
+    def test_course_detail_authenticated(self):
+        self.client.force_authenticate(self.user)
+        for count in (1, 15):
+            with self.subTest(count=count):
+                Course.objects.all().delete()
+                course = self.create_courses(count)[-1]
+                data = self.get_course_detail(course, self.DETAIL_QUERIES_AUTHENTICATED)
+                self.assertEqual(data['exercises_count'], count)
+                self.assertEqual(data['user_progress']['progress'], 10)
+
+    def test_course_list_with_textbook_courses(self):
+        for count in (1, 15):
+            with self.subTest(count=count):
+                Course.objects.all().delete()
+                Textbook.objects.all().delete()
+                self.create_courses(count, textbook=True)
+                data = self.get_course_list()
+                self.assertEqual(len(data['results']), count)
+
+    def test_course_detail_with_textbook_courses(self):
+        for count in (1, 15):
+            with self.subTest(count=count):
+                Course.objects.all().delete()
+                Textbook.objects.all().delete()
+                course = self.create_courses(count, textbook=True)[-1]
+                data = self.get_course_detail(course, self.DETAIL_QUERIES_TEXTBOOK)
+                self.assertTrue(data['has_content'])
+                self.assertEqual(data['content_length'], len(self.TEXTBOOK_PAGE.format(count)))
@@ -3,6 +3,7 @@
 """
 from django.urls import path
 from . import views
+from apps.search import views as search_views
 
 app_name = 'courses'
 
@@ -12,7 +13,9 @@ urlpatterns = [
     
     # 课程
     path('courses/', views.get_courses, name='courses'),
+    path('search/', search_views.search_courses, name='search'),
     path('courses/<int:course_id>/', views.get_course_detail, name='course-detail'),
+    path('courses/<int:course_id>/content/', views.get_course_content, name='course-content'),
     
     # 知识点总结
     path('courses/<int:course_id>/summary/', views.get_knowledge_summary, name='knowledge-summary'),
@@ -20,6 +23,7 @@ urlpatterns = [
     
     # 学习进度
     path('study-progress/', views.get_study_progress, name='study-progress'),
+    path('study-progress/heartbeat/', views.study_heartbeat, name='study-heartbeat'),
     path('study-progress/<int:course_id>/', views.update_study_progress, name='update-progress'),
 ]
 
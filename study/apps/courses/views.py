@@ -4,39 +4,59 @@
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.pagination import PageNumberPagination
+from django.db import transaction
 from django.db.models import Q, Count, Sum
+from django.db.models.functions import Length, Substr
+from django.http import HttpResponse
+from django.middleware.gzip import GZipMiddleware
 from utils.response import APIResponse
 from .models import Subject, Course, KnowledgeSummary, StudyProgress
 from .serializers import (
     SubjectSerializer, CourseListSerializer, CourseDetailSerializer,
-    KnowledgeSummarySerializer, StudyProgressSerializer, UpdateStudyProgressSerializer
+    KnowledgeSummarySerializer, StudyProgressSerializer, UpdateStudyProgressSerializer,
+    StudyHeartbeatSerializer, get_user_progress_data
 )
-from apps.ai_services.clients.deepseek_client import DeepSeekClient
-from apps.ai_services.clients.openai_client import OpenAIClient
+from .progress import apply_progress_delta, record_study_activity
+from .cache import catalogue_cache_key, get_or_set_catalogue, etag_response
+from apps.ai_services.clients import get_ai_client
 from apps.ai_services.prompt_manager import PromptManager
+from apps.users.ai_keys import resolve_ai_credentials
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_subjects(request):
     """获取学科列表"""
-    subjects = Subject.objects.filter(is_active=True).order_by('order')
-    serializer = SubjectSerializer(subjects, many=True)
-    return APIResponse.success(serializer.data)
+    def build():
+        subjects = Subject.objects.filter(is_active=True).order_by('order')
+        return list(SubjectSerializer(subjects, many=True).data)
+    
+    data, etag = get_or_set_catalogue(catalogue_cache_key('subjects'), build)
+    return etag_response(request, data, etag)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_courses(request):
     """获取课程列表"""
+    # 分页链接包含Host，缓存键需区分
+    cache_key = catalogue_cache_key('courses', request.query_params, request.get_host())
+    data, etag = get_or_set_catalogue(cache_key, lambda: _build_course_list(request))
+    return etag_response(request, data, etag)
+
+
+def _build_course_list(request):
+    """查询并序列化课程列表"""
     # 获取查询参数
     subject_id = request.query_params.get('subject_id')
     subject_code = request.query_params.get('subject')  # 支持学科代码
     grade = request.query_params.get('grade')
     difficulty = request.query_params.get('difficulty')
     
-    # 构建查询
-    queryset = Course.objects.filter(is_active=True)
+    # 构建查询（列表不需要课本全文，延迟加载content）
+    queryset = CourseListSerializer.setup_eager_loading(
+        Course.objects.filter(is_active=True).defer('content')
+    )
     
     # 支持通过学科ID或学科代码筛选
     if subject_id:
@@ -56,28 +76,185 @@ def get_courses(request):
     
     if page is not None:
         serializer = CourseListSerializer(page, many=True)
-        return APIResponse.success({
+        return {
             'count': paginator.page.paginator.count,
             'next': paginator.get_next_link(),
             'previous': paginator.get_previous_link(),
-            'results': serializer.data
-        })
+            'results': list(serializer.data)
+        }
     
     serializer = CourseListSerializer(queryset, many=True)
-    return APIResponse.success(serializer.data)
+    return list(serializer.data)
 
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_course_detail(request, course_id):
     """获取课程详情"""
+    def build():
+        try:
+            course = CourseDetailSerializer.setup_eager_loading(
+                Course.objects.defer('content')
+            ).get(id=course_id, is_active=True)
+        except Course.DoesNotExist:
+            return None
+        # 课本全文通过 get_course_content 分段获取；缓存内容与用户无关，user_progress在下面单独填充
+        return dict(CourseDetailSerializer(course).data)
+    
+    data, etag = get_or_set_catalogue(catalogue_cache_key('course-detail', None, course_id), build)
+    if data is None:
+        return APIResponse.not_found("课程不存在")
+    
+    if request.user.is_authenticated:
+        data = dict(data, user_progress=get_user_progress_data(request.user, course_id))
+        etag = None  # 包含个人进度，需重新计算ETag
+    
+    return etag_response(request, data, etag)
+
+
+# 课本内容分段读取
+CONTENT_PAGE_SIZE = 5000
+CONTENT_MAX_PAGE_SIZE = 20000
+
+_gzip_middleware = GZipMiddleware(lambda request: None)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def get_course_content(request, course_id):
+    """
+    分段获取课本内容
+    
+    - 默认按字符分页返回JSON：?page=1&page_size=5000
+    - 带Range请求头时返回纯文本片段（206），支持 bytes=0-1023（UTF-8字节）和 chars=0-999（字符）
+    - ?raw=1 返回完整纯文本
+    """
+    range_header = request.META.get('HTTP_RANGE', '')
+    
+    if range_header or request.query_params.get('raw') == '1':
+        return _get_course_content_text(request, course_id, range_header)
+    
     try:
-        course = Course.objects.get(id=course_id, is_active=True)
-    except Course.DoesNotExist:
+        page = max(1, int(request.query_params.get('page', 1)))
+        page_size = int(request.query_params.get('page_size', CONTENT_PAGE_SIZE))
+    except ValueError:
+        return APIResponse.error("page和page_size必须是整数")
+    page_size = min(max(1, page_size), CONTENT_MAX_PAGE_SIZE)
+    offset = (page - 1) * page_size
+    
+    # 只在数据库中截取需要的片段，不加载全文
+    row = Course.objects.filter(id=course_id, is_active=True).annotate(
+        total_length=Length('content'),
+        chunk=Substr('content', offset + 1, page_size)
+    ).values('total_length', 'chunk', 'pdf_source', 'pdf_page_range').first()
+    if row is None:
         return APIResponse.not_found("课程不存在")
     
-    serializer = CourseDetailSerializer(course, context={'request': request})
-    return APIResponse.success(serializer.data)
+    total_length = row['total_length'] or 0
+    chunk = row['chunk'] or ''
+    if not total_length and row['pdf_source']:
+        # 课程自身没有内容时从共享的课本页面读取（只取本课页码范围）
+        content = Course(pdf_source=row['pdf_source'], pdf_page_range=row['pdf_page_range']).get_course_content()
+        total_length = len(content)
+        chunk = content[offset:offset + page_size]
+    total_pages = (total_length + page_size - 1) // page_size
+    
+    response = APIResponse.success({
+        'course_id': int(course_id),
+        'page': page,
+        'page_size': page_size,
+        'total_pages': total_pages,
+        'offset': offset,
+        'length': len(chunk),
+        'total_length': total_length,
+        'has_next': page < total_pages,
+        'content': chunk
+    })
+    return _gzip_response(request, response)
+
+
+def _get_course_content_text(request, course_id, range_header):
+    """以纯文本形式返回课本内容，支持Range请求"""
+    course = Course.objects.filter(id=course_id, is_active=True).only(
+        'content', 'pdf_source', 'pdf_page_range'
+    ).first()
+    if course is None:
+        return APIResponse.not_found("课程不存在")
+    content = course.get_course_content()
+    
+    if not range_header:
+        response = HttpResponse(content, content_type='text/plain; charset=utf-8')
+        response['Accept-Ranges'] = 'bytes, chars'
+        response = _gzip_response(request, response)
+        response['Content-Length'] = str(len(response.content))
+        return response
+    
+    unit, _, spec = range_header.partition('=')
+    unit = unit.strip().lower()
+    if unit == 'bytes':
+        body = content.encode('utf-8')
+    elif unit == 'chars':
+        body = content
+    else:
+        return _range_not_satisfiable('bytes', len(content.encode('utf-8')))
+    
+    total = len(body)
+    byte_range = _parse_range(spec, total)
+    if byte_range is None:
+        return _range_not_satisfiable(unit, total)
+    
+    start, end = byte_range
+    part = body[start:end + 1]
+    if unit == 'chars':
+        part = part.encode('utf-8')
+    
+    # 分段响应不压缩，保证Content-Range与实际字节一致
+    response = HttpResponse(part, status=206, content_type='text/plain; charset=utf-8')
+    response['Content-Range'] = f'{unit} {start}-{end}/{total}'
+    response['Accept-Ranges'] = 'bytes, chars'
+    response['Content-Length'] = str(len(part))
+    return response
+
+
+def _parse_range(spec, total):
+    """解析单个区间（如 0-99、100-、-50），超出范围返回None"""
+    if ',' in spec or total == 0:
+        return None  # 不支持多区间
+    
+    start_str, sep, end_str = spec.strip().partition('-')
+    if not sep:
+        return None
+    try:
+        if start_str == '':
+            # 后缀区间：最后N个
+            length = int(end_str)
+            if length <= 0:
+                return None
+            return max(0, total - length), total - 1
+        start = int(start_str)
+        end = int(end_str) if end_str else total - 1
+    except ValueError:
+        return None
+    
+    if start >= total or end < start:
+        return None
+    return start, min(end, total - 1)
+
+
+def _range_not_satisfiable(unit, total):
+    """416响应"""
+    response = HttpResponse(status=416)
+    response['Content-Range'] = f'{unit} */{total}'
+    return response
+
+
+def _gzip_response(request, response):
+    """客户端支持时对完整响应进行gzip压缩"""
+    if hasattr(response, 'add_post_render_callback') and not response.is_rendered:
+        # DRF响应在视图返回后才渲染，渲染完成后再压缩
+        response.add_post_render_callback(lambda r: _gzip_middleware.process_response(request, r))
+        return response
+    return _gzip_middleware.process_response(request, response)
 
 
 @api_view(['GET'])
@@ -89,13 +266,16 @@ def get_knowledge_summary(request, course_id):
     except Course.DoesNotExist:
         return APIResponse.not_found("课程不存在")
     
-    # 获取最新版本的总结
-    summary = course.summaries.order_by('-version').first()
-    if not summary:
+    def build():
+        # 获取最新版本的总结
+        summary = course.summaries.order_by('-version').first()
+        return dict(KnowledgeSummarySerializer(summary).data) if summary else None
+    
+    data, etag = get_or_set_catalogue(catalogue_cache_key('summary', None, course_id), build)
+    if data is None:
         return APIResponse.error("暂无知识点总结", code=404)
     
-    serializer = KnowledgeSummarySerializer(summary)
-    return APIResponse.success(serializer.data)
+    return etag_response(request, data, etag)
 
 
 @api_view(['POST'])
@@ -107,17 +287,16 @@ def generate_knowledge_summary(request, course_id):
     except Course.DoesNotExist:
         return APIResponse.not_found("课程不存在")
     
-    # 检查课程是否有内容
-    if not course.content or not course.content.strip():
+    # 检查课程是否有内容（课程自有内容或共享的课本页面）
+    if not course.get_content_length():
         return APIResponse.error("该课程暂无课本内容，无法生成知识点总结", code=400)
     
     # 获取前端传来的参数
-    api_key = request.data.get('api_key')
-    model = request.data.get('model', 'deepseek-chat')  # 默认使用chat
+    credentials = resolve_ai_credentials(request)  # 优先使用服务端保存的配置，默认使用chat
     regenerate = request.data.get('regenerate', False)
     
-    if not api_key:
-        return APIResponse.error("请提供API Key", code=400)
+    if credentials is None:
+        return APIResponse.error("请先在个人中心配置API Key", code=400)
     
     # 检查是否需要重新生成
     if not regenerate and course.summaries.exists():
@@ -130,8 +309,8 @@ def generate_knowledge_summary(request, course_id):
         # 截取课本内容（避免太长导致超时）
         # 如果内容超过5000字，只取前5000字
         max_content_length = 5000
-        original_length = len(course.content)
-        course_content = course.content[:max_content_length] if original_length > max_content_length else course.content
+        original_length = course.get_content_length()
+        course_content = course.get_course_content(max_length=max_content_length)
         
         if original_length > max_content_length:
             course_content += f"\n\n...(原内容{original_length}字，已截取前{max_content_length}字)"
@@ -148,15 +327,7 @@ def generate_knowledge_summary(request, course_id):
         )
         
         # 根据模型选择AI客户端
-        if 'deepseek' in model.lower():
-            # DeepSeek系列：deepseek-chat, deepseek-reasoner
-            ai_client = DeepSeekClient(api_key=api_key, model=model)
-        elif 'gpt' in model.lower():
-            # OpenAI系列：gpt-5
-            ai_client = OpenAIClient(api_key=api_key, model=model)
-        else:
-            # 默认使用DeepSeek-Chat
-            ai_client = DeepSeekClient(api_key=api_key, model='deepseek-chat')
+        ai_client = get_ai_client(credentials.model, credentials.api_key, credentials.api_endpoint)
         
         # 调用AI生成知识点总结
         ai_response = ai_client.call_api(final_prompt)
@@ -260,22 +431,21 @@ def update_study_progress(request, course_id):
     if not serializer.is_valid():
         return APIResponse.error("参数错误", errors=serializer.errors)
     
-    # 获取或创建学习进度
-    progress, created = StudyProgress.objects.get_or_create(
-        user=request.user,
-        course=course,
-        defaults={'status': 'not_started', 'progress': 0, 'study_time': 0}
-    )
+    data = serializer.validated_data
+    study_time = data.get('study_time', 0)
     
-    # 更新字段
-    if 'status' in serializer.validated_data:
-        progress.status = serializer.validated_data['status']
-    if 'progress' in serializer.validated_data:
-        progress.progress = serializer.validated_data['progress']
-    if 'study_time' in serializer.validated_data:
-        progress.study_time += serializer.validated_data['study_time']
+    # 单条UPDATE原子累加学习时长，只写入变化的列
+    with transaction.atomic():
+        apply_progress_delta(
+            request.user,
+            course.id,
+            study_time=study_time,
+            status=data.get('status'),
+            progress=data.get('progress')
+        )
+        record_study_activity(request.user, study_time)
     
-    progress.save()
+    progress = StudyProgress.objects.get(user=request.user, course=course)
     
     return APIResponse.success({
         'course_id': course.id,
@@ -285,3 +455,41 @@ def update_study_progress(request, course_id):
         'last_access': progress.last_access.isoformat()
     }, message="学习进度更新成功")
 
+
+@api_view(['POST'])
+@permission_classes([IsAuthenticated])
+def study_heartbeat(request):
+    """
+    批量上报学习心跳
+    
+    请求体：{"events": [{"course_id": 1, "seconds": 60, "status": "in_progress", "progress": 30}, ...]}
+    同一课程的多个事件会合并（时长累加，状态和进度取最后一次），在一个事务中写入，
+    并同步累加用户总学习时长和连续学习天数。
+    """
+    serializer = StudyHeartbeatSerializer(data=request.data)
+    if not serializer.is_valid():
+        return APIResponse.error("参数错误", errors=serializer.errors)
+    
+    # 按课程合并事件
+    merged = {}
+    for event in serializer.validated_data['events']:
+        item = merged.setdefault(event['course_id'], {'study_time': 0, 'status': None, 'progress': None})
+        item['study_time'] += event['seconds']
+        if 'status' in event:
+            item['status'] = event['status']
+        if 'progress' in event:
+            item['progress'] = event['progress']
+    
+    valid_ids = set(Course.objects.filter(id__in=merged, is_active=True).values_list('id', flat=True))
+    total_time = sum(merged[course_id]['study_time'] for course_id in valid_ids)
+    
+    with transaction.atomic():
+        for course_id in sorted(valid_ids):  # 固定顺序加锁，避免并发心跳死锁
+            apply_progress_delta(request.user, course_id, **merged[course_id])
+        record_study_activity(request.user, total_time)
+    
+    return APIResponse.success({
+        'applied_courses': sorted(valid_ids),
+        'ignored_courses': sorted(set(merged) - valid_ids),
+        'study_time': total_time
+    }, message="学习心跳已记录")
@@ -2,19 +2,37 @@
 练习题模块Admin配置
 """
 from django.contrib import admin
-from .models import Exercise, AnswerRecord
+from .models import Exercise, AnswerRecord, GenerationBatch, InventoryBucket
+
+
+@admin.register(GenerationBatch)
+class GenerationBatchAdmin(admin.ModelAdmin):
+    list_display = ['id', 'course', 'ai_model', 'difficulty', 'created_at', 'retired_at']
+    list_filter = ['ai_model', 'created_at', 'retired_at']
+    search_fields = ['course__title']
+    readonly_fields = ['created_at']
+
+
+@admin.register(InventoryBucket)
+class InventoryBucketAdmin(admin.ModelAdmin):
+    list_display = ['id', 'course', 'difficulty', 'question_type', 'target', 'refilled_at', 'attempted_at', 'last_error']
+    list_filter = ['difficulty', 'question_type']
+    search_fields = ['course__title']
+    readonly_fields = ['refilled_at', 'attempted_at', 'last_error']
+    raw_id_fields = ['course']
 
 
 @admin.register(Exercise)
 class ExerciseAdmin(admin.ModelAdmin):
-    list_display = ['id', 'course', 'question_type', 'difficulty', 'is_ai_generated', 'created_at']
+    list_display = ['id', 'course', 'question_type', 'difficulty', 'is_ai_generated', 'batch', 'created_at']
     list_filter = ['question_type', 'difficulty', 'is_ai_generated', 'created_at']
     search_fields = ['question_text', 'course__title']
     readonly_fields = ['created_at', 'updated_at']
+    raw_id_fields = ['batch']
     
     fieldsets = (
         ('基本信息', {
-            'fields': ('course', 'question_type', 'difficulty', 'is_ai_generated')
+            'fields': ('course', 'question_type', 'difficulty', 'is_ai_generated', 'batch')
         }),
         ('题目内容', {
             'fields': ('question_text', 'options', 'answer', 'explanation')
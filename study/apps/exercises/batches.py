@@ -0,0 +1,129 @@
+"""
+AI练习题生成批次
+
+重新生成练习题时不再删除旧题目（会级联删除全部答题记录）：
+- 新题目写入新批次，Course.active_exercise_batch 切换到新批次（一条UPDATE）
+- 旧批次标记 retired_at，题目和答题记录保留，正在作答旧题目的学生仍可提交
+- 本地生成器为某个学生生成的一组题是私有批次：不切换当前批次，创建时即标记停用
+- 停用超过 EXERCISE_BATCH_GC_GRACE 秒、没有任何答题记录、且不在题库中的批次在后台线程中清理
+  （也可以定时运行 python manage.py collect_exercise_batches）
+
+保留规则：pick_unseen 从课程的全部题库题目（有 QuestionFingerprint）中挑选，不看批次是否停用，
+所以只要批次中有一道题在题库中，整个批次就一直保留。API生成和库存补货的批次整批加入题库，
+停用后也不会被清理；实际被清理的是本地生成器的私有批次和没有加入题库的旧批次。
+题库的增长由写入前的近似去重、以及只在题库中没做过的题目不够时才生成新题（库存补货以
+EXERCISE_INVENTORY_TARGET 为上限）来限制，不靠批次清理。
+"""
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef
+from django.utils import timezone
+
+from apps.courses.cache import bump_catalogue_version
+from apps.courses.models import Course
+from .models import AnswerRecord, Exercise, GenerationBatch, QuestionFingerprint
+
+logger = logging.getLogger(__name__)
+
+# 后台清理线程（单线程，清理任务串行执行）
+_collector = ThreadPoolExecutor(max_workers=1, thread_name_prefix='exercise-batch-gc')
+
+
+def create_batch(course, exercises_data, ai_model='', difficulty='', activate=True, private=False):
+    """
+    把AI生成的题目写入新批次并设为课程的当前批次
+
+    Args:
+        course: 课程
+        exercises_data: Exercise字段字典列表
+        ai_model: 生成所用的模型
+        difficulty: 生成时指定的难度
+        activate: 是否设为当前批次（题库补货的批次不切换，题目只通过题库分配）
+        private: 只返回给请求的学生的一组题（不切换当前批次，创建时即标记停用，没人作答时由后台清理）
+
+    Returns:
+        (批次, 创建的题目列表)，没有题目时返回 (None, [])
+    """
+    if not exercises_data:
+        return None, []
+    activate = activate and not private
+
+    with transaction.atomic():
+        batch = GenerationBatch.objects.create(
+            course=course, ai_model=ai_model, difficulty=difficulty, retired_at=timezone.now() if private else None
+        )
+        # 逐条创建以获得主键（MySQL的bulk_create不回填主键）
+        exercises = [
+            Exercise.objects.create(course=course, batch=batch, is_ai_generated=True, **data)
+            for data in exercises_data
+        ]
+        if activate:
+            activate_batch(course, batch)
+
+    if activate or private:
+        schedule_batch_collection(course.id)
+    return batch, exercises
+
+
+def activate_batch(course, batch):
+    """切换课程的当前批次，原批次标记为停用（事务提交后使目录缓存失效一次）"""
+    now = timezone.now()
+    with transaction.atomic():
+        previous_id = (
+            Course.objects.select_for_update().filter(pk=course.pk)
+            .values_list('active_exercise_batch_id', flat=True).first()
+        )
+        Course.objects.filter(pk=course.pk).update(active_exercise_batch=batch)
+        if previous_id and previous_id != batch.id:
+            GenerationBatch.objects.filter(pk=previous_id).update(retired_at=now)
+        # 批次中的题目写入时不递增目录版本号（见 apps.courses.signals），课程题目数在这里统一失效
+        transaction.on_commit(bump_catalogue_version)
+    course.active_exercise_batch = batch
+
+
+def collect_retired_batches(course_id=None, grace=None):
+    """
+    删除停用超过宽限期、没有答题记录、且不在题库中的批次（连同其题目）
+
+    有题目在题库中的批次不删除：这些题目仍会被 pick_unseen 分配给没做过的学生（见模块说明的保留规则）。
+
+    Args:
+        course_id: 只清理某门课程，为None时清理全部
+        grace: 宽限期（秒），默认 settings.EXERCISE_BATCH_GC_GRACE
+
+    Returns:
+        删除的批次数
+    """
+    grace = settings.EXERCISE_BATCH_GC_GRACE if grace is None else grace
+    batches = GenerationBatch.objects.filter(
+        retired_at__lte=timezone.now() - timedelta(seconds=grace)
+    ).exclude(
+        Exists(AnswerRecord.objects.filter(exercise__batch=OuterRef('pk')))
+    ).exclude(
+        Exists(QuestionFingerprint.objects.filter(exercise__batch=OuterRef('pk')))
+    )
+    if course_id is not None:
+        batches = batches.filter(course_id=course_id)
+
+    # 批次没有答题记录，级联只涉及题目本身
+    _, deleted = batches.delete()
+    return deleted.get(GenerationBatch._meta.label, 0)
+
+
+def _collect_in_background(course_id):
+    try:
+        collect_retired_batches(course_id)
+    except Exception:
+        logger.exception('清理练习题批次失败: course_id=%s', course_id)
+    finally:
+        # 后台线程不经过请求结束的清理流程，主动关闭本线程的数据库连接
+        connection.close()
+
+
+def schedule_batch_collection(course_id):
+    """在事务提交后于后台线程清理该课程的旧批次"""
+    transaction.on_commit(lambda: _collector.submit(_collect_in_background, course_id))
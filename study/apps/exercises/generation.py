@@ -0,0 +1,107 @@
+"""
+生成练习题
+
+生成接口和题库补货任务共用：渲染Prompt、调用AI、把返回的JSON解析为Exercise字段字典。
+模型为 LOCAL_MODEL 时改用本地的数学题生成器（见 math_generators.py），不调用AI。
+"""
+import json
+
+from apps.ai_services.clients import get_ai_client
+from apps.ai_services.prompt_manager import PromptManager
+from apps.users.ai_keys import AICredentials
+from .math_generators import find_generators, generate_questions
+from .models import Exercise
+
+# 本地生成器的"模型名"（记录在 GenerationBatch.ai_model 中）
+LOCAL_MODEL = 'local'
+LOCAL_CREDENTIALS = AICredentials('', LOCAL_MODEL)
+
+
+class GenerationError(Exception):
+    """AI生成练习题失败（message可直接返回给前端）"""
+
+
+def _extract_json(ai_response):
+    """AI可能返回markdown格式，提取其中的JSON部分"""
+    if '```json' in ai_response:
+        json_start = ai_response.find('```json') + 7
+        json_end = ai_response.find('```', json_start)
+        return ai_response[json_start:json_end].strip()
+    if '```' in ai_response:
+        json_start = ai_response.find('```') + 3
+        json_end = ai_response.find('```', json_start)
+        return ai_response[json_start:json_end].strip()
+    return ai_response.strip()
+
+
+def has_local_generators(course, question_type=None):
+    """课程是否有可用的本地生成器"""
+    return bool(find_generators(course, question_type))
+
+
+def generate_exercise_fields(course, credentials, question_count, difficulty='basic', question_type=None):
+    """
+    调用AI（或本地生成器）生成一组练习题
+
+    Args:
+        course: 课程
+        credentials: AICredentials，使用本地生成器时传 LOCAL_CREDENTIALS
+        question_count: 题目数量
+        difficulty: 难度
+        question_type: 只生成某种题型，为None时由模板决定
+
+    Returns:
+        Exercise字段字典列表（未写入数据库）
+
+    Raises:
+        GenerationError: AI未返回内容或返回格式错误，或课程没有可用的本地生成器
+    """
+    if credentials.model == LOCAL_MODEL:
+        generators = find_generators(course, question_type)
+        if not generators:
+            raise GenerationError("该课程暂无可用的本地题目生成器")
+        return generate_questions(generators, question_count, difficulty)
+
+    # 使用PromptManager获取并渲染Prompt模板
+    final_prompt = PromptManager.get_and_render(
+        template_type='exercise_generation',
+        subject=course.subject.code,
+        course_title=course.title,
+        grade=course.get_grade_display(),
+        keywords=course.keywords,
+        difficulty=difficulty,
+        question_count=question_count,  # 参数名应该是question_count
+        course_content=course.get_course_content()
+    )
+    if question_type:
+        type_label = dict(Exercise.QUESTION_TYPE_CHOICES).get(question_type, question_type)
+        final_prompt += f"\n\n本次只生成{type_label}（type为{question_type}）。"
+
+    # 根据模型选择AI客户端
+    ai_client = get_ai_client(credentials.model, credentials.api_key, credentials.api_endpoint)
+    ai_response = ai_client.call_api(final_prompt)
+    if not ai_response:
+        raise GenerationError("AI生成失败，未返回内容")
+
+    # 解析AI返回的JSON格式练习题
+    try:
+        exercises_data = json.loads(_extract_json(ai_response))
+    except json.JSONDecodeError as e:
+        raise GenerationError(f"AI返回数据解析失败：{str(e)}")
+    if not isinstance(exercises_data, list):
+        raise GenerationError("AI返回格式错误：期望JSON数组")
+
+    exercises_fields = []
+    for ex_data in exercises_data:
+        if not isinstance(ex_data, dict):
+            continue  # 跳过有问题的题目
+        # 字段映射：AI返回的字段名 → 数据库字段名
+        exercises_fields.append({
+            'question_type': ex_data.get('type') or ex_data.get('question_type', question_type or 'choice'),
+            'question_text': ex_data.get('question') or ex_data.get('question_text', ''),
+            'options': ex_data.get('options', []),
+            'answer': ex_data.get('answer', ''),
+            'explanation': ex_data.get('explanation', ''),
+            'difficulty': ex_data.get('difficulty', difficulty),
+        })
+    return exercises_fields
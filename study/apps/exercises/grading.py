@@ -0,0 +1,90 @@
+"""
+练习题自动判分
+
+- 选择题：比较选项字母（"B"、"b"、"B. 粼粼(lín)" 都视为选B）；答案是选项内容（如 "x=2"）时
+  按题目选项换算成字母，换算不了时按填空题的方式比较全文
+- 填空题/简答题：规范化后完全相同才算正确（全角转半角、去掉空白和句末标点、
+  统一乘除号/减号/平方立方的写法）；数学等价但写法不同的答案请使用AI判题
+"""
+import re
+import unicodedata
+
+# 只有选项字母，如 "B"、"b."、"B、"、"B)"
+CHOICE_LETTER_RE = re.compile(r'^\s*([A-Da-d])\s*[.、)]?\s*$')
+# 选项字母 + 选项内容，如 "B. 粼粼(lín)"（字母后必须有分隔符，避免把 "x=2"、"a+b" 的首字母当成选项）
+CHOICE_WITH_TEXT_RE = re.compile(r'^\s*([A-Da-d])\s*[.、):]\s*(.+?)\s*$')
+OPTION_LETTERS = 'ABCD'
+TRAILING_PUNCT_RE = re.compile(r'[。.;；,，!！]+$')
+
+SYMBOL_REPLACEMENTS = [
+    ('×', '*'),
+    ('÷', '/'),
+    ('−', '-'),
+    ('—', '-'),
+    ('²', '^2'),
+    ('³', '^3'),
+]
+
+
+def normalize_answer(answer):
+    """规范化填空题/简答题答案"""
+    text = answer or ''
+    # 先替换上标：NFKC会把 ² 变成普通的 2
+    for symbol, replacement in SYMBOL_REPLACEMENTS:
+        text = text.replace(symbol, replacement)
+    text = unicodedata.normalize('NFKC', text)
+    text = re.sub(r'\s+', '', text).lower()
+    return TRAILING_PUNCT_RE.sub('', text)
+
+
+def _parse_options(options):
+    """题目选项 -> {规范化的选项内容: 选项字母}"""
+    if isinstance(options, dict):
+        items = [(str(letter), str(text)) for letter, text in options.items()]
+    elif isinstance(options, (list, tuple)):
+        items = []
+        for index, option in enumerate(options[:len(OPTION_LETTERS)]):
+            option = unicodedata.normalize('NFKC', str(option))
+            match = CHOICE_WITH_TEXT_RE.match(option)
+            items.append(match.groups() if match else (OPTION_LETTERS[index], option))
+    else:
+        return {}
+    return {normalize_answer(text): letter.strip().upper() for letter, text in items if normalize_answer(text)}
+
+
+def choice_letter(answer, options=None):
+    """
+    提取选择题答案的选项字母，无法识别时返回None
+
+    Args:
+        answer: 答案（选项字母、"字母. 内容" 或选项内容）
+        options: 题目选项，答案是选项内容时用来换算字母
+    """
+    text = unicodedata.normalize('NFKC', answer or '')
+    match = CHOICE_LETTER_RE.match(text) or CHOICE_WITH_TEXT_RE.match(text)
+    if match:
+        return match.group(1).upper()
+    return _parse_options(options).get(normalize_answer(text))
+
+
+def grade_answer(exercise, user_answer):
+    """
+    判断答案是否正确
+
+    Args:
+        exercise: Exercise对象
+        user_answer: 用户答案
+
+    Returns:
+        (是否正确, 得分)
+    """
+    letter = expected_letter = None
+    if exercise.question_type == 'choice':
+        letter = choice_letter(user_answer, exercise.options)
+        expected_letter = choice_letter(exercise.answer, exercise.options)
+    if letter is not None and expected_letter is not None:
+        is_correct = letter == expected_letter
+    else:
+        normalized = normalize_answer(user_answer)
+        is_correct = bool(normalized) and normalized == normalize_answer(exercise.answer)
+    return is_correct, 100 if is_correct else 0
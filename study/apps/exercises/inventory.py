@@ -0,0 +1,271 @@
+"""
+练习题库存
+
+学生第一次练习时等待AI生成要30~60秒。后台补货任务（python manage.py run_exercise_inventory）
+为每个 (课程, 难度, 题型) 在题库中提前备好题目，练习时直接从题库分配：
+- 库存 = 该组合下题库（有指纹）中还没有任何学生做过的题目数（与 pick_unseen 一样以答题记录为准），
+  学生做题后库存随之减少；目标见 InventoryBucket.target / EXERCISE_INVENTORY_TARGET
+- 需求 = 最近 EXERCISE_INVENTORY_DEMAND_DAYS 天的答题数 + 学习该课程的学生数 × LEARNER_WEIGHT
+  （还没做过题的课程，需求记在默认组合 DEFAULT_BUCKET 上）
+- 按 需求 × 缺货比例 从高到低补货；每个AI服务商同时进行的请求数不超过 EXERCISE_INVENTORY_PROVIDER_LIMITS
+- 补货的题目写入不切换为当前批次的新批次，去重后加入题库（见 question_bank.py）
+- 有本地数学题生成器的组合不备货：本地生成没有等待时间
+"""
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Count, Exists, OuterRef
+from django.utils import timezone
+
+from apps.ai_services.clients import get_provider
+from apps.courses.models import Course, StudyProgress
+from apps.users.ai_keys import AICredentials
+from .batches import create_batch
+from .generation import GenerationError, generate_exercise_fields, has_local_generators
+from .models import AnswerRecord, Exercise, InventoryBucket
+from .question_bank import add_to_bank, dedupe_questions
+
+logger = logging.getLogger(__name__)
+
+# 练习页默认请求的 (难度, 题型)
+DEFAULT_BUCKET = ('basic', 'choice')
+# 一个最近学习过课程的学生大约相当于多少道题的需求（一组练习题）
+LEARNER_WEIGHT = 5
+# 补货失败后，这段时间（秒）内不再重试该组合
+RETRY_DELAY = 10 * 60
+
+
+def get_inventory_credentials():
+    """补货使用的服务端AI配置，未配置时返回None"""
+    if not settings.EXERCISE_INVENTORY_API_KEY:
+        return None
+    return AICredentials(
+        settings.EXERCISE_INVENTORY_API_KEY,
+        settings.EXERCISE_INVENTORY_MODEL,
+        settings.EXERCISE_INVENTORY_API_ENDPOINT
+    )
+
+
+class RefillPlan:
+    """一个需要补货的 (课程, 难度, 题型)"""
+
+    def __init__(self, course_id, difficulty, question_type, stock, target, demand):
+        self.course_id = course_id
+        self.difficulty = difficulty
+        self.question_type = question_type
+        self.stock = stock
+        self.target = target
+        self.demand = demand
+
+    @property
+    def key(self):
+        return self.course_id, self.difficulty, self.question_type
+
+    @property
+    def deficit(self):
+        return max(self.target - self.stock, 0)
+
+    @property
+    def priority(self):
+        return self.demand * self.deficit / self.target if self.target else 0
+
+    def __repr__(self):
+        return f'<RefillPlan {self.key} stock={self.stock}/{self.target} demand={self.demand}>'
+
+
+def recent_demand(days=None):
+    """
+    最近的练习需求
+
+    Returns:
+        {(course_id, difficulty, question_type): 需求分数}
+    """
+    days = settings.EXERCISE_INVENTORY_DEMAND_DAYS if days is None else days
+    since = timezone.now() - timedelta(days=days)
+
+    demand = {}
+    answers = (
+        AnswerRecord.objects.filter(submitted_at__gte=since)
+        .values_list('exercise__course_id', 'exercise__difficulty', 'exercise__question_type')
+        .annotate(count=Count('id')).order_by()
+    )
+    for course_id, difficulty, question_type, count in answers:
+        demand[(course_id, difficulty, question_type)] = count
+
+    learners = (
+        StudyProgress.objects.filter(last_access__gte=since)
+        .values_list('course_id').annotate(count=Count('id')).order_by()
+    )
+    for course_id, count in learners:
+        key = (course_id, *DEFAULT_BUCKET)
+        demand[key] = demand.get(key, 0) + count * LEARNER_WEIGHT
+    return demand
+
+
+def current_stock(course_ids):
+    """{(course_id, difficulty, question_type): 题库中还没有人做过的题目数}"""
+    rows = (
+        Exercise.objects.filter(course_id__in=course_ids, fingerprint__isnull=False)
+        .exclude(Exists(AnswerRecord.objects.filter(exercise=OuterRef('pk'))))
+        .values_list('course_id', 'difficulty', 'question_type')
+        .annotate(count=Count('id')).order_by()
+    )
+    return {(course_id, difficulty, question_type): count for course_id, difficulty, question_type, count in rows}
+
+
+def plan_refills(limit=None):
+    """
+    计算需要补货的组合（按优先级从高到低）
+
+    有需求的组合和管理员添加的 InventoryBucket 都会参与；最近补货失败的组合暂时跳过。
+
+    Args:
+        limit: 最多返回的组合数
+    """
+    demand = recent_demand()
+    buckets = {
+        (bucket.course_id, bucket.difficulty, bucket.question_type): bucket
+        for bucket in InventoryBucket.objects.filter(course__is_active=True)
+    }
+    keys = set(demand) | set(buckets)
+    courses = Course.objects.select_related('subject').filter(
+        id__in={key[0] for key in keys}, is_active=True
+    ).in_bulk()
+    active_course_ids = set(courses)
+    stock = current_stock(active_course_ids)
+
+    retry_after = timezone.now() - timedelta(seconds=RETRY_DELAY)
+    plans = []
+    for key in keys:
+        if key[0] not in active_course_ids or has_local_generators(courses[key[0]], key[2]):
+            continue
+        bucket = buckets.get(key)
+        if bucket is not None and bucket.last_error and bucket.attempted_at and bucket.attempted_at > retry_after:
+            continue
+        target = bucket.target if bucket is not None and bucket.target is not None else settings.EXERCISE_INVENTORY_TARGET
+        # 管理员添加但暂无需求的组合也要备货，按最低需求排在后面
+        plan = RefillPlan(*key, stock=stock.get(key, 0), target=target, demand=max(demand.get(key, 0), 1))
+        if plan.deficit:
+            plans.append(plan)
+
+    plans.sort(key=lambda plan: plan.priority, reverse=True)
+    return plans[:limit] if limit else plans
+
+
+def refill_bucket(plan, credentials):
+    """
+    为一个组合调用AI补货
+
+    Returns:
+        加入题库的题目数
+
+    Raises:
+        GenerationError 等：补货失败或没有新增题目（已记录到 InventoryBucket.last_error）
+    """
+    course_id, difficulty, question_type = plan.key
+    bucket, _ = InventoryBucket.objects.get_or_create(
+        course_id=course_id, difficulty=difficulty, question_type=question_type
+    )
+    bucket.attempted_at = timezone.now()
+    try:
+        course = Course.objects.select_related('subject').get(id=course_id)
+        if not course.get_content_length():
+            raise ValueError('该课程暂无课本内容，无法生成练习题')
+
+        count = min(plan.deficit, settings.EXERCISE_INVENTORY_REFILL_SIZE)
+        generated = generate_exercise_fields(course, credentials, count, difficulty=difficulty,
+                                             question_type=question_type)
+        exercises_fields = [
+            dict(fields, difficulty=difficulty) for fields in generated if fields['question_type'] == question_type
+        ]
+        exercises_fields, duplicate_count = dedupe_questions(course_id, exercises_fields)
+        # 没有新增题目也按失败处理，在 RETRY_DELAY 内不再为该组合调用AI
+        if not exercises_fields:
+            raise GenerationError(
+                f'补货没有新增题目：AI返回{len(generated)}道，'
+                f'题型不符{len(generated) - len(exercises_fields) - duplicate_count}道，与题库重复{duplicate_count}道'
+            )
+        with transaction.atomic():
+            _, created_exercises = create_batch(
+                course, exercises_fields, ai_model=credentials.model, difficulty=difficulty, activate=False
+            )
+            add_to_bank(created_exercises)
+    except Exception as e:
+        bucket.last_error = str(e)[:1000]
+        bucket.save(update_fields=['attempted_at', 'last_error'])
+        raise
+
+    bucket.refilled_at = bucket.attempted_at
+    bucket.last_error = ''
+    bucket.save(update_fields=['attempted_at', 'refilled_at', 'last_error'])
+    return len(created_exercises)
+
+
+class ProviderLimiter:
+    """按AI服务商限制同时进行的请求数（线程安全）"""
+
+    def __init__(self, limits, default_limit=1):
+        self._semaphores = {
+            provider: threading.BoundedSemaphore(max(limit, 1)) for provider, limit in limits.items()
+        }
+        self._default_limit = default_limit
+        self._lock = threading.Lock()
+
+    def _semaphore(self, provider):
+        with self._lock:
+            if provider not in self._semaphores:
+                self._semaphores[provider] = threading.BoundedSemaphore(self._default_limit)
+            return self._semaphores[provider]
+
+    @contextmanager
+    def slot(self, provider):
+        semaphore = self._semaphore(provider)
+        with semaphore:
+            yield
+
+
+class InventoryWorker:
+    """后台补货：每一轮按优先级为缺货的组合调用AI，并发数受服务商限制"""
+
+    def __init__(self, credentials, limits=None):
+        limits = settings.EXERCISE_INVENTORY_PROVIDER_LIMITS if limits is None else limits
+        self.credentials = credentials
+        self.provider = get_provider(credentials.model)
+        self.limiter = ProviderLimiter(limits)
+        self._executor = ThreadPoolExecutor(
+            max_workers=max(sum(limits.values()), 1), thread_name_prefix='exercise-inventory'
+        )
+
+    def _refill(self, plan):
+        try:
+            with self.limiter.slot(self.provider):
+                return refill_bucket(plan, self.credentials)
+        finally:
+            # 工作线程不经过请求结束的清理流程，主动关闭本线程的数据库连接
+            connection.close()
+
+    def run_once(self, limit=None):
+        """
+        补货一轮
+
+        Returns:
+            [(RefillPlan, 加入题库的题目数或异常)]
+        """
+        plans = plan_refills(limit)
+        futures = [(plan, self._executor.submit(self._refill, plan)) for plan in plans]
+        results = []
+        for plan, future in futures:
+            try:
+                results.append((plan, future.result()))
+            except Exception as e:
+                logger.warning('练习题补货失败: %s: %s', plan, e)
+                results.append((plan, e))
+        return results
+
+    def shutdown(self):
+        self._executor.shutdown(wait=True)
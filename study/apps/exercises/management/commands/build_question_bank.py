@@ -0,0 +1,33 @@
+"""
+把已有的练习题加入题库（写入指纹），与题库近似重复的题目跳过
+
+用法：
+    python manage.py build_question_bank              # 处理全部课程
+    python manage.py build_question_bank --course 3   # 只处理指定课程
+"""
+from django.core.management.base import BaseCommand
+
+from apps.exercises.models import Exercise
+from apps.exercises.question_bank import Fingerprint, add_to_bank, find_duplicate
+
+
+class Command(BaseCommand):
+    help = '为已有的练习题写入指纹，加入题库'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--course', type=int, default=None, help='只处理指定课程ID')
+
+    def handle(self, *args, **options):
+        exercises = Exercise.objects.filter(fingerprint__isnull=True).order_by('id')
+        if options['course'] is not None:
+            exercises = exercises.filter(course_id=options['course'])
+
+        added = skipped = 0
+        for exercise in exercises.iterator():
+            if find_duplicate(exercise.course_id, Fingerprint.for_exercise(exercise)) is not None:
+                skipped += 1
+                continue
+            add_to_bank([exercise])
+            added += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 已加入题库 {added} 道题目，跳过近似重复 {skipped} 道'))
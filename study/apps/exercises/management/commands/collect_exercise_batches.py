@@ -0,0 +1,22 @@
+"""
+清理已停用、没有答题记录且不在题库中的练习题批次
+
+用法：
+    python manage.py collect_exercise_batches              # 按 EXERCISE_BATCH_GC_GRACE 清理
+    python manage.py collect_exercise_batches --grace 0    # 立即清理全部无答题记录、不在题库中的旧批次
+"""
+from django.core.management.base import BaseCommand
+
+from apps.exercises.batches import collect_retired_batches
+
+
+class Command(BaseCommand):
+    help = '清理已停用、没有答题记录且不在题库中的AI练习题批次'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--grace', type=int, default=None, help='停用超过多少秒才清理，默认 EXERCISE_BATCH_GC_GRACE')
+        parser.add_argument('--course', type=int, default=None, help='只清理指定课程ID')
+
+    def handle(self, *args, **options):
+        deleted = collect_retired_batches(course_id=options['course'], grace=options['grace'])
+        self.stdout.write(self.style.SUCCESS(f'✅ 已清理 {deleted} 个练习题批次'))
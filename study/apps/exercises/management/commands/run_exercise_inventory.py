@@ -0,0 +1,56 @@
+"""
+练习题库存后台补货
+
+用法：
+    python manage.py run_exercise_inventory              # 常驻运行，每 --interval 秒补货一轮
+    python manage.py run_exercise_inventory --once       # 只补货一轮（可由cron定时运行）
+    python manage.py run_exercise_inventory --dry-run    # 只列出需要补货的组合，不调用AI
+
+需要在 .env 中配置 EXERCISE_INVENTORY_API_KEY（服务端AI配置）。
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.exercises.inventory import InventoryWorker, get_inventory_credentials, plan_refills
+
+
+class Command(BaseCommand):
+    help = '按学习需求为 (课程, 难度, 题型) 预先生成练习题，补足题库库存'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--once', action='store_true', help='只补货一轮')
+        parser.add_argument('--interval', type=int, default=60, help='两轮补货之间的间隔（秒）')
+        parser.add_argument('--limit', type=int, default=None, help='每轮最多补货的组合数')
+        parser.add_argument('--dry-run', action='store_true', help='只列出需要补货的组合')
+
+    def handle(self, *args, **options):
+        if options['dry_run']:
+            for plan in plan_refills(options['limit']):
+                course_id, difficulty, question_type = plan.key
+                self.stdout.write(
+                    f'课程{course_id} {difficulty}/{question_type}: '
+                    f'库存 {plan.stock}/{plan.target}，需求 {plan.demand}，优先级 {plan.priority:.1f}'
+                )
+            return
+
+        credentials = get_inventory_credentials()
+        if credentials is None:
+            raise CommandError('未配置 EXERCISE_INVENTORY_API_KEY，无法补货')
+
+        worker = InventoryWorker(credentials)
+        try:
+            while True:
+                results = worker.run_once(options['limit'])
+                added = sum(result for _, result in results if isinstance(result, int))
+                failed = sum(1 for _, result in results if isinstance(result, Exception))
+                self.stdout.write(self.style.SUCCESS(
+                    f'✅ 补货 {len(results)} 个组合，新增 {added} 道题目' + (f'，失败 {failed} 个' if failed else '')
+                ))
+                if options['once']:
+                    break
+                time.sleep(options['interval'])
+        except KeyboardInterrupt:
+            self.stdout.write('⏹️ 已停止')
+        finally:
+            worker.shutdown()
@@ -0,0 +1,429 @@
+"""
+数学练习题本地生成器
+
+初中数学中合并同类项、乘法公式、代入求值、解方程/不等式等题目是公式化的，
+不需要调用AI：每个生成器用随机参数在本地生成题干、选项（含常见错误作为干扰项）、答案和解析，
+答案由参数直接算出，一定正确。
+
+生成器按课程的知识点注册：课程的关键词（按逗号、顿号、空格分隔）或去掉章节号的标题
+与注册的知识点完全相同时使用（"整式" 不会匹配 "整式的乘法"）。
+"""
+import random
+import re
+from fractions import Fraction
+
+OPTION_LETTERS = 'ABCD'
+TOPIC_SPLIT_RE = re.compile(r'[,，、;；\s]+')
+SECTION_NUMBER_RE = re.compile(r'^[\d.]+\s*')
+
+# 各难度的系数范围
+COEFFICIENT_RANGES = {
+    'basic': (1, 6),
+    'medium': (1, 9),
+    'advanced': (2, 12),
+}
+
+_registry = []
+
+
+class MathGenerator:
+    """一个参数化题目生成器"""
+
+    def __init__(self, func, topics, question_type):
+        self.func = func
+        self.name = func.__name__
+        self.topics = frozenset(topics)
+        self.question_type = question_type
+
+    def generate(self, rng, difficulty):
+        fields = self.func(rng, difficulty)
+        fields.update(question_type=self.question_type, difficulty=difficulty)
+        return fields
+
+    def __repr__(self):
+        return f'<MathGenerator {self.name}>'
+
+
+def register(*topics, question_type):
+    """注册生成器：被装饰的函数接收 (rng, difficulty)，返回题目字段字典"""
+    def decorator(func):
+        _registry.append(MathGenerator(func, topics, question_type))
+        return func
+    return decorator
+
+
+def course_topics(course):
+    """课程的知识点：关键词 + 去掉章节号的标题"""
+    topics = {topic for topic in TOPIC_SPLIT_RE.split(course.keywords or '') if topic}
+    title = SECTION_NUMBER_RE.sub('', course.title or '').strip()
+    if title:
+        topics.add(title)
+    return topics
+
+
+def find_generators(course, question_type=None):
+    """课程可用的生成器（非数学课程返回空列表）"""
+    if course.subject.code != 'math':
+        return []
+    topics = course_topics(course)
+    return [
+        generator for generator in _registry
+        if generator.topics & topics and (question_type is None or generator.question_type == question_type)
+    ]
+
+
+def generate_questions(generators, count, difficulty='basic', rng=None):
+    """
+    用生成器生成一组互不相同的题目
+
+    Args:
+        generators: find_generators 的结果
+        count: 题目数量
+        difficulty: 难度（basic/medium/advanced）
+        rng: random.Random，便于复现；默认使用独立的随机数生成器
+
+    Returns:
+        Exercise字段字典列表（参数空间太小时可能少于count）
+    """
+    if not generators:
+        return []
+    rng = rng or random.Random()
+    difficulty = difficulty if difficulty in COEFFICIENT_RANGES else 'basic'
+
+    questions, seen = [], set()
+    for _ in range(count * 5):
+        if len(questions) >= count:
+            break
+        fields = rng.choice(generators).generate(rng, difficulty)
+        # 选择题的题干可能相同（如"下列运算正确的是"），连同选项一起判断
+        key = (fields['question_text'], tuple(fields['options'] or ()))
+        if key in seen:
+            continue
+        seen.add(key)
+        questions.append(fields)
+    return questions
+
+
+# ---------------------------------------------------------------------------
+# 格式化
+# ---------------------------------------------------------------------------
+
+def _coefficient(rng, difficulty, allow_negative=None):
+    low, high = COEFFICIENT_RANGES[difficulty]
+    value = rng.randint(low, high)
+    if allow_negative is None:
+        allow_negative = difficulty != 'basic'
+    return -value if allow_negative and rng.random() < 0.4 else value
+
+
+def format_number(value):
+    """整数或分数"""
+    value = Fraction(value)
+    return str(value.numerator) if value.denominator == 1 else f'{value.numerator}/{value.denominator}'
+
+
+def format_term(coefficient, variable='', first=False):
+    """单项式：format_term(-1, 'x²') -> ' - x²'，first=True 时不带前导空格"""
+    if coefficient == 0:
+        return ''
+    magnitude = abs(coefficient)
+    body = (format_number(magnitude) if magnitude != 1 or not variable else '') + variable
+    if first:
+        return f'-{body}' if coefficient < 0 else body
+    return f' - {body}' if coefficient < 0 else f' + {body}'
+
+
+def format_polynomial(terms):
+    """多项式：[(3, 'x²'), (-2, 'x'), (1, '')] -> '3x² - 2x + 1'"""
+    text = ''
+    for coefficient, variable in terms:
+        if coefficient:
+            text += format_term(coefficient, variable, first=not text)
+    return text or '0'
+
+
+def format_value(value):
+    """代入时负数加括号"""
+    return f'({value})' if value < 0 else str(value)
+
+
+def make_choices(rng, correct, distractors):
+    """
+    打乱选项
+
+    Returns:
+        (['A. …', 'B. …', …], 正确选项字母)
+    """
+    options = [correct] + [option for option in dict.fromkeys(distractors) if option != correct][:3]
+    rng.shuffle(options)
+    letter = OPTION_LETTERS[options.index(correct)]
+    return [f'{OPTION_LETTERS[index]}. {option}' for index, option in enumerate(options)], letter
+
+
+# ---------------------------------------------------------------------------
+# 整式
+# ---------------------------------------------------------------------------
+
+@register('合并同类项', '整式', '整式的加法和减法', question_type='choice')
+def like_terms_choice(rng, difficulty):
+    """下列运算正确的是：一个正确的合并，三个常见错误"""
+    letter_a, letter_b = rng.sample(['a', 'b', 'm', 'n', 'x', 'y'], 2)
+    p, q = _coefficient(rng, difficulty, False), _coefficient(rng, difficulty)
+    while p + q == 0:
+        q = _coefficient(rng, difficulty)
+    square = f'{letter_a}²'
+    correct = f'{format_polynomial([(p, square), (q, square)])} = {format_term(p + q, square, first=True)}'
+
+    c, d = rng.randint(2, 9), rng.randint(2, 9)
+    e, f = rng.randint(3, 9), rng.randint(1, 6)
+    g = rng.randint(2, 9)
+    distractors = [
+        # 不是同类项也合并
+        f'{c}{letter_a} + {d}{letter_b} = {c + d}{letter_a}{letter_b}',
+        # 合并后丢掉字母
+        f'{e + f}{letter_b} - {e}{letter_b} = {f}',
+        # 字母的指数相加
+        f'{g}{letter_a} + {letter_a} = {g + 1}{letter_a}²',
+    ]
+    options, answer = make_choices(rng, correct, distractors)
+    q_text = f'({format_number(p)}{"+" if q > 0 else ""}{format_number(q)})'
+    return {
+        'question_text': '下列运算正确的是（ ）',
+        'options': options,
+        'answer': answer,
+        'explanation': (
+            f'合并同类项时，只把系数相加，字母和字母的指数不变。{answer}选项：'
+            f'{correct.split(" = ")[0]} = {q_text}{square} = {format_term(p + q, square, first=True)}，正确。'
+            f'其余选项分别错在把不是同类项的项合并、合并后丢掉了字母、把字母的指数相加。'
+        ),
+    }
+
+
+@register('合并同类项', '整式的加法和减法', question_type='fill')
+def like_terms_fill(rng, difficulty):
+    """合并同类项：打乱顺序的多项式"""
+    variables = ['x²', 'x', ''] if difficulty != 'basic' else ['x²', 'x']
+    terms = [(_coefficient(rng, difficulty), variable) for variable in variables for _ in range(2)]
+    totals = {variable: sum(c for c, v in terms if v == variable) for variable in variables}
+    while all(total == 0 for total in totals.values()):
+        terms[0] = (terms[0][0] + 1, terms[0][1])
+        totals = {variable: sum(c for c, v in terms if v == variable) for variable in variables}
+    rng.shuffle(terms)
+
+    answer = format_polynomial([(totals[variable], variable) for variable in variables])
+    groups = '，'.join(
+        f'{format_polynomial([(c, v) for c, v in terms if v == variable])} = '
+        f'{format_term(totals[variable], variable, first=True) or "0"}'
+        for variable in variables
+    )
+    return {
+        'question_text': f'合并同类项：{format_polynomial(terms)} = ___________',
+        'options': None,
+        'answer': answer,
+        'explanation': f'把同类项分组后系数相加：{groups}。所以结果为 {answer}。',
+    }
+
+
+@register('合并同类项', '整式的加法和减法', '代入求值', '化简求值', question_type='fill')
+def substitute_evaluate(rng, difficulty):
+    """化简并求值：p(x² - xy) + q(x² - xy)"""
+    p = rng.randint(2, 6)
+    q = _coefficient(rng, difficulty, True)
+    while p + q == 0:
+        q = _coefficient(rng, difficulty, True)
+    x = rng.choice([v for v in range(-4, 5) if v])
+    y = rng.choice([v for v in range(-4, 5) if v])
+    k = p + q
+    value = k * (x * x - x * y)
+
+    inner = 'x² - xy'
+    second = f'{" - " if q < 0 else " + "}{abs(q) if abs(q) != 1 else ""}({inner})'
+    simplified = format_polynomial([(k, 'x²'), (-k, 'xy')])
+    return {
+        'question_text': f'化简并求值：{p}({inner}){second}，其中x = {x}，y = {y}。',
+        'options': None,
+        'answer': str(value),
+        'explanation': (
+            f'先把 ({inner}) 看作一个整体合并同类项：原式 = ({p}{"+" if q > 0 else ""}{q})({inner}) = {simplified}。'
+            f'代入x = {x}，y = {y}：{k} × ({format_value(x)}² - {format_value(x)} × {format_value(y)}) '
+            f'= {k} × {x * x - x * y} = {value}。'
+        ),
+    }
+
+
+# ---------------------------------------------------------------------------
+# 乘法公式
+# ---------------------------------------------------------------------------
+
+def _linear(a, variable='x'):
+    return f'{a if a != 1 else ""}{variable}'
+
+
+@register('乘法公式', '平方差公式', question_type='fill')
+def difference_of_squares(rng, difficulty):
+    """(ax + b)(ax - b) = a²x² - b²"""
+    a = rng.randint(1, 3 if difficulty == 'basic' else 5)
+    b = rng.randint(1, 9)
+    if difficulty == 'advanced':
+        first, second = _linear(a, 'x'), _linear(b, 'y')
+        answer = format_polynomial([(a * a, 'x²'), (-b * b, 'y²')])
+        squares = f'({first})² - ({second})²'
+    else:
+        first, second = _linear(a, 'x'), str(b)
+        answer = format_polynomial([(a * a, 'x²'), (-b * b, '')])
+        squares = f'({first})² - {b}²'
+    expression = f'({first} + {second})({first} - {second})'
+    return {
+        'question_text': f'计算：{expression} = ___________',
+        'options': None,
+        'answer': answer,
+        'explanation': f'这是平方差公式：(a+b)(a-b) = a² - b²。所以{expression} = {squares} = {answer}。',
+    }
+
+
+@register('乘法公式', '完全平方公式', question_type='choice')
+def perfect_square(rng, difficulty):
+    """(ax ± b)² 的展开，干扰项为漏掉中间项、中间项没乘2、符号错误"""
+    a = 1 if difficulty == 'basic' else rng.randint(1, 4)
+    b = rng.randint(1, 9)
+    sign = rng.choice([1, -1])
+    middle = 2 * a * b * sign
+
+    def expand(square_a, middle_term, constant):
+        return format_polynomial([(square_a, 'x²'), (middle_term, 'x'), (constant, '')])
+
+    correct = expand(a * a, middle, b * b)
+    distractors = [
+        expand(a * a, 0, b * b),
+        expand(a * a, a * b * sign, b * b),
+        expand(a * a, -middle, b * b),
+        expand(a * a, middle, -b * b),
+    ]
+    options, answer = make_choices(rng, correct, distractors)
+    base = f'({_linear(a)} {"+" if sign > 0 else "-"} {b})'
+    return {
+        'question_text': f'计算 {base}² 的结果是（ ）',
+        'options': options,
+        'answer': answer,
+        'explanation': (
+            f'完全平方公式：(a±b)² = a² ± 2ab + b²。所以{base}² = ({_linear(a)})² '
+            f'{"+" if sign > 0 else "-"} 2 × {_linear(a)} × {b} + {b}² = {correct}，选{answer}。'
+            f'注意不要漏掉中间项 2ab，也不要把它写成 ab。'
+        ),
+    }
+
+
+# ---------------------------------------------------------------------------
+# 方程与不等式
+# ---------------------------------------------------------------------------
+
+@register('一元一次方程', '解一元一次方程', '一元一次方程的解法', question_type='fill')
+def linear_equation(rng, difficulty):
+    """ax + b = dx + e，解为整数"""
+    solution = rng.randint(-9, 9) if difficulty != 'basic' else rng.randint(1, 9)
+    a = _coefficient(rng, difficulty, difficulty != 'basic')
+    b = rng.randint(-9, 9) or 1
+    d = 0 if difficulty == 'basic' else rng.choice([v for v in range(-5, 6) if v != a])
+    e = (a - d) * solution + b
+
+    lhs = format_polynomial([(a, 'x'), (b, '')])
+    rhs = format_polynomial([(d, 'x'), (e, '')])
+    steps = f'移项得 {format_polynomial([(a - d, "x")])} = {format_number(e - b)}'
+    if a - d != 1:
+        steps += f'，两边同时除以 {format_number(a - d)} 得 x = {solution}'
+    return {
+        'question_text': f'解方程：{lhs} = {rhs}，x = ___________',
+        'options': None,
+        'answer': str(solution),
+        'explanation': f'{steps}。移项时要变号。检验：把 x = {solution} 代入，左边 = 右边 = {a * solution + b}。',
+    }
+
+
+@register('一元一次不等式', '解一元一次不等式', question_type='choice')
+def linear_inequality(rng, difficulty):
+    """ax + b > c，a为负数时要改变不等号方向"""
+    a = _coefficient(rng, difficulty)
+    b = rng.randint(-9, 9) or 2
+    bound = Fraction(rng.randint(-6, 9))
+    c = a * bound + b
+    strict = rng.random() < 0.6
+    symbol = '>' if strict else '≥'
+    flipped = '<' if strict else '≤'
+    result_symbol = symbol if a > 0 else flipped
+    other_symbol = flipped if a > 0 else symbol
+    wrong_bound = (c + b) / a  # 移项没有变号
+
+    correct = f'x {result_symbol} {format_number(bound)}'
+    distractors = [
+        f'x {other_symbol} {format_number(bound)}',
+        f'x {result_symbol} {format_number(wrong_bound)}',
+        f'x {result_symbol} {format_number(-bound)}' if bound else f'x {result_symbol} {format_number(bound + 1)}',
+        f'x {other_symbol} {format_number(wrong_bound)}',
+    ]
+    options, answer = make_choices(rng, correct, distractors)
+    explanation = f'移项得 {format_term(a, "x", first=True)} {symbol} {format_number(c - b)}，'
+    if a < 0:
+        explanation += f'两边同时除以负数 {a}，不等号方向改变，得 {correct}。'
+    elif a != 1:
+        explanation += f'两边同时除以 {a} 得 {correct}。'
+    else:
+        explanation += f'即 {correct}。'
+    return {
+        'question_text': f'不等式 {format_polynomial([(a, "x"), (b, "")])} {symbol} {format_number(c)} 的解集是（ ）',
+        'options': options,
+        'answer': answer,
+        'explanation': explanation,
+    }
+
+
+def _quadratic_roots(rng, difficulty):
+    limit = 6 if difficulty == 'basic' else 9
+    while True:
+        r1, r2 = rng.randint(-limit, limit), rng.randint(-limit, limit)
+        if r1 and r2 and r1 != r2 and r1 != -r2:
+            return sorted((r1, r2))
+
+
+@register('一元二次方程的解法', '解一元二次方程', question_type='choice')
+def quadratic_by_factoring(rng, difficulty):
+    """x² + px + q = 0 用因式分解求整数根"""
+    r1, r2 = _quadratic_roots(rng, difficulty)
+    equation = f'{format_polynomial([(1, "x²"), (-(r1 + r2), "x"), (r1 * r2, "")])} = 0'
+
+    def roots(a, b):
+        a, b = sorted((a, b))
+        return f'x₁ = {a}，x₂ = {b}'
+
+    correct = roots(r1, r2)
+    distractors = [roots(-r2, -r1), roots(r1, -r2), roots(-r1, r2)]
+    options, answer = make_choices(rng, correct, distractors)
+    factors = f'(x{format_term(-r1)})(x{format_term(-r2)})'
+    return {
+        'question_text': f'方程 {equation} 的解是（ ）',
+        'options': options,
+        'answer': answer,
+        'explanation': (
+            f'因式分解：{equation.replace(" = 0", "")} = {factors}，'
+            f'所以 x{format_term(-r1)} = 0 或 x{format_term(-r2)} = 0，得 {correct}。'
+            f'可以代入检验：两根之和为 {r1 + r2}，两根之积为 {r1 * r2}。'
+        ),
+    }
+
+
+@register('一元二次方程的根与系数的关系', '根与系数的关系', question_type='fill')
+def quadratic_vieta(rng, difficulty):
+    """韦达定理：两根之和或两根之积"""
+    r1, r2 = _quadratic_roots(rng, difficulty)
+    a = 1 if difficulty == 'basic' else rng.randint(1, 3)
+    b, c = -a * (r1 + r2), a * r1 * r2
+    equation = f'{format_polynomial([(a, "x²"), (b, "x"), (c, "")])} = 0'
+    if rng.random() < 0.5:
+        asked, value, formula = '两根之和', r1 + r2, f'x₁ + x₂ = -b/a = -({b})/{a}'
+    else:
+        asked, value, formula = '两根之积', r1 * r2, f'x₁x₂ = c/a = {c}/{a}'
+    return {
+        'question_text': f'若 x₁、x₂ 是方程 {equation} 的两个根，则{asked}为 ___________',
+        'options': None,
+        'answer': str(value),
+        'explanation': f'由根与系数的关系，{formula} = {value}。',
+    }
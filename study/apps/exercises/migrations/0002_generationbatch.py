@@ -0,0 +1,80 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:42
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0006_ingestionstate"),
+        ("exercises", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="GenerationBatch",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "ai_model",
+                    models.CharField(blank=True, max_length=50, verbose_name="AI模型"),
+                ),
+                (
+                    "difficulty",
+                    models.CharField(blank=True, max_length=20, verbose_name="难度"),
+                ),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="创建时间"),
+                ),
+                (
+                    "retired_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="停用时间"
+                    ),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="exercise_batches",
+                        to="courses.course",
+                        verbose_name="课程",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "练习题生成批次",
+                "verbose_name_plural": "练习题生成批次",
+                "db_table": "exercises_generationbatch",
+            },
+        ),
+        migrations.AddField(
+            model_name="exercise",
+            name="batch",
+            field=models.ForeignKey(
+                blank=True,
+                help_text="为空表示人工录入的题目",
+                null=True,
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name="exercises",
+                to="exercises.generationbatch",
+                verbose_name="生成批次",
+            ),
+        ),
+        migrations.AddIndex(
+            model_name="generationbatch",
+            index=models.Index(
+                fields=["retired_at"], name="exercises_g_retired_c584db_idx"
+            ),
+        ),
+    ]
@@ -0,0 +1,112 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:46
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_course_active_exercise_batch"),
+        ("exercises", "0002_generationbatch"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="QuestionFingerprint",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "text_hash",
+                    models.CharField(max_length=40, verbose_name="规范化题干哈希"),
+                ),
+                ("signature", models.JSONField(verbose_name="MinHash签名")),
+                (
+                    "created_at",
+                    models.DateTimeField(auto_now_add=True, verbose_name="创建时间"),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.course",
+                        verbose_name="课程",
+                    ),
+                ),
+                (
+                    "exercise",
+                    models.OneToOneField(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="fingerprint",
+                        to="exercises.exercise",
+                        verbose_name="题目",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "题库指纹",
+                "verbose_name_plural": "题库指纹",
+                "db_table": "exercises_questionfingerprint",
+            },
+        ),
+        migrations.CreateModel(
+            name="QuestionLSHBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("band", models.PositiveSmallIntegerField(verbose_name="分段")),
+                ("bucket", models.BigIntegerField(verbose_name="桶")),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.course",
+                        verbose_name="课程",
+                    ),
+                ),
+                (
+                    "fingerprint",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="buckets",
+                        to="exercises.questionfingerprint",
+                        verbose_name="指纹",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "题库LSH桶",
+                "verbose_name_plural": "题库LSH桶",
+                "db_table": "exercises_questionlshbucket",
+                "indexes": [
+                    models.Index(
+                        fields=["course", "band", "bucket"],
+                        name="exercises_q_course__8ad53e_idx",
+                    )
+                ],
+            },
+        ),
+        migrations.AddIndex(
+            model_name="questionfingerprint",
+            index=models.Index(
+                fields=["course", "text_hash"], name="exercises_q_course__2f5ccb_idx"
+            ),
+        ),
+    ]
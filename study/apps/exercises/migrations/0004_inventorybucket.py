@@ -0,0 +1,93 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:50
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("courses", "0007_course_active_exercise_batch"),
+        ("exercises", "0003_question_bank"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="InventoryBucket",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "difficulty",
+                    models.CharField(
+                        choices=[
+                            ("basic", "基础"),
+                            ("medium", "中等"),
+                            ("advanced", "拓展"),
+                        ],
+                        max_length=20,
+                        verbose_name="难度",
+                    ),
+                ),
+                (
+                    "question_type",
+                    models.CharField(
+                        choices=[
+                            ("choice", "选择题"),
+                            ("fill", "填空题"),
+                            ("short_answer", "简答题"),
+                        ],
+                        max_length=20,
+                        verbose_name="题型",
+                    ),
+                ),
+                (
+                    "target",
+                    models.PositiveIntegerField(
+                        blank=True,
+                        help_text="为空时使用 EXERCISE_INVENTORY_TARGET",
+                        null=True,
+                        verbose_name="目标库存",
+                    ),
+                ),
+                (
+                    "refilled_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="最后补货时间"
+                    ),
+                ),
+                (
+                    "attempted_at",
+                    models.DateTimeField(
+                        blank=True, null=True, verbose_name="最后尝试时间"
+                    ),
+                ),
+                (
+                    "last_error",
+                    models.TextField(blank=True, verbose_name="最后一次错误"),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="inventory_buckets",
+                        to="courses.course",
+                        verbose_name="课程",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "练习题库存",
+                "verbose_name_plural": "练习题库存",
+                "db_table": "exercises_inventorybucket",
+                "unique_together": {("course", "difficulty", "question_type")},
+            },
+        ),
+    ]
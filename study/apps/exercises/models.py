@@ -6,6 +6,32 @@ from django.contrib.auth.models import User
 from apps.courses.models import Course
 
 
+class GenerationBatch(models.Model):
+    """
+    AI生成的一组练习题
+
+    课程通过 Course.active_exercise_batch 指向当前使用的批次，重新生成只需切换指针；
+    被替换的批次标记 retired_at，没有答题记录时由后台清理（见 batches.py）。
+    """
+    
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name='课程', related_name='exercise_batches')
+    ai_model = models.CharField('AI模型', max_length=50, blank=True)
+    difficulty = models.CharField('难度', max_length=20, blank=True)
+    created_at = models.DateTimeField('创建时间', auto_now_add=True)
+    retired_at = models.DateTimeField('停用时间', null=True, blank=True)
+    
+    class Meta:
+        db_table = 'exercises_generationbatch'
+        verbose_name = '练习题生成批次'
+        verbose_name_plural = verbose_name
+        indexes = [
+            models.Index(fields=['retired_at']),
+        ]
+    
+    def __str__(self):
+        return f"{self.course.title} - 批次{self.id}"
+
+
 class Exercise(models.Model):
     """练习题表"""
     
@@ -29,6 +55,10 @@ class Exercise(models.Model):
     explanation = models.TextField('答案解析')
     difficulty = models.CharField('难度', max_length=20, choices=DIFFICULTY_CHOICES)
     is_ai_generated = models.BooleanField('是否AI生成', default=False)
+    batch = models.ForeignKey(
+        GenerationBatch, on_delete=models.CASCADE, null=True, blank=True,
+        verbose_name='生成批次', related_name='exercises', help_text='为空表示人工录入的题目'
+    )
     created_at = models.DateTimeField('创建时间', auto_now_add=True)
     updated_at = models.DateTimeField('更新时间', auto_now=True)
     
@@ -70,3 +100,72 @@ class AnswerRecord(models.Model):
     def __str__(self):
         return f"{self.user.username} - {self.exercise.question_text[:30]}"
 
+
+
+class QuestionFingerprint(models.Model):
+    """
+    题库指纹
+
+    有指纹的题目属于题库：可以被再次分配给没做过的学生，写入前用指纹排除近似重复题。
+    签名为规范化题干字符3-gram的MinHash，LSH分段桶见 QuestionLSHBucket。
+    """
+    
+    exercise = models.OneToOneField(Exercise, on_delete=models.CASCADE, verbose_name='题目', related_name='fingerprint')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name='课程', related_name='+')
+    text_hash = models.CharField('规范化题干哈希', max_length=40)
+    signature = models.JSONField('MinHash签名')
+    created_at = models.DateTimeField('创建时间', auto_now_add=True)
+    
+    class Meta:
+        db_table = 'exercises_questionfingerprint'
+        verbose_name = '题库指纹'
+        verbose_name_plural = verbose_name
+        indexes = [
+            models.Index(fields=['course', 'text_hash']),
+        ]
+    
+    def __str__(self):
+        return f"题目{self.exercise_id}的指纹"
+
+
+class QuestionLSHBucket(models.Model):
+    """MinHash签名的LSH分段桶（同一课程中任一分段落入同一个桶的题目才需要比较签名）"""
+    
+    fingerprint = models.ForeignKey(QuestionFingerprint, on_delete=models.CASCADE, verbose_name='指纹', related_name='buckets')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name='课程', related_name='+')
+    band = models.PositiveSmallIntegerField('分段')
+    bucket = models.BigIntegerField('桶')
+    
+    class Meta:
+        db_table = 'exercises_questionlshbucket'
+        verbose_name = '题库LSH桶'
+        verbose_name_plural = verbose_name
+        indexes = [
+            models.Index(fields=['course', 'band', 'bucket']),
+        ]
+
+
+class InventoryBucket(models.Model):
+    """
+    练习题库存
+
+    每个 (课程, 难度, 题型) 在题库中备货的题目数目标，以及后台补货的状态（见 inventory.py）。
+    有学习需求的组合由补货任务自动创建；管理员可以修改 target，或预先为新课程添加记录。
+    """
+    
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name='课程', related_name='inventory_buckets')
+    difficulty = models.CharField('难度', max_length=20, choices=Exercise.DIFFICULTY_CHOICES)
+    question_type = models.CharField('题型', max_length=20, choices=Exercise.QUESTION_TYPE_CHOICES)
+    target = models.PositiveIntegerField('目标库存', null=True, blank=True, help_text='为空时使用 EXERCISE_INVENTORY_TARGET')
+    refilled_at = models.DateTimeField('最后补货时间', null=True, blank=True)
+    attempted_at = models.DateTimeField('最后尝试时间', null=True, blank=True)
+    last_error = models.TextField('最后一次错误', blank=True)
+    
+    class Meta:
+        db_table = 'exercises_inventorybucket'
+        verbose_name = '练习题库存'
+        verbose_name_plural = verbose_name
+        unique_together = [['course', 'difficulty', 'question_type']]
+    
+    def __str__(self):
+        return f"{self.course.title} - {self.get_difficulty_display()} - {self.get_question_type_display()}"
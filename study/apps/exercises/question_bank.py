@@ -0,0 +1,197 @@
+"""
+练习题题库
+
+AI生成的题目写入题库后可以反复使用：学生请求一组题目时，优先从题库中挑选该学生
+没做过的题目，数量不够时才调用AI补充。为避免题库里堆积换了说法的同一道题，
+写入前按指纹排除近似重复：
+- 规范化题干（全角转半角、小写、去掉空白和句读标点，保留运算符和括号）完全相同 -> 重复
+- 规范化题干的字符3-gram MinHash签名（64个哈希）估计的Jaccard相似度 >= DUPLICATE_THRESHOLD -> 重复
+- 候选题目通过LSH分段桶（16段×4行）在数据库中查找，不需要和课程的全部题目比较
+"""
+import hashlib
+import random
+import re
+import struct
+import unicodedata
+
+from django.db import transaction
+from django.db.models import Q
+
+from .models import AnswerRecord, Exercise, QuestionFingerprint, QuestionLSHBucket
+
+SHINGLE_SIZE = 3
+NUM_PERM = 64
+BANDS = 16
+ROWS_PER_BAND = NUM_PERM // BANDS
+DUPLICATE_THRESHOLD = 0.8
+
+_MERSENNE_PRIME = (1 << 61) - 1
+# 固定种子：签名必须在所有进程、每次启动时一致
+_rng = random.Random(20240901)
+_PERMUTATIONS = [(_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME)) for _ in range(NUM_PERM)]
+
+# 只去掉句读标点：运算符、括号、小数点、比号都会改变题意
+PUNCT_RE = re.compile(r'[\s，。、；;？?！!“”‘’"\'`]+')
+
+
+def normalize_question(text):
+    """规范化题干"""
+    text = unicodedata.normalize('NFKC', text or '').lower()
+    return PUNCT_RE.sub('', text)
+
+
+def fingerprint_text(question_text, options=None):
+    """参与指纹计算的文字：题干 + 选项"""
+    if isinstance(options, (list, tuple)):
+        options = ''.join(str(option) for option in options)
+    return f"{question_text or ''}{options or ''}"
+
+
+def _hash64(value):
+    return int.from_bytes(hashlib.blake2b(value.encode('utf-8'), digest_size=8).digest(), 'big')
+
+
+def minhash(normalized):
+    """计算规范化文字的MinHash签名"""
+    if len(normalized) <= SHINGLE_SIZE:
+        shingles = {normalized}
+    else:
+        shingles = {normalized[i:i + SHINGLE_SIZE] for i in range(len(normalized) - SHINGLE_SIZE + 1)}
+    hashes = [_hash64(shingle) for shingle in shingles]
+    return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS]
+
+
+def band_buckets(signature):
+    """把签名分段，每段哈希为一个有符号64位整数（BigIntegerField）"""
+    buckets = []
+    for band in range(BANDS):
+        rows = signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]
+        digest = hashlib.blake2b(struct.pack(f'>{ROWS_PER_BAND}Q', *rows), digest_size=8).digest()
+        buckets.append((band, int.from_bytes(digest, 'big', signed=True)))
+    return buckets
+
+
+def similarity(signature_a, signature_b):
+    """由签名估计Jaccard相似度"""
+    return sum(1 for a, b in zip(signature_a, signature_b) if a == b) / NUM_PERM
+
+
+class Fingerprint:
+    """一道题目的指纹"""
+
+    def __init__(self, text):
+        normalized = normalize_question(text)
+        self.text_hash = hashlib.sha1(normalized.encode('utf-8')).hexdigest()
+        self.signature = minhash(normalized)
+        self.buckets = band_buckets(self.signature)
+
+    @classmethod
+    def for_exercise(cls, exercise):
+        return cls(fingerprint_text(exercise.question_text, exercise.options))
+
+    def is_similar(self, other_signature):
+        return similarity(self.signature, other_signature) >= DUPLICATE_THRESHOLD
+
+
+def find_duplicate(course_id, fingerprint):
+    """
+    在课程题库中查找与指纹近似重复的题目
+
+    Returns:
+        重复题目的ID，没有时返回None
+    """
+    exact = QuestionFingerprint.objects.filter(course_id=course_id, text_hash=fingerprint.text_hash)
+    exercise_id = exact.values_list('exercise_id', flat=True).first()
+    if exercise_id is not None:
+        return exercise_id
+
+    bucket_filter = Q()
+    for band, bucket in fingerprint.buckets:
+        bucket_filter |= Q(band=band, bucket=bucket)
+    candidate_ids = (
+        QuestionLSHBucket.objects.filter(bucket_filter, course_id=course_id)
+        .values_list('fingerprint_id', flat=True).distinct()
+    )
+    candidates = QuestionFingerprint.objects.filter(id__in=candidate_ids).values_list('exercise_id', 'signature')
+    for exercise_id, signature in candidates:
+        if fingerprint.is_similar(signature):
+            return exercise_id
+    return None
+
+
+def dedupe_questions(course_id, questions):
+    """
+    去掉与题库或本组其他题目近似重复的题目
+
+    Args:
+        course_id: 课程ID
+        questions: Exercise字段字典列表（至少包含question_text、options）
+
+    Returns:
+        (保留的题目列表, 重复的题目数)
+    """
+    kept, kept_fingerprints = [], []
+    for question in questions:
+        fingerprint = Fingerprint(fingerprint_text(question.get('question_text'), question.get('options')))
+        if any(fingerprint.text_hash == other.text_hash or fingerprint.is_similar(other.signature)
+               for other in kept_fingerprints):
+            continue
+        if find_duplicate(course_id, fingerprint) is not None:
+            continue
+        kept.append(question)
+        kept_fingerprints.append(fingerprint)
+    return kept, len(questions) - len(kept)
+
+
+def add_to_bank(exercises):
+    """
+    为题目写入指纹，加入题库（调用方应先用 dedupe_questions 去重）
+
+    Args:
+        exercises: Exercise列表（同一课程）
+    """
+    with transaction.atomic():
+        for exercise in exercises:
+            fingerprint = Fingerprint.for_exercise(exercise)
+            record = QuestionFingerprint.objects.create(
+                exercise=exercise,
+                course_id=exercise.course_id,
+                text_hash=fingerprint.text_hash,
+                signature=fingerprint.signature
+            )
+            QuestionLSHBucket.objects.bulk_create([
+                QuestionLSHBucket(fingerprint=record, course_id=exercise.course_id, band=band, bucket=bucket)
+                for band, bucket in fingerprint.buckets
+            ])
+
+
+def pick_unseen(course_id, count, difficulty=None, user=None, exclude_ids=(), question_type=None):
+    """
+    从题库中随机挑选学生没做过的题目
+
+    Args:
+        course_id: 课程ID
+        count: 最多挑选的题目数
+        difficulty: 难度，为None时不限
+        user: 已登录用户，排除其答过的题目
+        exclude_ids: 额外排除的题目ID（如前端记录的本次已练习题目）
+        question_type: 题型，为None时不限
+
+    Returns:
+        Exercise列表（数量可能少于count）
+    """
+    queryset = Exercise.objects.filter(course_id=course_id, fingerprint__isnull=False)
+    if difficulty:
+        queryset = queryset.filter(difficulty=difficulty)
+    if question_type:
+        queryset = queryset.filter(question_type=question_type)
+    if exclude_ids:
+        queryset = queryset.exclude(id__in=list(exclude_ids))
+    if user is not None and user.is_authenticated:
+        answered = AnswerRecord.objects.filter(user=user, exercise__course_id=course_id).values('exercise_id')
+        queryset = queryset.exclude(id__in=answered)
+
+    ids = list(queryset.values_list('id', flat=True))
+    chosen = random.sample(ids, min(count, len(ids)))
+    exercises = Exercise.objects.in_bulk(chosen)
+    return [exercises[exercise_id] for exercise_id in chosen]
@@ -39,6 +39,76 @@ class AnswerRecordSerializer(serializers.ModelSerializer):
                   'is_correct', 'score', 'ai_feedback', 'time_spent', 'submitted_at']
 
 
+# ===== 只读列表的快速序列化 =====
+# 列表接口一次返回上百行时，ModelSerializer 的实例化和逐字段处理占用大量CPU。
+# 下面的函数直接基于 .values() 取数，输出与对应序列化器完全相同的JSON结构。
+
+QUESTION_TYPE_DISPLAY = dict(Exercise.QUESTION_TYPE_CHOICES)
+DIFFICULTY_DISPLAY = dict(Exercise.DIFFICULTY_CHOICES)
+
+# 与序列化器一致的时间格式（转换到当前时区后输出ISO 8601）
+_datetime_field = serializers.DateTimeField()
+
+EXERCISE_VALUES_FIELDS = (
+    'id', 'question_type', 'question_text', 'options', 'difficulty', 'is_ai_generated'
+)
+
+ANSWER_RECORD_VALUES_FIELDS = (
+    'id', 'exercise__id', 'exercise__question_type', 'exercise__question_text',
+    'exercise__options', 'exercise__difficulty', 'exercise__is_ai_generated',
+    'exercise__course__title', 'exercise__course__subject__name',
+    'user_answer', 'is_correct', 'score', 'ai_feedback', 'time_spent', 'submitted_at'
+)
+
+
+def serialize_exercise_list(queryset):
+    """练习题列表快速序列化（结构同 ExerciseSerializer）"""
+    return [
+        {
+            'id': row['id'],
+            'question_type': row['question_type'],
+            'question_type_display': QUESTION_TYPE_DISPLAY.get(row['question_type'], row['question_type']),
+            'question_text': row['question_text'],
+            'options': row['options'],
+            'difficulty': row['difficulty'],
+            'difficulty_display': DIFFICULTY_DISPLAY.get(row['difficulty'], row['difficulty']),
+            'is_ai_generated': row['is_ai_generated'],
+        }
+        for row in queryset.values(*EXERCISE_VALUES_FIELDS)
+    ]
+
+
+def serialize_answer_record_list(queryset):
+    """答题记录列表快速序列化（结构同 AnswerRecordSerializer，一次联表查询）"""
+    to_datetime = _datetime_field.to_representation
+    results = []
+    for row in queryset.values(*ANSWER_RECORD_VALUES_FIELDS):
+        question_type = row['exercise__question_type']
+        difficulty = row['exercise__difficulty']
+        results.append({
+            'id': row['id'],
+            'exercise': {
+                'id': row['exercise__id'],
+                'question_type': question_type,
+                'question_type_display': QUESTION_TYPE_DISPLAY.get(question_type, question_type),
+                'question_text': row['exercise__question_text'],
+                'options': row['exercise__options'],
+                'difficulty': difficulty,
+                'difficulty_display': DIFFICULTY_DISPLAY.get(difficulty, difficulty),
+                'is_ai_generated': row['exercise__is_ai_generated'],
+            },
+            'course_title': row['exercise__course__title'],
+            'subject_name': row['exercise__course__subject__name'],
+            'user_answer': row['user_answer'],
+            'is_correct': row['is_correct'],
+            'score': row['score'],
+            'ai_feedback': row['ai_feedback'],
+            'time_spent': row['time_spent'],
+            'submitted_at': to_datetime(row['submitted_at']),
+        })
+    return results
+
+
 class SubmitAnswerSerializer(serializers.Serializer):
     """提交答案序列化器"""
     exercise_id = serializers.IntegerField()
@@ -46,11 +116,20 @@ class SubmitAnswerSerializer(serializers.Serializer):
     time_spent = serializers.IntegerField(default=0, min_value=0)
 
 
+class BatchAnswerItemSerializer(serializers.Serializer):
+    """批量提交中的单题答案"""
+    exercise_id = serializers.IntegerField()
+    user_answer = serializers.CharField(allow_blank=True, default='')
+    time_spent = serializers.IntegerField(default=0, min_value=0, max_value=3600)
+
+
 class BatchSubmitAnswerSerializer(serializers.Serializer):
     """批量提交答案序列化器"""
     course_id = serializers.IntegerField()
     answers = serializers.ListField(
-        child=serializers.DictField()
+        child=BatchAnswerItemSerializer(),
+        min_length=1,
+        max_length=100
     )
 
 
@@ -0,0 +1,161 @@
+"""
+练习题模块测试
+"""
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.courses.models import Subject, Course
+from .batches import collect_retired_batches, create_batch
+from .grading import grade_answer
+from .models import AnswerRecord, Exercise, GenerationBatch
+from .question_bank import add_to_bank
+
+User = get_user_model()
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class GenerateExercisesTests(TestCase):
+    """获取一组练习题（POST exercises/generate/）"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.user = User.objects.create_user(username='student', password='password123')
+        subject = Subject.objects.create(code='chinese', name='语文')
+        self.course = Course.objects.create(
+            subject=subject, grade='grade1', course_number=1, title='第1课',
+            outline='大纲', difficulty='easy', content='课本内容'
+        )
+        exercises = [
+            Exercise.objects.create(
+                course=self.course, question_type='fill', question_text=f'第{i}题：{i}加{i}等于多少？',
+                answer=str(i * 2), explanation=f'{i}+{i}={i * 2}', difficulty='basic', is_ai_generated=True
+            )
+            for i in range(1, 4)
+        ]
+        add_to_bank(exercises)
+
+    def generate(self, **data):
+        return self.client.post('/api/v1/exercises/generate/', dict(course_id=self.course.id, **data), format='json')
+
+    def test_anonymous_bank_questions_have_no_answers(self):
+        response = self.generate(question_count=2)
+        self.assertEqual(response.status_code, 200)
+        questions = response.json()['data']['questions']
+        self.assertEqual(len(questions), 2)
+        for question in questions:
+            self.assertNotIn('answer', question)
+            self.assertNotIn('explanation', question)
+
+    def test_authenticated_bank_questions_have_answers(self):
+        self.client.force_authenticate(self.user)
+        response = self.generate(question_count=2)
+        self.assertEqual(response.status_code, 200)
+        for question in response.json()['data']['questions']:
+            self.assertIn('answer', question)
+            self.assertIn('explanation', question)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class LocalGenerationTests(TestCase):
+    """本地数学题生成器"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.user = User.objects.create_user(username='student', password='password123')
+        subject = Subject.objects.create(code='math', name='数学')
+        self.course = Course.objects.create(
+            subject=subject, grade='grade1', course_number=1, title='整式的加法和减法',
+            outline='大纲', difficulty='easy', keywords='合并同类项'
+        )
+
+    def generate(self):
+        return self.client.post('/api/v1/exercises/generate/', {
+            'course_id': self.course.id, 'question_count': 3, 'backend': 'local'
+        }, format='json')
+
+    def test_anonymous_cannot_generate(self):
+        response = self.generate()
+        self.assertEqual(response.status_code, 401)
+        self.assertFalse(Exercise.objects.filter(course=self.course).exists())
+
+    def test_local_set_does_not_replace_active_batch(self):
+        self.client.force_authenticate(self.user)
+        response = self.generate()
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()['data']['generated_count'], 3)
+
+        self.course.refresh_from_db()
+        self.assertIsNone(self.course.active_exercise_batch)
+        batch = Exercise.objects.filter(course=self.course).first().batch
+        self.assertIsNotNone(batch.retired_at)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CollectRetiredBatchesTests(TestCase):
+    """停用批次的清理：只删除没有答题记录且不在题库中的批次"""
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='student', password='password123')
+        subject = Subject.objects.create(code='math', name='数学')
+        self.course = Course.objects.create(
+            subject=subject, grade='grade1', course_number=1, title='第1课', outline='大纲', difficulty='easy'
+        )
+
+    def create_retired_batch(self, text):
+        _, exercises = create_batch(self.course, [{
+            'question_type': 'fill', 'question_text': text, 'answer': '1', 'explanation': '', 'difficulty': 'basic'
+        }], private=True)
+        return exercises
+
+    def test_retention_rule(self):
+        private, = self.create_retired_batch('私有批次的题目')
+        answered, = self.create_retired_batch('有答题记录的题目')
+        AnswerRecord.objects.create(user=self.user, exercise=answered, user_answer='1', is_correct=True)
+        banked, = self.create_retired_batch('题库中的题目')
+        add_to_bank([banked])
+
+        self.assertEqual(collect_retired_batches(grace=0), 1)
+        self.assertFalse(GenerationBatch.objects.filter(pk=private.batch_id).exists())
+        self.assertEqual(set(GenerationBatch.objects.values_list('pk', flat=True)), {answered.batch_id, banked.batch_id})
+
+    def test_grace_period(self):
+        self.create_retired_batch('刚停用的题目')
+        self.assertEqual(collect_retired_batches(grace=3600), 0)
+
+
+class GradeAnswerTests(SimpleTestCase):
+    """选择题判分：答案为选项字母或选项内容"""
+
+    OPTIONS = ['A. x=1', 'B. x=2', 'C. x=3', 'D. 无解']
+
+    def grade(self, answer, user_answer, options=OPTIONS):
+        exercise = Exercise(question_type='choice', answer=answer, options=options)
+        return grade_answer(exercise, user_answer)[0]
+
+    def test_letter_answer(self):
+        for user_answer in ('B', 'b', ' B ', 'B.', 'B、', 'B）', 'Ｂ', 'B. x=2', 'x=2'):
+            with self.subTest(user_answer=user_answer):
+                self.assertTrue(self.grade('B', user_answer))
+        for user_answer in ('A', 'C. x=3', 'x=1', 'Bx', 'b+1', ''):
+            with self.subTest(user_answer=user_answer):
+                self.assertFalse(self.grade('B', user_answer))
+
+    def test_option_text_answer(self):
+        for user_answer in ('x=2', ' x = 2 ', 'B', 'b.', 'B. x=2'):
+            with self.subTest(user_answer=user_answer):
+                self.assertTrue(self.grade('x=2', user_answer))
+        # 首字母不能被当成选项字母
+        for user_answer in ('x=1', 'x', 'x+2', 'A', 'x=3'):
+            with self.subTest(user_answer=user_answer):
+                self.assertFalse(self.grade('x=2', user_answer))
+
+    def test_option_text_answer_without_options(self):
+        self.assertTrue(self.grade('x=2', 'x = 2', options=None))
+        self.assertFalse(self.grade('x=2', 'x=3', options=None))
+        self.assertFalse(self.grade('x=2', 'x', options=None))
@@ -3,24 +3,39 @@
 """
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
+from django.db import transaction
 from django.db.models import Count, Q, Avg
-from apps.courses.models import Course
+from apps.courses.models import Course, StudyProgress
+from apps.courses.progress import apply_progress_delta, record_answer_stats, record_study_activity
 from utils.response import APIResponse
+from .batches import create_batch
+from .generation import LOCAL_CREDENTIALS, GenerationError, generate_exercise_fields, has_local_generators
+from .grading import grade_answer
+from .question_bank import add_to_bank, dedupe_questions, pick_unseen
 from .models import Exercise, AnswerRecord
 from .serializers import (
     ExerciseSerializer, ExerciseWithAnswerSerializer, AnswerRecordSerializer,
-    SubmitAnswerSerializer, BatchSubmitAnswerSerializer, GenerateExercisesSerializer
+    SubmitAnswerSerializer, BatchSubmitAnswerSerializer, GenerateExercisesSerializer,
+    serialize_exercise_list, serialize_answer_record_list
 )
-from apps.ai_services.clients.deepseek_client import DeepSeekClient
-from apps.ai_services.clients.openai_client import OpenAIClient
-from apps.ai_services.prompt_manager import PromptManager
+from apps.ai_services.clients import get_ai_client
+from apps.users.ai_keys import resolve_ai_credentials
 import json
 
+# 一次最多取/生成的题目数
+MAX_EXERCISE_COUNT = 20
+
 
 @api_view(['GET'])
 @permission_classes([AllowAny])
 def get_exercises(request):
-    """获取练习题列表"""
+    """
+    获取练习题列表
+
+    传 count 时返回一组练习题（最多 MAX_EXERCISE_COUNT 道）：优先从题库库存中挑选该学生没做过的题目，
+    不够时用课程当前批次的题目补足（不调用AI）；exclude 为逗号分隔的不要返回的题目ID。
+    只有登录用户会拿到答案和解析。
+    """
     course_id = request.query_params.get('course_id')
     if not course_id:
         return APIResponse.error("缺少course_id参数")
@@ -32,136 +47,158 @@ def get_exercises(request):
     
     question_type = request.query_params.get('question_type')
     difficulty = request.query_params.get('difficulty')
+    count = request.query_params.get('count')
     
-    queryset = Exercise.objects.filter(course=course)
+    if count:
+        try:
+            count = min(max(1, int(count)), MAX_EXERCISE_COUNT)
+            exclude_ids = [int(exercise_id) for exercise_id in request.query_params.get('exclude', '').split(',') if exercise_id]
+        except ValueError:
+            return APIResponse.error("count或exclude参数无效")
+        exercises = pick_unseen(
+            course.id, count, difficulty=difficulty, user=request.user, exclude_ids=exclude_ids, question_type=question_type
+        )
+        from_inventory_count = len(exercises)
+        if len(exercises) < count:
+            queryset = course.get_current_exercises().exclude(id__in=[exercise.id for exercise in exercises] + exclude_ids)
+            if question_type:
+                queryset = queryset.filter(question_type=question_type)
+            if difficulty:
+                queryset = queryset.filter(difficulty=difficulty)
+            exercises += list(queryset.order_by('?')[:count - len(exercises)])
+        
+        serializer_class = ExerciseWithAnswerSerializer if request.user.is_authenticated else ExerciseSerializer
+        return APIResponse.success({
+            'course_id': course.id,
+            'course_title': course.title,
+            'total_count': len(exercises),
+            'from_inventory_count': from_inventory_count,
+            'questions': serializer_class(exercises, many=True).data
+        })
+    
+    queryset = course.get_current_exercises()
     if question_type:
         queryset = queryset.filter(question_type=question_type)
     if difficulty:
         queryset = queryset.filter(difficulty=difficulty)
     
-    serializer = ExerciseSerializer(queryset, many=True)
+    questions = serialize_exercise_list(queryset)
     
     return APIResponse.success({
         'course_id': course.id,
         'course_title': course.title,
-        'total_count': queryset.count(),
-        'questions': serializer.data
+        'total_count': len(questions),
+        'questions': questions
     })
 
 
 @api_view(['POST'])
 @permission_classes([AllowAny])  # 暂时允许未认证访问
 def generate_exercises(request):
-    """使用AI生成练习题"""
+    """
+    获取一组练习题
+
+    优先从题库中挑选该学生没做过的题目（不调用AI），数量不够时才调用AI生成补足；
+    新题目与题库近似重复的会被丢弃。传 force_new=true 时跳过题库、全部重新生成。
+    
+    backend：auto（默认，课程有本地数学题生成器时用本地生成器，否则调用AI）、ai、local。
+    本地生成的题目由随机参数得到、不会重复，不做近似去重也不加入题库，写入只属于该学生的私有批次。
+    未登录时只能从题库中取题，生成新题目需要登录。
+    """
     # 获取参数
     course_id = request.data.get('course_id')
-    api_key = request.data.get('api_key')
-    model = request.data.get('model', 'deepseek-chat')
     question_count = request.data.get('question_count', 5)
     difficulty = request.data.get('difficulty', 'basic')
+    # 表单提交时值为字符串，"false"/"0" 不能按真值处理
+    force_new = str(request.data.get('force_new', False)).lower() in ('1', 'true', 'yes')
+    exclude_ids = request.data.get('exclude_ids') or []
+    backend = request.data.get('backend', 'auto')
     
     if not course_id:
         return APIResponse.error("缺少course_id参数", code=400)
-    if not api_key:
-        return APIResponse.error("请提供API Key", code=400)
+    try:
+        question_count = min(max(1, int(question_count)), MAX_EXERCISE_COUNT)
+        exclude_ids = [int(exercise_id) for exercise_id in exclude_ids]
+    except (TypeError, ValueError):
+        return APIResponse.error("question_count或exclude_ids参数无效", code=400)
     
     try:
         course = Course.objects.get(id=course_id, is_active=True)
     except Course.DoesNotExist:
         return APIResponse.not_found("课程不存在")
     
-    # 检查课程是否有内容
-    if not course.content or not course.content.strip():
-        return APIResponse.error("该课程暂无课本内容，无法生成练习题", code=400)
+    bank_exercises = [] if force_new else pick_unseen(
+        course.id, question_count, difficulty=difficulty, user=request.user, exclude_ids=exclude_ids
+    )
+    if len(bank_exercises) >= question_count:
+        return _exercise_set_response(request, course, [], bank_exercises)
+    
+    # 以下会写入新的题目批次
+    if not request.user.is_authenticated:
+        return APIResponse.unauthorized("请先登录后再生成练习题")
+    
+    use_local = backend == 'local' or (backend == 'auto' and has_local_generators(course))
+    if use_local:
+        credentials = LOCAL_CREDENTIALS
+    else:
+        credentials = resolve_ai_credentials(request)
+        if credentials is None:
+            return APIResponse.error("请先在个人中心配置API Key", code=400)
+        
+        # 检查课程是否有内容（课程自有内容或共享的课本页面）
+        if not course.get_content_length():
+            return APIResponse.error("该课程暂无课本内容，无法生成练习题", code=400)
     
     try:
-        # 使用PromptManager获取并渲染Prompt模板
-        final_prompt = PromptManager.get_and_render(
-            template_type='exercise_generation',
-            subject=course.subject.code,
-            course_title=course.title,
-            grade=course.get_grade_display(),
-            keywords=course.keywords,
-            difficulty=difficulty,
-            question_count=question_count,  # 参数名应该是question_count
-            course_content=course.content
+        # 只生成题库中不够的部分
+        exercises_fields = generate_exercise_fields(
+            course, credentials, question_count - len(bank_exercises), difficulty=difficulty
         )
         
-        # 根据模型选择AI客户端
-        if 'deepseek' in model.lower():
-            ai_client = DeepSeekClient(api_key=api_key, model=model)
-        elif 'gpt' in model.lower():
-            ai_client = OpenAIClient(api_key=api_key, model=model)
-        else:
-            ai_client = DeepSeekClient(api_key=api_key, model='deepseek-chat')
-        
-        # 调用AI生成练习题
-        ai_response = ai_client.call_api(final_prompt)
-        
-        if not ai_response:
-            return APIResponse.error("AI生成失败，未返回内容", code=500)
-        
-        # 解析AI返回的JSON格式练习题
-        try:
-            # AI可能返回markdown格式，需要提取JSON部分
-            if '```json' in ai_response:
-                json_start = ai_response.find('```json') + 7
-                json_end = ai_response.find('```', json_start)
-                json_str = ai_response[json_start:json_end].strip()
-            elif '```' in ai_response:
-                json_start = ai_response.find('```') + 3
-                json_end = ai_response.find('```', json_start)
-                json_str = ai_response[json_start:json_end].strip()
-            else:
-                json_str = ai_response.strip()
-            
-            exercises_data = json.loads(json_str)
-            if not isinstance(exercises_data, list):
-                return APIResponse.error("AI返回格式错误：期望JSON数组", code=500)
-            
-        except json.JSONDecodeError as e:
-            return APIResponse.error(f"AI返回数据解析失败：{str(e)}", code=500)
-        
-        # 删除该课程的旧练习题（如果需要重新生成）
-        Exercise.objects.filter(course=course, is_ai_generated=True).delete()
-        
-        # 创建新的练习题
-        created_exercises = []
-        for ex_data in exercises_data:
-            try:
-                # 字段映射：AI返回的字段名 → 数据库字段名
-                question_type = ex_data.get('type') or ex_data.get('question_type', 'choice')
-                question_text = ex_data.get('question') or ex_data.get('question_text', '')
-                
-                exercise = Exercise.objects.create(
-                    course=course,
-                    question_type=question_type,
-                    question_text=question_text,
-                    options=ex_data.get('options', []),
-                    answer=ex_data.get('answer', ''),
-                    explanation=ex_data.get('explanation', ''),
-                    difficulty=ex_data.get('difficulty', difficulty),
-                    is_ai_generated=True
-                )
-                created_exercises.append(exercise)
-            except Exception as e:
-                continue  # 跳过有问题的题目
+        # 去掉与题库近似重复的题目，其余写入新批次并加入题库
+        duplicate_count = 0
+        if not use_local:
+            exercises_fields, duplicate_count = dedupe_questions(course.id, exercises_fields)
+        with transaction.atomic():
+            # 本地生成的题目每次随机，不替换其他学生正在做的当前批次
+            _, created_exercises = create_batch(
+                course, exercises_fields, ai_model=credentials.model, difficulty=difficulty, private=use_local
+            )
+            if not use_local:
+                add_to_bank(created_exercises)
         
-        if not created_exercises:
+        if not created_exercises and not bank_exercises:
+            if duplicate_count:
+                return APIResponse.error("AI生成的题目均与题库中已有题目重复，请稍后重试", code=500)
             return APIResponse.error("未能成功创建任何练习题", code=500)
         
-        serializer = ExerciseWithAnswerSerializer(created_exercises, many=True)
-        
-        return APIResponse.success({
-            'course_id': course.id,
-            'generated_count': len(created_exercises),
-            'questions': serializer.data
-        }, message=f"✅ 成功生成{len(created_exercises)}道练习题")
+        return _exercise_set_response(request, course, created_exercises, bank_exercises)
         
+    except GenerationError as e:
+        return APIResponse.error(str(e), code=500)
     except Exception as e:
         return APIResponse.error(f"生成练习题失败：{str(e)}", code=500)
 
 
+def _exercise_set_response(request, course, created_exercises, bank_exercises):
+    """返回一组练习题：新生成的题目在前，题库中的题目补足（只有登录用户会拿到答案和解析）"""
+    serializer_class = ExerciseWithAnswerSerializer if request.user.is_authenticated else ExerciseSerializer
+    serializer = serializer_class(created_exercises + bank_exercises, many=True)
+    if created_exercises:
+        message = f"✅ 成功生成{len(created_exercises)}道练习题"
+        if bank_exercises:
+            message += f"，题库补充{len(bank_exercises)}道"
+    else:
+        message = f"✅ 从题库中选取{len(bank_exercises)}道练习题"
+    
+    return APIResponse.success({
+        'course_id': course.id,
+        'generated_count': len(created_exercises),
+        'from_bank_count': len(bank_exercises),
+        'questions': serializer.data
+    }, message=message)
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def submit_answer(request):
@@ -180,18 +217,19 @@ def submit_answer(request):
         return APIResponse.not_found("题目不存在")
     
     # 判断答案是否正确
-    is_correct = user_answer.strip() == exercise.answer.strip()
-    score = 100 if is_correct else 0
+    is_correct, score = grade_answer(exercise, user_answer)
     
     # 创建答题记录
-    record = AnswerRecord.objects.create(
-        user=request.user,
-        exercise=exercise,
-        user_answer=user_answer,
-        is_correct=is_correct,
-        score=score,
-        time_spent=time_spent
-    )
+    with transaction.atomic():
+        record = AnswerRecord.objects.create(
+            user=request.user,
+            exercise=exercise,
+            user_answer=user_answer,
+            is_correct=is_correct,
+            score=score,
+            time_spent=time_spent
+        )
+        record_answer_stats(request.user, [record])
     
     return APIResponse.success({
         'record_id': record.id,
@@ -205,10 +243,20 @@ def submit_answer(request):
     }, message="提交成功")
 
 
+# 每完成一组练习，学习进度增加的百分比
+PRACTICE_PROGRESS_STEP = 10
+
+
 @api_view(['POST'])
 @permission_classes([IsAuthenticated])
 def batch_submit_answers(request):
-    """批量提交练习答案"""
+    """
+    批量提交练习答案
+    
+    一次请求完成判分、写入答题记录、更新学习进度和学习时长，返回每道题的结果。
+    请求体：{"course_id": 1, "answers": [{"exercise_id": 1, "user_answer": "B", "time_spent": 30}, ...]}
+    不属于该课程的题目会被跳过，在skipped_ids中返回。
+    """
     serializer = BatchSubmitAnswerSerializer(data=request.data)
     if not serializer.is_valid():
         return APIResponse.error("参数错误", errors=serializer.errors)
@@ -221,57 +269,65 @@ def batch_submit_answers(request):
     except Course.DoesNotExist:
         return APIResponse.not_found("课程不存在")
     
-    # 批量处理答案
-    results = []
-    correct_count = 0
-    total_score = 0
-    total_time = 0
+    # 一次查询取出全部题目
+    exercises = Exercise.objects.filter(course=course).in_bulk(
+        [answer_data['exercise_id'] for answer_data in answers]
+    )
     
+    results = []
+    records = []
+    skipped_ids = []
     for answer_data in answers:
-        exercise_id = answer_data.get('exercise_id')
-        user_answer = answer_data.get('user_answer', '')
-        time_spent = answer_data.get('time_spent', 0)
-        
-        try:
-            exercise = Exercise.objects.get(id=exercise_id, course=course)
-            is_correct = user_answer.strip() == exercise.answer.strip()
-            score = 100 if is_correct else 0
-            
-            # 创建答题记录
-            AnswerRecord.objects.create(
-                user=request.user,
-                exercise=exercise,
-                user_answer=user_answer,
-                is_correct=is_correct,
-                score=score,
-                time_spent=time_spent
-            )
-            
-            if is_correct:
-                correct_count += 1
-            total_score += score
-            total_time += time_spent
-            
-            results.append({
-                'exercise_id': exercise.id,
-                'is_correct': is_correct,
-                'score': score,
-                'user_answer': user_answer,
-                'standard_answer': exercise.answer
-            })
-        except Exercise.DoesNotExist:
+        exercise = exercises.get(answer_data['exercise_id'])
+        if exercise is None:
+            skipped_ids.append(answer_data['exercise_id'])
             continue
+        
+        user_answer = answer_data['user_answer']
+        is_correct, score = grade_answer(exercise, user_answer)
+        records.append(AnswerRecord(
+            user=request.user,
+            exercise=exercise,
+            user_answer=user_answer,
+            is_correct=is_correct,
+            score=score,
+            time_spent=answer_data['time_spent']
+        ))
+        results.append({
+            'exercise_id': exercise.id,
+            'is_correct': is_correct,
+            'score': score,
+            'user_answer': user_answer,
+            'standard_answer': exercise.answer,
+            'explanation': exercise.explanation,
+            'time_spent': answer_data['time_spent']
+        })
+    
+    if not records:
+        return APIResponse.error("没有可提交的题目（题目不存在或不属于该课程）")
     
     total_count = len(results)
-    avg_score = int(total_score / total_count) if total_count > 0 else 0
+    correct_count = sum(1 for result in results if result['is_correct'])
+    total_time = sum(record.time_spent for record in records)
+    
+    with transaction.atomic():
+        AnswerRecord.objects.bulk_create(records)
+        record_answer_stats(request.user, records)
+        
+        # 完成一组练习，进度增加PRACTICE_PROGRESS_STEP（在UPDATE中累加，已完成的课程保持已完成）
+        apply_progress_delta(request.user, course.id, study_time=total_time, progress_step=PRACTICE_PROGRESS_STEP)
+        record_study_activity(request.user, total_time)
+        current = StudyProgress.objects.filter(user=request.user, course=course).values('status', 'progress').first()
     
     return APIResponse.success({
         'total_count': total_count,
         'correct_count': correct_count,
         'wrong_count': total_count - correct_count,
-        'total_score': avg_score,
+        'total_score': int(sum(result['score'] for result in results) / total_count),
         'time_spent': total_time,
-        'results': results
+        'progress': current,
+        'results': results,
+        'skipped_ids': skipped_ids
     }, message="批量提交成功")
 
 
@@ -282,17 +338,17 @@ def get_answer_records(request):
     user = request.user
     course_id = request.query_params.get('course_id')
     
-    queryset = AnswerRecord.objects.filter(user=user).select_related('exercise', 'exercise__course')
+    queryset = AnswerRecord.objects.filter(user=user)
     
     if course_id:
         queryset = queryset.filter(exercise__course_id=course_id)
     
     queryset = queryset.order_by('-submitted_at')[:50]  # 最近50条
-    serializer = AnswerRecordSerializer(queryset, many=True)
+    results = serialize_answer_record_list(queryset)
     
     return APIResponse.success({
-        'count': queryset.count(),
-        'results': serializer.data
+        'count': len(results),
+        'results': results
     })
 
 
@@ -350,18 +406,14 @@ def ai_check_answer(request):
     AI智能判题
     判断用户答案是否与标准答案数学等价
     """
-    from apps.ai_services.clients.deepseek_client import DeepSeekClient
-    from apps.ai_services.clients.openai_client import OpenAIClient
-    
     # 获取参数
     question_text = request.data.get('question_text', '')
     question_type = request.data.get('question_type', 'choice')
     standard_answer = request.data.get('standard_answer', '')
     user_answer = request.data.get('user_answer', '')
-    api_key = request.data.get('api_key')
-    model = request.data.get('model', 'deepseek-chat')
+    credentials = resolve_ai_credentials(request)
     
-    if not api_key:
+    if credentials is None:
         return APIResponse.error(message="缺少API Key")
     
     if not user_answer:
@@ -410,12 +462,7 @@ def ai_check_answer(request):
     
     try:
         # 选择AI客户端
-        if 'deepseek' in model.lower():
-            ai_client = DeepSeekClient(api_key=api_key, model=model)
-        elif 'gpt' in model.lower():
-            ai_client = OpenAIClient(api_key=api_key, model=model)
-        else:
-            ai_client = DeepSeekClient(api_key=api_key, model='deepseek-chat')
+        ai_client = get_ai_client(credentials.model, credentials.api_key, credentials.api_endpoint)
         
         # 调用AI
         ai_response = ai_client.call_api(prompt)
@@ -0,0 +1,30 @@
+"""
+搜索模块Admin配置
+"""
+from django.contrib import admin
+from .engine import search_object_ids
+from .models import SearchDocument
+
+
+class IndexedSearchMixin:
+    """
+    Admin搜索大文本字段时改用全文索引，避免 LIKE '%...%' 全表扫描
+
+    子类设置 search_doc_type，search_fields 中只保留短字段（如标题）。
+    """
+    search_doc_type = None
+
+    def get_search_results(self, request, queryset, search_term):
+        results, may_have_duplicates = super().get_search_results(request, queryset, search_term)
+        if search_term and self.search_doc_type:
+            ids = search_object_ids(search_term, self.search_doc_type)
+            results = results | queryset.filter(pk__in=ids)
+        return results, may_have_duplicates
+
+
+@admin.register(SearchDocument)
+class SearchDocumentAdmin(admin.ModelAdmin):
+    list_display = ['id', 'doc_type', 'title', 'subject', 'length', 'indexed_at']
+    list_filter = ['doc_type', 'subject']
+    search_fields = ['title']
+    readonly_fields = ['doc_type', 'object_id', 'title', 'subject', 'course', 'textbook', 'length', 'indexed_at']
@@ -0,0 +1,11 @@
+from django.apps import AppConfig
+
+
+class SearchConfig(AppConfig):
+    default_auto_field = 'django.db.models.BigAutoField'
+    name = 'apps.search'
+    verbose_name = '全文搜索'
+
+    def ready(self):
+        from .signals import connect_search_signals
+        connect_search_signals()
@@ -0,0 +1,254 @@
+"""
+搜索查询
+
+BM25 打分在数据库中完成（按文档分组求和），只取回排名靠前的文档，
+再读取对应的原文生成高亮摘要。
+"""
+import math
+import re
+
+from django.db.models import Avg, Case, Count, F, FloatField, Sum, Value, When
+from django.db.models.functions import Cast
+from django.utils.html import escape
+
+from apps.courses.models import Course, KnowledgeSummary, TextbookPage, parse_page_range
+from .models import SearchDocument, SearchPosting
+from .tokenizer import normalize_display, query_terms
+
+# BM25参数
+BM25_K1 = 1.2
+BM25_B = 0.75
+
+# 查询词项上限，避免超长搜索词拖慢查询
+MAX_QUERY_TERMS = 16
+
+SNIPPET_WIDTH = 120
+
+
+def search(query, doc_types=None, subject_id=None, limit=20, offset=0, ids_only=False):
+    """
+    全文搜索
+
+    Args:
+        query: 搜索词
+        doc_types: 限定文档类型列表（course/textbook_page/summary），为空时不限
+        subject_id: 限定学科
+        limit: 返回条数
+        offset: 偏移量
+        ids_only: 只返回排名结果 [{'document_id', 'score'}, ...]，不生成摘要
+
+    Returns:
+        {'total': 命中文档数, 'results': [...]}
+    """
+    empty = [] if ids_only else {'total': 0, 'results': []}
+    terms = query_terms(query)[:MAX_QUERY_TERMS]
+    if not terms:
+        return empty
+
+    postings = SearchPosting.objects.filter(term__in=terms)
+    documents = SearchDocument.objects.all()
+    if doc_types:
+        postings = postings.filter(document__doc_type__in=doc_types)
+        documents = documents.filter(doc_type__in=doc_types)
+    if subject_id:
+        postings = postings.filter(document__subject_id=subject_id)
+        documents = documents.filter(subject_id=subject_id)
+
+    stats = documents.aggregate(total=Count('id'), avg_length=Avg('length'))
+    if not stats['total']:
+        return empty
+    avg_length = stats['avg_length'] or 1
+
+    doc_freqs = dict(postings.values_list('term').annotate(df=Count('id')).order_by())
+    if not doc_freqs:
+        return empty
+
+    idf = Case(
+        *[When(term=term, then=Value(_idf(stats['total'], df))) for term, df in doc_freqs.items()],
+        default=Value(0.0),
+        output_field=FloatField()
+    )
+    tf = Cast('tf', FloatField())
+    norm = BM25_K1 * (1 - BM25_B + BM25_B * Cast(F('document__length'), FloatField()) / avg_length)
+    score = idf * tf * (BM25_K1 + 1) / (tf + norm)
+
+    ranked = list(
+        postings.values('document_id')
+        .annotate(score=Sum(score, output_field=FloatField()))
+        .order_by('-score', 'document_id')[offset:offset + limit]
+    )
+    if ids_only:
+        return ranked
+
+    total = postings.values('document_id').distinct().count()
+    return {'total': total, 'results': _build_results(ranked, terms)}
+
+
+def search_object_ids(query, doc_type, limit=1000):
+    """按相关度返回某类文档的对象ID列表（供Admin搜索使用）"""
+    ranked = search(query, doc_types=[doc_type], limit=limit, ids_only=True)
+    if not ranked:
+        return []
+    object_ids = dict(
+        SearchDocument.objects.filter(id__in=[row['document_id'] for row in ranked]).values_list('id', 'object_id')
+    )
+    return [object_ids[row['document_id']] for row in ranked if row['document_id'] in object_ids]
+
+
+def _idf(total, df):
+    """BM25的IDF（加1避免常见词出现负值）"""
+    return math.log(1 + (total - df + 0.5) / (df + 0.5))
+
+
+def _build_results(ranked, terms):
+    """读取命中文档的原文，生成带高亮的结果"""
+    scores = {row['document_id']: row['score'] for row in ranked}
+    documents = SearchDocument.objects.in_bulk(list(scores))
+
+    ids_by_type = {}
+    for document in documents.values():
+        ids_by_type.setdefault(document.doc_type, []).append(document.object_id)
+
+    sources = {}
+    sources.update(_load_courses(ids_by_type.get('course', [])))
+    sources.update(_load_summaries(ids_by_type.get('summary', [])))
+    sources.update(_load_pages(ids_by_type.get('textbook_page', [])))
+
+    results = []
+    for row in ranked:
+        document = documents.get(row['document_id'])
+        source = document and sources.get((document.doc_type, document.object_id))
+        if source is None:
+            continue  # 原对象已删除，索引尚未清理
+        title = source.pop('title', document.title)
+        text = source.pop('text')
+        results.append({
+            'type': document.doc_type,
+            'type_display': document.get_doc_type_display(),
+            'id': document.object_id,
+            'title': title,
+            'highlighted_title': highlight(title, terms, width=None),
+            'snippet': highlight(text, terms),
+            'score': round(scores[row['document_id']], 4),
+            **source
+        })
+    return results
+
+
+def _load_courses(course_ids):
+    sources = {}
+    rows = Course.objects.filter(id__in=course_ids).values('id', 'title', 'keywords', 'outline', 'subject_id')
+    for row in rows:
+        sources[('course', row['id'])] = {
+            'title': row['title'],
+            'text': f"{row['outline']} {row['keywords']}",
+            'course_id': row['id'],
+            'subject_id': row['subject_id'],
+        }
+    return sources
+
+
+def _load_summaries(summary_ids):
+    sources = {}
+    rows = KnowledgeSummary.objects.filter(id__in=summary_ids).values(
+        'id', 'content', 'course_id', 'course__title', 'course__subject_id'
+    )
+    for row in rows:
+        sources[('summary', row['id'])] = {
+            'title': f"{row['course__title']} - 知识点总结",
+            'text': row['content'],
+            'course_id': row['course_id'],
+            'subject_id': row['course__subject_id'],
+        }
+    return sources
+
+
+def _load_pages(page_ids):
+    sources = {}
+    rows = list(TextbookPage.objects.filter(id__in=page_ids).values(
+        'id', 'page_number', 'content', 'textbook_id', 'textbook__pdf_source', 'textbook__subject_id'
+    ))
+    courses_by_pdf = _courses_by_pdf({row['textbook__pdf_source'] for row in rows})
+    for row in rows:
+        course = _course_for_page(courses_by_pdf.get(row['textbook__pdf_source'], []), row['page_number'])
+        sources[('textbook_page', row['id'])] = {
+            'text': row['content'],
+            'textbook_id': row['textbook_id'],
+            'pdf_source': row['textbook__pdf_source'],
+            'page_number': row['page_number'],
+            'course_id': course['id'] if course else None,
+            'course_title': course['title'] if course else None,
+            'subject_id': row['textbook__subject_id'],
+        }
+    return sources
+
+
+def _courses_by_pdf(pdf_sources):
+    """按PDF文件分组的课程（用于把课本页面对应到课程）"""
+    courses = {}
+    if not pdf_sources:
+        return courses
+    rows = Course.objects.filter(pdf_source__in=pdf_sources, is_active=True).values(
+        'id', 'title', 'pdf_source', 'pdf_page_range'
+    ).order_by('course_number')
+    for row in rows:
+        row['page_range'] = parse_page_range(row['pdf_page_range'])
+        courses.setdefault(row['pdf_source'], []).append(row)
+    return courses
+
+
+def _course_for_page(courses, page_number):
+    """找出页码范围包含该页的课程"""
+    for course in courses:
+        page_range = course['page_range']
+        if page_range and page_range[0] <= page_number <= page_range[1]:
+            return course
+    return None
+
+
+def highlight(text, terms, width=SNIPPET_WIDTH):
+    """
+    生成高亮摘要（命中部分用<em>包裹，其余内容已HTML转义）
+
+    Args:
+        text: 原文
+        terms: 查询词项
+        width: 摘要长度，为None时返回全文
+    """
+    text = re.sub(r'\s+', ' ', normalize_display(text)).strip()
+    pattern = re.compile('(?=(%s))' % '|'.join(_term_pattern(term) for term in terms), re.IGNORECASE)
+
+    # 相邻或重叠的命中合并为一段（中文bigram会互相重叠）
+    spans = []
+    for match in pattern.finditer(text):
+        start, end = match.start(1), match.end(1)
+        if spans and start <= spans[-1][1]:
+            spans[-1][1] = max(spans[-1][1], end)
+        else:
+            spans.append([start, end])
+
+    window_start, window_end = 0, len(text)
+    if width is not None and len(text) > width:
+        window_start = max(0, spans[0][0] - width // 4) if spans else 0
+        window_end = min(len(text), window_start + width)
+
+    parts = ['…'] if window_start > 0 else []
+    position = window_start
+    for start, end in spans:
+        if end <= window_start or start >= window_end:
+            continue
+        start, end = max(start, window_start), min(end, window_end)
+        parts.append(escape(text[position:start]))
+        parts.append(f'<em>{escape(text[start:end])}</em>')
+        position = end
+    parts.append(escape(text[position:window_end]))
+    if window_end < len(text):
+        parts.append('…')
+    return ''.join(parts)
+
+
+def _term_pattern(term):
+    """英文/数字词项按整词匹配，中文词项直接匹配"""
+    if term.isascii():
+        return r'(?<![a-z0-9])%s(?![a-z0-9])' % re.escape(term)
+    return re.escape(term)
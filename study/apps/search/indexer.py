@@ -0,0 +1,231 @@
+"""
+索引构建
+
+每个对象对应一条 SearchDocument，重建时删除旧的倒排记录后批量写入。
+标题类字段按权重重复计数，使标题命中排名更靠前。
+"""
+from collections import Counter
+
+from django.db import transaction
+
+from apps.courses.models import Course, KnowledgeSummary, Textbook
+from .models import SearchDocument, SearchPosting
+from .tokenizer import tokenize
+
+TITLE_WEIGHT = 3
+KEYWORDS_WEIGHT = 2
+BODY_WEIGHT = 1
+
+POSTING_BATCH_SIZE = 1000
+
+
+def _count_terms(fields):
+    """
+    统计加权词频
+
+    Args:
+        fields: [(文本, 权重), ...]
+    """
+    counts = Counter()
+    for text, weight in fields:
+        for term in tokenize(text):
+            counts[term] += weight
+    return counts
+
+
+def _build_postings(document, counts):
+    return [SearchPosting(document=document, term=term, tf=tf) for term, tf in counts.items()]
+
+
+@transaction.atomic
+def index_document(doc_type, object_id, title, fields, subject_id=None, course_id=None, textbook_id=None):
+    """
+    写入（或替换）一个对象的索引
+
+    Args:
+        doc_type: 文档类型（course/textbook_page/summary）
+        object_id: 对象ID
+        title: 展示用标题
+        fields: [(文本, 权重), ...]
+    """
+    counts = _count_terms(fields)
+    if not counts:
+        remove_document(doc_type, object_id)
+        return None
+
+    document, created = SearchDocument.objects.update_or_create(
+        doc_type=doc_type,
+        object_id=object_id,
+        defaults={
+            'title': title[:500],
+            'subject_id': subject_id,
+            'course_id': course_id,
+            'textbook_id': textbook_id,
+            'length': sum(counts.values()),
+        }
+    )
+    if not created:
+        document.postings.all().delete()
+    SearchPosting.objects.bulk_create(_build_postings(document, counts), batch_size=POSTING_BATCH_SIZE)
+    return document
+
+
+def remove_document(doc_type, object_id):
+    """删除一个对象的索引"""
+    SearchDocument.objects.filter(doc_type=doc_type, object_id=object_id).delete()
+
+
+def index_course(course):
+    """索引课程的标题、关键词和大纲"""
+    return index_document(
+        'course', course.id, course.title,
+        [(course.title, TITLE_WEIGHT), (course.keywords, KEYWORDS_WEIGHT), (course.outline, BODY_WEIGHT)],
+        subject_id=course.subject_id,
+        course_id=course.id
+    )
+
+
+def index_summary(summary):
+    """索引知识点总结"""
+    course = summary.course
+    return index_document(
+        'summary', summary.id, f"{course.title} - 知识点总结",
+        [(summary.content, BODY_WEIGHT)],
+        subject_id=course.subject_id,
+        course_id=course.id
+    )
+
+
+def _page_title(textbook, page_number):
+    return f"{textbook.pdf_source} 第{page_number}页"
+
+
+def index_textbook_page(page):
+    """索引单个课本页面"""
+    textbook = page.textbook
+    return index_document(
+        'textbook_page', page.id, _page_title(textbook, page.page_number),
+        [(page.content, BODY_WEIGHT)],
+        subject_id=textbook.subject_id,
+        textbook_id=textbook.id
+    )
+
+
+@transaction.atomic
+def index_textbook(textbook):
+    """
+    重建整本课本的页面索引
+
+    Textbook.store_pages 使用 bulk_create 写入页面（不会触发post_save），
+    因此在保存整本课本后统一调用本函数，批量写入文档和倒排记录。
+    """
+    SearchDocument.objects.filter(textbook=textbook).delete()
+
+    pages = list(textbook.pages.only('id', 'page_number', 'content'))
+    documents = []
+    page_counts = []
+    for page in pages:
+        counts = _count_terms([(page.content, BODY_WEIGHT)])
+        if not counts:
+            continue
+        documents.append(SearchDocument(
+            doc_type='textbook_page',
+            object_id=page.id,
+            title=_page_title(textbook, page.page_number)[:500],
+            subject_id=textbook.subject_id,
+            textbook=textbook,
+            length=sum(counts.values())
+        ))
+        page_counts.append(counts)
+
+    _bulk_write(documents, page_counts, SearchDocument.objects.filter(textbook=textbook))
+    return len(documents)
+
+
+def _bulk_write(documents, term_counts, saved_documents):
+    """
+    批量写入文档和倒排记录
+
+    Args:
+        documents: 未保存的SearchDocument列表
+        term_counts: 与documents一一对应的词频Counter
+        saved_documents: 写入后能查出这些文档的查询集（用于取回主键）
+    """
+    SearchDocument.objects.bulk_create(documents, batch_size=200)
+    # MySQL的bulk_create不返回主键，按对象ID重新查询
+    document_ids = dict(saved_documents.values_list('object_id', 'id'))
+
+    postings = []
+    for document, counts in zip(documents, term_counts):
+        document_id = document_ids[document.object_id]
+        postings.extend(SearchPosting(document_id=document_id, term=term, tf=tf) for term, tf in counts.items())
+        if len(postings) >= POSTING_BATCH_SIZE * 10:
+            SearchPosting.objects.bulk_create(postings, batch_size=POSTING_BATCH_SIZE)
+            postings = []
+    SearchPosting.objects.bulk_create(postings, batch_size=POSTING_BATCH_SIZE)
+
+
+@transaction.atomic
+def index_courses(courses):
+    """
+    批量重建一组课程的索引（批量导入课程后使用）
+
+    停用的课程连同其知识点总结一起移出索引。
+    """
+    courses = list(courses)
+    course_ids = [course.id for course in courses]
+    SearchDocument.objects.filter(doc_type='course', object_id__in=course_ids).delete()
+    SearchDocument.objects.filter(doc_type='summary', course_id__in=[
+        course.id for course in courses if not course.is_active
+    ]).delete()
+
+    documents = []
+    course_counts = []
+    for course in courses:
+        if not course.is_active:
+            continue
+        counts = _count_terms([(course.title, TITLE_WEIGHT), (course.keywords, KEYWORDS_WEIGHT),
+                               (course.outline, BODY_WEIGHT)])
+        if not counts:
+            continue
+        documents.append(SearchDocument(
+            doc_type='course',
+            object_id=course.id,
+            title=course.title[:500],
+            subject_id=course.subject_id,
+            course_id=course.id,
+            length=sum(counts.values())
+        ))
+        course_counts.append(counts)
+
+    _bulk_write(documents, course_counts,
+                SearchDocument.objects.filter(doc_type='course', object_id__in=course_ids))
+    return len(documents)
+
+
+def rebuild_index(stdout=None):
+    """
+    重建全部索引
+
+    Args:
+        stdout: 输出进度的流（管理命令传入），为None时不输出
+    """
+    def log(message):
+        if stdout is not None:
+            stdout.write(message)
+
+    SearchDocument.objects.all().delete()
+
+    log(f"  课程: {index_courses(Course.objects.filter(is_active=True).defer('content'))}")
+
+    summaries = KnowledgeSummary.objects.filter(course__is_active=True).select_related('course')
+    for summary in summaries.iterator():
+        index_summary(summary)
+    log(f"  知识点总结: {summaries.count()}")
+
+    page_total = 0
+    for textbook in Textbook.objects.all():
+        page_total += index_textbook(textbook)
+    log(f"  课本页面: {page_total}")
+
+    return SearchDocument.objects.count()
@@ -0,0 +1,164 @@
+"""
+全文搜索性能测试（目标：p95 < 50 ms）
+
+在事务中生成接近真实规模的语料（课程、知识点总结、整本课本的页面）并建立索引，
+对一组典型搜索词重复查询，统计耗时分位数；运行结束后回滚，测试数据不会留在数据库中。
+
+用法：
+    python manage.py benchmark_search                          # 默认规模，p95超过50ms时返回非0
+    python manage.py benchmark_search --textbooks 12 --pages 250 --repeat 20
+    python manage.py benchmark_search --existing               # 直接使用数据库中已有的索引
+"""
+import random
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.courses.models import Subject, Course, KnowledgeSummary, Textbook
+from apps.courses.signals import courses_bulk_saved
+from apps.search.engine import search
+
+# 语料词表：按学科的常见课本词汇，随机组合成句子
+VOCABULARY = {
+    'chinese': [
+        '春天', '散步', '古诗', '朗读', '作者', '景物', '描写', '抒情', '修辞', '比喻', '拟人', '排比',
+        '文言文', '论语', '背诵', '段落', '中心思想', '人物形象', '记叙文', '说明文', '议论文', '荷塘',
+        '月色', '秋天', '故乡', '童年', '回忆', '父亲', '背影', '诗人', '词语', '注释', '翻译', '感情',
+    ],
+    'math': [
+        '有理数', '数轴', '绝对值', '相反数', '整式', '合并同类项', '一元一次方程', '去括号', '移项',
+        '系数', '代入', '求值', '不等式', '函数', '一次函数', '图像', '坐标', '三角形', '全等', '勾股定理',
+        '平行线', '角平分线', '因式分解', '平方差公式', '完全平方', '分式', '根式', '概率', '统计', '圆',
+    ],
+    'english': [
+        'present', 'tense', 'past', 'simple', 'continuous', 'grammar', 'vocabulary', 'reading', 'listening',
+        'unit', 'lesson', 'dialogue', 'school', 'family', 'friend', 'weather', 'season', 'travel', 'hobby',
+        '单词', '短语', '句型', '语法', '阅读理解', '完形填空', '听力', '书面表达', '现在进行时', '一般过去时',
+    ],
+}
+
+PUNCTUATION = '，。；、！？'
+
+# 典型搜索词：课程标题、知识点、单个字、中英混合、没有结果的词
+QUERIES = [
+    '一元一次方程', '合并同类项', '勾股定理', '三角形 全等', '因式分解', '函数图像',
+    '古诗', '背影', '荷塘月色', '比喻 拟人', '文言文翻译', '记叙文',
+    'present tense', 'grammar', '现在进行时', '阅读理解', '圆', '词',
+    '不存在的搜索词', 'quantum physics',
+]
+
+
+class Rollback(Exception):
+    """用于回滚测试数据"""
+
+
+def make_text(rng, words, length):
+    """随机组合词汇生成约length字的文本"""
+    parts = []
+    size = 0
+    while size < length:
+        sentence = ''.join(rng.choice(words) for _ in range(rng.randint(3, 8))) + rng.choice(PUNCTUATION)
+        parts.append(sentence)
+        size += len(sentence)
+    return ''.join(parts)
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    index = min(len(values) - 1, max(0, round(fraction * len(values)) - 1))
+    return values[index]
+
+
+class Command(BaseCommand):
+    help = '全文搜索性能测试：生成语料、建立索引并统计查询耗时（p50/p95/最大值）'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--courses', type=int, default=300, help='课程数（每门课程一条知识点总结），默认300')
+        parser.add_argument('--textbooks', type=int, default=6, help='课本数，默认6')
+        parser.add_argument('--pages', type=int, default=200, help='每本课本的页数，默认200')
+        parser.add_argument('--page-chars', type=int, default=600, help='每页字数，默认600')
+        parser.add_argument('--repeat', type=int, default=10, help='每个搜索词重复查询次数，默认10')
+        parser.add_argument('--target-ms', type=float, default=50, help='p95目标（毫秒），超过时返回非0，默认50')
+        parser.add_argument('--existing', action='store_true', help='不生成语料，直接使用数据库中已有的索引')
+        parser.add_argument('--seed', type=int, default=1, help='随机种子')
+
+    def handle(self, *args, **options):
+        if options['existing']:
+            p95 = self.run_queries(options)
+        else:
+            try:
+                with transaction.atomic():
+                    self.create_corpus(options)
+                    p95 = self.run_queries(options)
+                    raise Rollback()
+            except Rollback:
+                self.stdout.write('🧹 测试数据已回滚')
+
+        if p95 > options['target_ms']:
+            raise CommandError(f'❌ p95 {p95:.1f} ms 超过目标 {options["target_ms"]:.0f} ms')
+        self.stdout.write(self.style.SUCCESS(f'✅ p95 {p95:.1f} ms，达到目标 {options["target_ms"]:.0f} ms'))
+
+    def create_corpus(self, options):
+        """生成课程、知识点总结和课本页面并建立索引"""
+        rng = random.Random(options['seed'])
+        start = time.perf_counter()
+
+        subjects = []
+        for order, code in enumerate(VOCABULARY):
+            subject = Subject.objects.create(name=f'性能测试{code}', code=f'benchmark_{code}', order=900 + order)
+            subjects.append((subject, VOCABULARY[code]))
+
+        Course.objects.bulk_create([
+            Course(
+                subject=subjects[i % len(subjects)][0], grade=('grade1', 'grade2', 'grade3')[i % 3],
+                semester='first', course_number=i + 1,
+                title=make_text(rng, subjects[i % len(subjects)][1], 8)[:-1],
+                keywords='，'.join(rng.sample(subjects[i % len(subjects)][1], 3)),
+                outline=make_text(rng, subjects[i % len(subjects)][1], 200), difficulty='easy'
+            )
+            for i in range(options['courses'])
+        ], batch_size=200)
+        # MySQL的bulk_create不返回主键，重新查询
+        courses = list(Course.objects.filter(subject__in=[subject for subject, _ in subjects]).select_related('subject'))
+        words_by_subject = {subject.id: words for subject, words in subjects}
+        KnowledgeSummary.objects.bulk_create([
+            KnowledgeSummary(course=course, content=make_text(rng, words_by_subject[course.subject_id], 800))
+            for course in courses
+        ], batch_size=200)
+        # 批量写入不触发post_save，按导入课程的方式建立课程和知识点总结的索引
+        courses_bulk_saved.send(sender=Course, course_ids=[course.id for course in courses])
+
+        for index in range(options['textbooks']):
+            subject, words = subjects[index % len(subjects)]
+            pages = [(number, make_text(rng, words, options['page_chars'])) for number in range(1, options['pages'] + 1)]
+            # 发送 textbook_pages_stored，建立页面索引
+            Textbook.store_pages(f'benchmark-{index + 1}.pdf', pages, subject=subject)
+
+        self.stdout.write(
+            f'📚 语料：{len(courses)} 门课程、{len(courses)} 条知识点总结、'
+            f'{options["textbooks"] * options["pages"]} 个课本页面（建索引用时 {time.perf_counter() - start:.1f} 秒）'
+        )
+
+    def run_queries(self, options):
+        """重复查询典型搜索词，返回p95（毫秒）"""
+        # 预热：第一次查询包含建立连接等开销
+        search(QUERIES[0])
+
+        timings = []
+        for query in QUERIES:
+            query_timings = []
+            for _ in range(options['repeat']):
+                start = time.perf_counter()
+                search(query)
+                query_timings.append((time.perf_counter() - start) * 1000)
+            timings.extend(query_timings)
+            self.stdout.write(f'  {query:<16} p50 {percentile(query_timings, 0.5):>7.1f} ms   '
+                              f'最大 {max(query_timings):>7.1f} ms')
+
+        p95 = percentile(timings, 0.95)
+        self.stdout.write(
+            f'\n📊 {len(timings)} 次查询：p50 {percentile(timings, 0.5):.1f} ms，'
+            f'p95 {p95:.1f} ms，最大 {max(timings):.1f} ms'
+        )
+        return p95
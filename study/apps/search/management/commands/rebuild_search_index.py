@@ -0,0 +1,21 @@
+"""
+重建全文搜索索引
+
+用法：python manage.py rebuild_search_index
+"""
+import time
+
+from django.core.management.base import BaseCommand
+
+from apps.search.indexer import rebuild_index
+
+
+class Command(BaseCommand):
+    help = '重建课程、课本页面和知识点总结的全文搜索索引'
+
+    def handle(self, *args, **options):
+        self.stdout.write('🔍 正在重建搜索索引...')
+        start = time.perf_counter()
+        total = rebuild_index(stdout=self.stdout)
+        elapsed = time.perf_counter() - start
+        self.stdout.write(self.style.SUCCESS(f'✅ 索引重建完成：{total} 个文档，用时 {elapsed:.1f} 秒'))
@@ -0,0 +1,129 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:00
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    initial = True
+
+    dependencies = [
+        ("courses", "0005_collapse_course_content"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="SearchDocument",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                (
+                    "doc_type",
+                    models.CharField(
+                        choices=[
+                            ("course", "课程"),
+                            ("textbook_page", "课本页面"),
+                            ("summary", "知识点总结"),
+                        ],
+                        max_length=20,
+                        verbose_name="文档类型",
+                    ),
+                ),
+                ("object_id", models.BigIntegerField(verbose_name="对象ID")),
+                (
+                    "title",
+                    models.CharField(blank=True, max_length=500, verbose_name="标题"),
+                ),
+                (
+                    "length",
+                    models.IntegerField(
+                        default=0,
+                        help_text="加权后的词项总数，用于BM25长度归一化",
+                        verbose_name="文档长度",
+                    ),
+                ),
+                (
+                    "indexed_at",
+                    models.DateTimeField(auto_now=True, verbose_name="索引时间"),
+                ),
+                (
+                    "course",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.course",
+                        verbose_name="课程",
+                    ),
+                ),
+                (
+                    "subject",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="courses.subject",
+                        verbose_name="学科",
+                    ),
+                ),
+                (
+                    "textbook",
+                    models.ForeignKey(
+                        blank=True,
+                        null=True,
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="+",
+                        to="courses.textbook",
+                        verbose_name="课本",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "搜索文档",
+                "verbose_name_plural": "搜索文档",
+                "db_table": "search_document",
+                "unique_together": {("doc_type", "object_id")},
+            },
+        ),
+        migrations.CreateModel(
+            name="SearchPosting",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("term", models.CharField(max_length=32, verbose_name="词项")),
+                ("tf", models.IntegerField(default=1, verbose_name="词频")),
+                (
+                    "document",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="postings",
+                        to="search.searchdocument",
+                        verbose_name="文档",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "倒排记录",
+                "verbose_name_plural": "倒排记录",
+                "db_table": "search_posting",
+                "unique_together": {("term", "document")},
+            },
+        ),
+    ]
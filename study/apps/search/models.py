@@ -0,0 +1,58 @@
+"""
+全文搜索数据模型
+
+倒排索引存放在普通数据表中，MySQL和开发环境的SQLite都可以使用：
+- SearchDocument：一个可搜索的对象（课程、课本页面、知识点总结）
+- SearchPosting：词项 -> 文档 的倒排记录，tf为加权后的词频
+"""
+from django.db import models
+from apps.courses.models import Subject, Course, Textbook
+
+
+class SearchDocument(models.Model):
+    """搜索文档表"""
+
+    DOC_TYPE_CHOICES = [
+        ('course', '课程'),
+        ('textbook_page', '课本页面'),
+        ('summary', '知识点总结'),
+    ]
+
+    doc_type = models.CharField('文档类型', max_length=20, choices=DOC_TYPE_CHOICES)
+    object_id = models.BigIntegerField('对象ID')
+    title = models.CharField('标题', max_length=500, blank=True)
+    subject = models.ForeignKey(Subject, on_delete=models.SET_NULL, verbose_name='学科', null=True, blank=True,
+                                related_name='+')
+    course = models.ForeignKey(Course, on_delete=models.CASCADE, verbose_name='课程', null=True, blank=True,
+                               related_name='+')
+    textbook = models.ForeignKey(Textbook, on_delete=models.CASCADE, verbose_name='课本', null=True, blank=True,
+                                 related_name='+')
+    length = models.IntegerField('文档长度', default=0, help_text='加权后的词项总数，用于BM25长度归一化')
+    indexed_at = models.DateTimeField('索引时间', auto_now=True)
+
+    class Meta:
+        db_table = 'search_document'
+        verbose_name = '搜索文档'
+        verbose_name_plural = verbose_name
+        unique_together = [['doc_type', 'object_id']]
+
+    def __str__(self):
+        return f"{self.get_doc_type_display()} - {self.title}"
+
+
+class SearchPosting(models.Model):
+    """倒排索引表"""
+
+    term = models.CharField('词项', max_length=32)
+    document = models.ForeignKey(SearchDocument, on_delete=models.CASCADE, verbose_name='文档',
+                                 related_name='postings')
+    tf = models.IntegerField('词频', default=1)
+
+    class Meta:
+        db_table = 'search_posting'
+        verbose_name = '倒排记录'
+        verbose_name_plural = verbose_name
+        unique_together = [['term', 'document']]
+
+    def __str__(self):
+        return f"{self.term} -> {self.document_id}"
@@ -0,0 +1,88 @@
+"""
+搜索模块信号处理（增量更新索引）
+
+课程保存后不在 save() 中同步建索引：同一事务中保存的课程先记下来，
+事务提交后用 index_courses 批量更新一次（回滚时不更新）。
+"""
+import threading
+
+from django.db import transaction
+from django.db.models.signals import post_save, post_delete
+from apps.courses.models import Course, KnowledgeSummary, TextbookPage
+from apps.courses.signals import courses_bulk_saved, textbook_pages_stored
+from .indexer import index_courses, index_summary, index_textbook, index_textbook_page, remove_document
+
+
+_pending = threading.local()
+
+
+def _pending_course_ids():
+    """
+    当前事务中待更新索引的课程ID集合
+
+    集合与提交时执行的回调绑定；事务回滚后回调被丢弃，下次保存时重新登记。
+    """
+    pending = getattr(_pending, 'courses', None)
+    connection = transaction.get_connection()
+    if pending is not None and any(hook[1] is pending[1] for hook in connection.run_on_commit):
+        return pending[0]
+
+    course_ids = set()
+
+    def flush():
+        _pending.courses = None
+        sync_courses(Course, course_ids)
+
+    _pending.courses = (course_ids, flush)
+    transaction.on_commit(flush)
+    return course_ids
+
+
+def sync_course(sender, instance, **kwargs):
+    """课程保存后（事务提交时）更新索引；停用的课程连同其知识点总结一起移出索引"""
+    if not transaction.get_connection().in_atomic_block:
+        sync_courses(sender, [instance.id])
+        return
+    _pending_course_ids().add(instance.id)
+
+
+def sync_courses(sender, course_ids, **kwargs):
+    """批量更新一组课程的索引（标题变化时知识点总结的标题也随之更新）"""
+    courses = Course.objects.filter(id__in=course_ids).only(
+        'id', 'title', 'keywords', 'outline', 'subject_id', 'is_active'
+    )
+    index_courses(courses)
+    summaries = KnowledgeSummary.objects.filter(course_id__in=course_ids, course__is_active=True)
+    for summary in summaries.select_related('course'):
+        index_summary(summary)
+
+
+def sync_summary(sender, instance, **kwargs):
+    """知识点总结保存后更新索引"""
+    if instance.course.is_active:
+        index_summary(instance)
+
+
+def remove_summary(sender, instance, **kwargs):
+    remove_document('summary', instance.id)
+
+
+def sync_textbook_page(sender, instance, **kwargs):
+    """单个课本页面（如在后台编辑）保存后更新索引"""
+    index_textbook_page(instance)
+
+
+def sync_textbook(sender, textbook, **kwargs):
+    """整本课本重新导入后重建其页面索引"""
+    index_textbook(textbook)
+
+
+def connect_search_signals():
+    """注册索引增量更新信号"""
+    # 删除课程/课本时，SearchDocument通过外键级联删除
+    post_save.connect(sync_course, sender=Course, dispatch_uid='search_sync_course')
+    courses_bulk_saved.connect(sync_courses, dispatch_uid='search_sync_courses')
+    post_save.connect(sync_summary, sender=KnowledgeSummary, dispatch_uid='search_sync_summary')
+    post_delete.connect(remove_summary, sender=KnowledgeSummary, dispatch_uid='search_remove_summary')
+    post_save.connect(sync_textbook_page, sender=TextbookPage, dispatch_uid='search_sync_textbook_page')
+    textbook_pages_stored.connect(sync_textbook, dispatch_uid='search_sync_textbook')
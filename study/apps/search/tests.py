@@ -0,0 +1,55 @@
+"""
+搜索模块测试
+"""
+from django.db import transaction
+from django.test import TestCase
+
+from apps.courses.models import Subject, Course
+from .models import SearchDocument
+
+
+class CourseIndexSyncTests(TestCase):
+    """课程保存后在事务提交时更新索引"""
+
+    def setUp(self):
+        self.subject = Subject.objects.create(code='math', name='数学')
+
+    def create_course(self, number, title):
+        return Course.objects.create(
+            subject=self.subject, grade='grade1', course_number=number, title=title,
+            outline='大纲', difficulty='easy'
+        )
+
+    def indexed_titles(self):
+        return set(SearchDocument.objects.filter(doc_type='course').values_list('title', flat=True))
+
+    def test_index_updated_once_on_commit(self):
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                course = self.create_course(1, '一元一次方程')
+                course.title = '解一元一次方程'
+                course.save()
+                self.create_course(2, '勾股定理')
+                self.assertEqual(self.indexed_titles(), set())
+        self.assertEqual(len(callbacks), 1)
+        self.assertEqual(self.indexed_titles(), {'解一元一次方程', '勾股定理'})
+
+    def test_rolled_back_save_not_indexed(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            try:
+                with transaction.atomic():
+                    self.create_course(1, '一元一次方程')
+                    raise RuntimeError()
+            except RuntimeError:
+                pass
+            self.create_course(2, '勾股定理')
+        self.assertEqual(self.indexed_titles(), {'勾股定理'})
+
+    def test_deactivated_course_removed_from_index(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            course = self.create_course(1, '一元一次方程')
+        self.assertEqual(self.indexed_titles(), {'一元一次方程'})
+        with self.captureOnCommitCallbacks(execute=True):
+            course.is_active = False
+            course.save()
+        self.assertEqual(self.indexed_titles(), set())
@@ -0,0 +1,49 @@
+"""
+分词器
+
+- 中文：按相邻两个汉字切分（bigram），单独一个汉字保留为单字
+- 英文/数字：按单词切分，统一小写
+- 全角字符先通过NFKC规范化为半角
+"""
+import re
+import unicodedata
+
+MAX_TERM_LENGTH = 32
+
+_CJK = '\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff'  # 中日韩统一表意文字
+TOKEN_RE = re.compile(rf'([{_CJK}]+)|([a-z0-9]+)')
+
+
+def normalize_display(text):
+    """全角转半角（保留大小写，用于展示）"""
+    return unicodedata.normalize('NFKC', text or '')
+
+
+def normalize(text):
+    """规范化文本（全角转半角、小写）"""
+    return normalize_display(text).lower()
+
+
+def tokenize(text):
+    """
+    把文本切分为词项
+
+    Returns:
+        词项列表（保留重复，用于统计词频）
+    """
+    tokens = []
+    for match in TOKEN_RE.finditer(normalize(text)):
+        cjk, word = match.groups()
+        if cjk:
+            if len(cjk) == 1:
+                tokens.append(cjk)
+            else:
+                tokens.extend(cjk[i:i + 2] for i in range(len(cjk) - 1))
+        else:
+            tokens.append(word[:MAX_TERM_LENGTH])
+    return tokens
+
+
+def query_terms(query):
+    """切分搜索词，去重并保持顺序"""
+    return list(dict.fromkeys(tokenize(query)))
@@ -0,0 +1,57 @@
+"""
+搜索模块视图
+"""
+from rest_framework.decorators import api_view, permission_classes
+from rest_framework.permissions import AllowAny
+from utils.response import APIResponse
+from .engine import search
+from .models import SearchDocument
+
+SEARCH_DEFAULT_LIMIT = 20
+SEARCH_MAX_LIMIT = 50
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def search_courses(request):
+    """
+    全文搜索课程、课本内容和知识点总结
+    
+    参数：
+    - q: 搜索词（必填）
+    - type: 文档类型，可用逗号分隔多个（course/textbook_page/summary）
+    - subject_id: 学科ID
+    - page/page_size: 分页（page_size最大50）
+    """
+    query = request.query_params.get('q', '').strip()
+    if not query:
+        return APIResponse.error("请输入搜索词")
+    
+    doc_types = [t for t in request.query_params.get('type', '').split(',') if t]
+    valid_types = {choice for choice, _ in SearchDocument.DOC_TYPE_CHOICES}
+    if any(t not in valid_types for t in doc_types):
+        return APIResponse.error(f"type参数无效，可选值：{', '.join(sorted(valid_types))}")
+    
+    try:
+        page = max(1, int(request.query_params.get('page', 1)))
+        page_size = int(request.query_params.get('page_size', SEARCH_DEFAULT_LIMIT))
+        subject_id = int(request.query_params['subject_id']) if request.query_params.get('subject_id') else None
+    except ValueError:
+        return APIResponse.error("page、page_size和subject_id必须是整数")
+    page_size = min(max(1, page_size), SEARCH_MAX_LIMIT)
+    
+    result = search(
+        query,
+        doc_types=doc_types or None,
+        subject_id=subject_id,
+        limit=page_size,
+        offset=(page - 1) * page_size
+    )
+    
+    return APIResponse.success({
+        'query': query,
+        'page': page,
+        'page_size': page_size,
+        'total': result['total'],
+        'results': result['results']
+    })
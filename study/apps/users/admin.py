@@ -1,8 +1,23 @@
 """
 用户模块Admin配置
 """
-from django.contrib import admin
+import io
+
+from django import forms
+from django.contrib import admin, messages
+from django.http import HttpResponse
+from django.shortcuts import redirect
+from django.template.response import TemplateResponse
+from django.urls import path
+
 from .models import UserProfile, AIConfig
+from .roster import import_roster
+
+
+class RosterUploadForm(forms.Form):
+    """学生名单上传表单"""
+    roster = forms.FileField(label='学生名单CSV', help_text='列：username（必填）、grade、school、phone、email、password')
+    school = forms.CharField(label='默认学校', max_length=100, required=False, help_text='school列为空时使用')
 
 
 @admin.register(UserProfile)
@@ -11,6 +26,7 @@ class UserProfileAdmin(admin.ModelAdmin):
     list_filter = ['grade', 'school', 'created_at']
     search_fields = ['user__username', 'user__email', 'phone']
     readonly_fields = ['created_at', 'updated_at']
+    change_list_template = 'admin/users/userprofile/change_list.html'
     
     fieldsets = (
         ('基本信息', {
@@ -24,6 +40,46 @@ class UserProfileAdmin(admin.ModelAdmin):
             'classes': ('collapse',)
         })
     )
+    
+    def get_urls(self):
+        urls = [
+            path('import-roster/', self.admin_site.admin_view(self.import_roster_view), name='users_userprofile_import_roster'),
+        ]
+        return urls + super().get_urls()
+    
+    def import_roster_view(self, request):
+        """上传学生名单批量创建账号，有生成的初始密码时直接下载密码清单"""
+        if not self.has_add_permission(request):
+            return redirect('admin:users_userprofile_changelist')
+        
+        form = RosterUploadForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            # utf-8-sig：兼容Excel导出的带BOM的CSV
+            file = io.TextIOWrapper(form.cleaned_data['roster'].file, encoding='utf-8-sig', newline='')
+            result = import_roster(file, default_school=form.cleaned_data['school'] or None)
+            
+            for line, message in result.errors[:20]:
+                messages.warning(request, f'第{line}行: {message}')
+            if len(result.errors) > 20:
+                messages.warning(request, f'另有 {len(result.errors) - 20} 行被跳过')
+            messages.success(
+                request,
+                f'创建 {len(result.created)} 个账号，用时 {result.elapsed:.1f} 秒（{result.throughput:.0f} 个/秒）'
+            )
+            
+            if any(row.generated for row in result.created):
+                response = HttpResponse(result.credentials_csv().encode('utf-8-sig'), content_type='text/csv')
+                response['Content-Disposition'] = 'attachment; filename="roster_passwords.csv"'
+                return response
+            return redirect('admin:users_userprofile_changelist')
+        
+        context = {
+            **self.admin_site.each_context(request),
+            'title': '批量导入学生',
+            'opts': self.model._meta,
+            'form': form,
+        }
+        return TemplateResponse(request, 'admin/users/userprofile/import_roster.html', context)
 
 
 @admin.register(AIConfig)
@@ -0,0 +1,118 @@
+"""
+服务端保存的AI配置
+
+AI接口从 request.user.aiconfig 读取API Key，不再要求前端每次传入。
+解密后的Key只缓存在当前进程内存中（不写入共享缓存），按 (用户, 配置版本号) 区分：
+- 配置版本号保存在Django缓存中，AIConfig保存或删除后递增，所有进程的内存缓存随之失效
+- 命中时不查数据库、不解密，只读取一次版本号
+"""
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+
+from apps.ai_services.clients import get_provider
+from .models import AIConfig
+
+# 配置中的模型类型与实际调用的模型名不同时在这里映射
+MODEL_ALIASES = {
+    'deepseek-r1': 'deepseek-reasoner',
+}
+
+
+def ai_config_version_key(user_id):
+    return f'aiconfig:version:{user_id}'
+
+
+def get_ai_config_version(user_id):
+    return cache.get(ai_config_version_key(user_id), 0)
+
+
+def bump_ai_config_version(user_id):
+    """AI配置变化后递增版本号（在事务提交后执行）"""
+    def bump():
+        key = ai_config_version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+class AICredentials:
+    """调用AI所需的参数"""
+
+    def __init__(self, api_key, model='', api_endpoint=''):
+        self.api_key = api_key
+        self.model = MODEL_ALIASES.get(model, model)
+        self.api_endpoint = api_endpoint or None
+
+
+class AIKeyCache:
+    """解密后的AI配置的进程内缓存（线程安全）"""
+
+    def __init__(self, ttl):
+        self.ttl = ttl
+        self._entries = {}  # user_id -> (版本号, 过期时间, AICredentials或None)
+        self._lock = threading.Lock()
+
+    def get(self, user):
+        version = get_ai_config_version(user.id)
+        with self._lock:
+            entry = self._entries.get(user.id)
+        if entry is not None and entry[0] == version and entry[1] > time.monotonic():
+            return entry[2]
+
+        credentials = self._load(user)
+        with self._lock:
+            self._entries[user.id] = (version, time.monotonic() + self.ttl, credentials)
+        return credentials
+
+    @staticmethod
+    def _load(user):
+        # 只在进程内缓存未命中或版本号变化时查询一次AI配置
+        try:
+            config = user.aiconfig
+        except AIConfig.DoesNotExist:
+            return None
+        if not config.encrypted_api_key:
+            return None
+        return AICredentials(config.get_api_key(), config.model_type, config.api_endpoint)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+ai_key_cache = AIKeyCache(settings.AI_KEY_CACHE_TIMEOUT)
+
+
+def resolve_ai_credentials(request, default_model='deepseek-chat'):
+    """
+    获取本次请求使用的AI配置
+
+    优先使用登录用户保存在服务端的配置；未登录或未配置时，兼容旧版前端在请求体中传入的 api_key。
+    请求中指定的 model 只有与配置属于同一服务商时才使用，否则使用配置中的模型，
+    避免把保存的Key发送给另一家服务商。
+
+    Returns:
+        AICredentials，没有可用的API Key时返回None
+    """
+    credentials = None
+    if request.user.is_authenticated:
+        credentials = ai_key_cache.get(request.user)
+
+    model = MODEL_ALIASES.get(request.data.get('model'), request.data.get('model'))
+    if credentials is not None:
+        stored_model = credentials.model or default_model
+        if not model or get_provider(model) != get_provider(stored_model):
+            model = stored_model
+        return AICredentials(credentials.api_key, model, credentials.api_endpoint)
+
+    api_key = request.data.get('api_key')
+    if not api_key:
+        return None
+    return AICredentials(api_key, model or default_model)
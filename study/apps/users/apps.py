@@ -6,3 +6,8 @@ class UsersConfig(AppConfig):
     name = 'apps.users'
     verbose_name = '用户管理'
 
+    def ready(self):
+        from .signals import connect_ai_config_signals, connect_auth_cache_signals, connect_dashboard_signals
+        connect_dashboard_signals()
+        connect_ai_config_signals()
+        connect_auth_cache_signals()
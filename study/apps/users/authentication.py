@@ -0,0 +1,86 @@
+"""
+带缓存的JWT认证
+
+simplejwt 默认每个请求都查询一次User。这里把认证需要的User字段按 (用户ID, 认证版本号)
+缓存 AUTH_USER_CACHE_TIMEOUT 秒；缓存命中时认证不查数据库：
+- 只缓存 AUTH_USER_FIELDS（不含密码哈希），资料和AI配置由视图按需查询
+- 用户变化（改密码、停用账号等）时递增认证版本号，旧缓存不再被读取，见 signals.py
+- 缓存中恢复的User不含密码，需要校验或修改密码、保存用户时请重新查询
+"""
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.authentication import JWTAuthentication
+from rest_framework_simplejwt.exceptions import AuthenticationFailed, InvalidToken
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.utils import get_md5_hash_password
+
+# 认证后视图用到的User字段
+AUTH_USER_FIELDS = (
+    'id', 'username', 'first_name', 'last_name', 'email',
+    'is_active', 'is_staff', 'is_superuser', 'last_login', 'date_joined',
+)
+
+
+def auth_version_key(user_id):
+    return f'auth:version:{user_id}'
+
+
+def auth_user_cache_key(user_id, version):
+    return f'auth:user:{user_id}:v{version}'
+
+
+def invalidate_cached_user(user_id):
+    """递增用户的认证版本号，使认证缓存失效（在事务提交后执行）"""
+    def bump():
+        key = auth_version_key(user_id)
+        try:
+            cache.incr(key)
+        except ValueError:
+            cache.set(key, 1, timeout=None)
+
+    transaction.on_commit(bump)
+
+
+class CachedJWTAuthentication(JWTAuthentication):
+    """从缓存中解析JWT对应的用户"""
+
+    def get_user(self, validated_token):
+        try:
+            user_id = validated_token[api_settings.USER_ID_CLAIM]
+        except KeyError:
+            raise InvalidToken(_("Token contained no recognizable user identification"))
+
+        key = auth_user_cache_key(user_id, cache.get(auth_version_key(user_id), 0))
+        payload = cache.get(key)
+        if payload is None:
+            user = self.user_model.objects.filter(**{api_settings.USER_ID_FIELD: user_id}).first()
+            if user is None:
+                raise AuthenticationFailed(_("User not found"), code="user_not_found")
+            payload = self._to_payload(user)
+            cache.set(key, payload, settings.AUTH_USER_CACHE_TIMEOUT)
+        user = self._from_payload(payload)
+
+        if not user.is_active:
+            raise AuthenticationFailed(_("User is inactive"), code="user_inactive")
+
+        if api_settings.CHECK_REVOKE_TOKEN:
+            if validated_token.get(api_settings.REVOKE_TOKEN_CLAIM) != payload['password_md5']:
+                raise AuthenticationFailed(_("The user's password has been changed."), code="password_changed")
+
+        return user
+
+    @staticmethod
+    def _to_payload(user):
+        payload = {field: getattr(user, field) for field in AUTH_USER_FIELDS}
+        if api_settings.CHECK_REVOKE_TOKEN:
+            # 只保存与令牌比对用的摘要，不保存密码哈希本身
+            payload['password_md5'] = get_md5_hash_password(user.password)
+        return payload
+
+    def _from_payload(self, payload):
+        user = self.user_model(**{field: payload[field] for field in AUTH_USER_FIELDS})
+        user._state.adding = False
+        user._state.db = self.user_model.objects.db
+        return user
@@ -0,0 +1,178 @@
+"""
+个人中心统计
+
+一次请求返回学习进度、答题统计、最近学习、各学科进度和近7天答题趋势：
+- 答题总数、正确率、学习时长直接读取 UserProfile 上的计数器，不扫描答题记录
+- 各学科课程总数来自课程目录缓存
+- 其余数据按用户分组聚合，整体不超过 DASHBOARD_QUERY_BUDGET 条查询
+
+结果按用户缓存 DASHBOARD_CACHE_TIMEOUT 秒，学习进度或答题记录写入后立即失效。
+"""
+import logging
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import connection, transaction
+from django.db.models import Count
+from django.utils import timezone
+
+from apps.courses.cache import catalogue_cache_key, get_or_set_catalogue
+from apps.courses.models import Course, StudyProgress, Subject
+from apps.courses.serializers import StudyProgressSerializer
+from apps.exercises.models import AnswerRecord
+from .models import UserProfile
+
+logger = logging.getLogger(__name__)
+
+# 未命中缓存时生成统计允许的最大查询数（目录缓存命中时为4条，未命中时多2条）
+DASHBOARD_QUERY_BUDGET = 6
+RECENT_COURSE_LIMIT = 5
+TREND_DAYS = 7
+
+
+def dashboard_cache_key(user_id):
+    return f'dashboard:{user_id}'
+
+
+def invalidate_dashboard(user_id):
+    """学习进度或答题记录变化后清除统计缓存（在事务提交后执行）"""
+    transaction.on_commit(lambda: cache.delete(dashboard_cache_key(user_id)))
+
+
+def get_dashboard(user):
+    """获取个人中心统计（优先读取缓存）"""
+    key = dashboard_cache_key(user.id)
+    data = cache.get(key)
+    if data is None:
+        data = build_dashboard(user)
+        cache.set(key, data, settings.DASHBOARD_CACHE_TIMEOUT)
+    return data
+
+
+class QueryCounter:
+    """统计代码块执行的SQL条数（connection.execute_wrapper）"""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def build_dashboard(user):
+    """生成个人中心统计"""
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        data = {
+            'profile': _profile_stats(user),
+            **_progress_stats(user),
+            'recent_courses': _recent_courses(user),
+            'weekly_trend': _weekly_trend(user),
+        }
+    if counter.count > DASHBOARD_QUERY_BUDGET:
+        logger.warning('个人中心统计执行了 %s 条查询，超出预算 %s', counter.count, DASHBOARD_QUERY_BUDGET)
+    return data
+
+
+def _profile_stats(user):
+    """学习时长、连续天数、答题统计（读取计数器）"""
+    profile = UserProfile.objects.filter(user=user).first()
+    answer_count = profile.answer_count if profile else 0
+    correct_count = profile.correct_answer_count if profile else 0
+    return {
+        'total_study_time': profile.total_study_hours if profile else 0,
+        'continuous_days': profile.continuous_days if profile else 0,
+        'last_study_date': profile.last_study_date if profile else None,
+        'total_exercises': answer_count,
+        'correct_exercises': correct_count,
+        'accuracy_rate': round(correct_count / answer_count * 100, 1) if answer_count else 0,
+        'avg_score': round(profile.answer_score_total / answer_count, 1) if answer_count else 0,
+        'total_time_spent': profile.answer_time_spent if profile else 0,
+    }
+
+
+def get_subject_course_counts():
+    """各学科的课程总数（属于目录数据，随目录版本号失效）"""
+    def build():
+        counts = dict(
+            Course.objects.filter(is_active=True).order_by()
+            .values_list('subject_id').annotate(total=Count('id'))
+        )
+        return [
+            {'subject_id': subject.id, 'subject_name': subject.name, 'total': counts.get(subject.id, 0)}
+            for subject in Subject.objects.filter(is_active=True).order_by('order')
+        ]
+
+    data, _ = get_or_set_catalogue(catalogue_cache_key('subject-course-counts'), build)
+    return data
+
+
+def _progress_stats(user):
+    """总体进度和各学科进度（一次分组查询）"""
+    status_counts = {}
+    rows = (
+        StudyProgress.objects.filter(user=user, course__is_active=True).order_by()
+        .values_list('course__subject_id', 'status').annotate(count=Count('id'))
+    )
+    for subject_id, status, count in rows:
+        status_counts[(subject_id, status)] = count
+
+    subjects_progress = []
+    for subject in get_subject_course_counts():
+        completed = status_counts.get((subject['subject_id'], 'completed'), 0)
+        subjects_progress.append({
+            **subject,
+            'completed': completed,
+            'in_progress': status_counts.get((subject['subject_id'], 'in_progress'), 0),
+            'progress': int(completed / subject['total'] * 100) if subject['total'] else 0,
+        })
+
+    total_courses = sum(subject['total'] for subject in subjects_progress)
+    completed = sum(subject['completed'] for subject in subjects_progress)
+    in_progress = sum(subject['in_progress'] for subject in subjects_progress)
+    return {
+        'progress': {
+            'total_courses': total_courses,
+            'completed_courses': completed,
+            'in_progress_courses': in_progress,
+            'not_started_courses': total_courses - completed - in_progress,
+            'overall_progress': int(completed / total_courses * 100) if total_courses else 0,
+        },
+        'subjects_progress': subjects_progress,
+    }
+
+
+def _recent_courses(user):
+    queryset = (
+        StudyProgress.objects.filter(user=user)
+        .select_related('course', 'course__subject')
+        .order_by('-last_access')[:RECENT_COURSE_LIMIT]
+    )
+    return [dict(item) for item in StudyProgressSerializer(queryset, many=True).data]
+
+
+def _weekly_trend(user):
+    """近7天每天的答题数和正确率（按本地日期在Python中分组，不依赖数据库时区表）"""
+    today = timezone.localdate()
+    start = today - timedelta(days=TREND_DAYS - 1)
+    days = {start + timedelta(days=offset): [0, 0] for offset in range(TREND_DAYS)}
+
+    since = timezone.make_aware(datetime.combine(start, time.min))
+    records = AnswerRecord.objects.filter(user=user, submitted_at__gte=since).values_list('submitted_at', 'is_correct')
+    for submitted_at, is_correct in records.iterator():
+        day = days.get(timezone.localdate(submitted_at))
+        if day is not None:
+            day[0] += 1
+            day[1] += 1 if is_correct else 0
+
+    return [
+        {
+            'date': day.isoformat(),
+            'answers': answers,
+            'correct': correct,
+            'accuracy_rate': round(correct / answers * 100, 1) if answers else 0,
+        }
+        for day, (answers, correct) in days.items()
+    ]
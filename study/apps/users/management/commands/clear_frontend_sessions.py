@@ -0,0 +1,18 @@
+"""
+清理已过期的前端会话（前端 SESSION_BACKEND=api 时保存在后端的会话）
+
+用法：
+    python manage.py clear_frontend_sessions
+"""
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from apps.users.models import FrontendSession
+
+
+class Command(BaseCommand):
+    help = '清理已过期的前端会话'
+
+    def handle(self, *args, **options):
+        deleted, _ = FrontendSession.objects.filter(expires_at__lte=timezone.now()).delete()
+        self.stdout.write(self.style.SUCCESS(f'✅ 已清理 {deleted} 个过期会话'))
@@ -0,0 +1,36 @@
+"""
+用当前主密钥重新加密所有AI配置中的API Key
+
+用法：
+    1. 在 ENCRYPTION_KEY 最前面加上新密钥：ENCRYPTION_KEY=新密钥,旧密钥
+    2. python manage.py rotate_api_keys
+    3. 从 ENCRYPTION_KEY 中删除旧密钥
+"""
+from cryptography.fernet import InvalidToken
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.users.models import AIConfig
+from utils.encryption import APIKeyEncryption
+
+
+class Command(BaseCommand):
+    help = '用ENCRYPTION_KEY中的第一个密钥重新加密所有API Key'
+
+    def handle(self, *args, **options):
+        encryption = APIKeyEncryption()
+        rotated = failed = 0
+
+        with transaction.atomic():
+            configs = AIConfig.objects.select_for_update().exclude(encrypted_api_key='')
+            for config in configs:
+                try:
+                    config.encrypted_api_key = encryption.rotate(config.encrypted_api_key)
+                except InvalidToken:
+                    failed += 1
+                    self.stdout.write(self.style.WARNING(f'⚠️ 用户 {config.user_id} 的API Key无法用现有密钥解密，已跳过'))
+                    continue
+                config.save(update_fields=['encrypted_api_key', 'updated_at'])
+                rotated += 1
+
+        self.stdout.write(self.style.SUCCESS(f'✅ 已重新加密 {rotated} 个API Key，跳过 {failed} 个'))
@@ -0,0 +1,18 @@
+# Generated by Django 4.2.7 on 2026-10-19 14:57
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0002_alter_userprofile_school"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="last_study_date",
+            field=models.DateField(blank=True, null=True, verbose_name="最后学习日期"),
+        ),
+    ]
@@ -0,0 +1,60 @@
+# Generated by Django 4.2.7 on 2026-10-19 15:27
+
+from django.db import migrations, models
+from django.db.models import Count, Q, Sum
+
+
+def backfill_answer_counters(apps, schema_editor):
+    """按已有答题记录初始化计数器"""
+    AnswerRecord = apps.get_model("exercises", "AnswerRecord")
+    UserProfile = apps.get_model("users", "UserProfile")
+
+    totals = (
+        AnswerRecord.objects.order_by()
+        .values("user_id")
+        .annotate(
+            answer_count=Count("id"),
+            correct_answer_count=Count("id", filter=Q(is_correct=True)),
+            answer_score_total=Sum("score"),
+            answer_time_spent=Sum("time_spent"),
+        )
+    )
+    for row in totals.iterator():
+        UserProfile.objects.filter(user_id=row["user_id"]).update(
+            answer_count=row["answer_count"],
+            correct_answer_count=row["correct_answer_count"],
+            answer_score_total=row["answer_score_total"] or 0,
+            answer_time_spent=row["answer_time_spent"] or 0,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0003_userprofile_last_study_date"),
+        ("exercises", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="userprofile",
+            name="answer_count",
+            field=models.IntegerField(default=0, verbose_name="答题总数"),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="answer_score_total",
+            field=models.IntegerField(default=0, verbose_name="答题总得分"),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="answer_time_spent",
+            field=models.IntegerField(default=0, verbose_name="答题总耗时(秒)"),
+        ),
+        migrations.AddField(
+            model_name="userprofile",
+            name="correct_answer_count",
+            field=models.IntegerField(default=0, verbose_name="答对题数"),
+        ),
+        migrations.RunPython(backfill_answer_counters, migrations.RunPython.noop),
+    ]
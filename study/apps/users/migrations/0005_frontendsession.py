@@ -0,0 +1,41 @@
+# Generated by Django 4.2.7 on 2026-10-19 16:11
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("users", "0004_userprofile_answer_counters"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FrontendSession",
+            fields=[
+                (
+                    "session_id",
+                    models.CharField(
+                        max_length=64,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="会话ID",
+                    ),
+                ),
+                ("data", models.JSONField(default=dict, verbose_name="会话数据")),
+                (
+                    "expires_at",
+                    models.DateTimeField(db_index=True, verbose_name="过期时间"),
+                ),
+                (
+                    "updated_at",
+                    models.DateTimeField(auto_now=True, verbose_name="更新时间"),
+                ),
+            ],
+            options={
+                "verbose_name": "前端会话",
+                "verbose_name_plural": "前端会话",
+                "db_table": "users_frontend_session",
+            },
+        ),
+    ]
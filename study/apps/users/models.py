@@ -24,6 +24,12 @@ class UserProfile(models.Model):
     avatar = models.ImageField('头像', upload_to='avatars/', null=True, blank=True)
     total_study_hours = models.IntegerField('总学习时长(秒)', default=0)
     continuous_days = models.IntegerField('连续学习天数', default=0)
+    last_study_date = models.DateField('最后学习日期', null=True, blank=True)
+    # 答题计数器（提交答案时原子累加，个人中心统计直接读取，无需扫描答题记录）
+    answer_count = models.IntegerField('答题总数', default=0)
+    correct_answer_count = models.IntegerField('答对题数', default=0)
+    answer_score_total = models.IntegerField('答题总得分', default=0)
+    answer_time_spent = models.IntegerField('答题总耗时(秒)', default=0)
     created_at = models.DateTimeField('创建时间', auto_now_add=True)
     updated_at = models.DateTimeField('更新时间', auto_now=True)
     
@@ -76,3 +82,20 @@ class AIConfig(models.Model):
     def __str__(self):
         return f"{self.user.username}的AI配置"
 
+
+
+class FrontendSession(models.Model):
+    """前端浏览器会话（多台机器部署前端时，登录状态和AI配置保存在这里，见 前端/utils/session_store.py）"""
+    
+    session_id = models.CharField('会话ID', max_length=64, primary_key=True)
+    data = models.JSONField('会话数据', default=dict)
+    expires_at = models.DateTimeField('过期时间', db_index=True)
+    updated_at = models.DateTimeField('更新时间', auto_now=True)
+    
+    class Meta:
+        db_table = 'users_frontend_session'
+        verbose_name = '前端会话'
+        verbose_name_plural = verbose_name
+    
+    def __str__(self):
+        return self.session_id
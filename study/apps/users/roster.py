@@ -0,0 +1,244 @@
+"""
+学生名单批量导入
+
+CSV列：username（必填）、grade（grade1/初一…）、school、phone、email、password
+- 未提供密码时生成随机初始密码，随导入结果返回，由老师分发给学生
+- 密码哈希（默认PBKDF2，单个约几十毫秒）在进程池中并行计算
+- User 和 UserProfile 按块 bulk_create，每块一个事务；某块失败不影响已提交的块
+"""
+import csv
+import io
+import os
+import secrets
+import string
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.exceptions import ValidationError
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from utils.validators import validate_phone
+from .models import UserProfile
+
+# 每个事务写入的账号数
+INSERT_CHUNK_SIZE = 500
+# 每个哈希子任务处理的密码数（减少进程间通信次数）
+HASH_CHUNK_SIZE = 50
+INITIAL_PASSWORD_LENGTH = 8
+
+GRADE_ALIASES = {label: value for value, label in UserProfile.GRADE_CHOICES}
+GRADE_VALUES = {value for value, _ in UserProfile.GRADE_CHOICES}
+
+
+def generate_password(length=INITIAL_PASSWORD_LENGTH):
+    """生成随机初始密码（去掉容易看错的字符）"""
+    alphabet = ''.join(c for c in string.ascii_letters + string.digits if c not in 'Il1O0o')
+    return ''.join(secrets.choice(alphabet) for _ in range(length))
+
+
+def _hash_chunk(hasher_path, passwords):
+    """子进程：计算一组密码的哈希（不依赖Django配置，spawn方式启动的子进程也可用）"""
+    hasher = import_string(hasher_path)()
+    return [hasher.encode(password, hasher.salt()) for password in passwords]
+
+
+def hash_passwords(passwords, workers=0):
+    """
+    并行计算密码哈希，结果与输入顺序一致
+
+    Args:
+        passwords: 明文密码列表
+        workers: 进程数，0表示CPU核数，1表示在当前进程中计算
+    """
+    hasher_path = settings.PASSWORD_HASHERS[0]
+    chunks = [passwords[i:i + HASH_CHUNK_SIZE] for i in range(0, len(passwords), HASH_CHUNK_SIZE)]
+    workers = workers or os.cpu_count() or 1
+
+    if workers == 1 or len(chunks) <= 1:
+        results = [_hash_chunk(hasher_path, chunk) for chunk in chunks]
+    else:
+        with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as executor:
+            results = list(executor.map(_hash_chunk, [hasher_path] * len(chunks), chunks))
+    return [encoded for chunk in results for encoded in chunk]
+
+
+class RosterRow:
+    """名单中校验通过的一行"""
+
+    def __init__(self, line, username, grade, school, phone, email, password, generated):
+        self.line = line
+        self.username = username
+        self.grade = grade
+        self.school = school
+        self.phone = phone
+        self.email = email
+        self.password = password
+        self.generated = generated
+
+
+class RosterImportResult:
+    """导入结果"""
+
+    def __init__(self):
+        self.created = []   # 已创建的RosterRow
+        self.errors = []    # (行号, 错误信息)
+        self.hash_seconds = 0.0
+        self.insert_seconds = 0.0
+
+    @property
+    def elapsed(self):
+        return self.hash_seconds + self.insert_seconds
+
+    @property
+    def throughput(self):
+        """每秒创建的账号数"""
+        return len(self.created) / self.elapsed if self.elapsed else 0
+
+    def credentials_csv(self):
+        """生成了初始密码的账号清单（CSV文本）"""
+        output = io.StringIO()
+        writer = csv.writer(output)
+        writer.writerow(['username', 'password', 'grade', 'school'])
+        for row in self.created:
+            if row.generated:
+                writer.writerow([row.username, row.password, row.grade, row.school])
+        return output.getvalue()
+
+
+def read_roster(file, default_school=''):
+    """
+    读取并校验名单
+
+    Args:
+        file: 文本文件对象（CSV，第一行为列名）
+        default_school: school列为空时使用的学校
+
+    Returns:
+        (RosterRow列表, 错误列表[(行号, 错误信息)])
+    """
+    reader = csv.DictReader(file)
+    if not reader.fieldnames or 'username' not in [name.strip() for name in reader.fieldnames]:
+        return [], [(1, '缺少username列')]
+
+    rows, errors = [], []
+    seen_usernames, seen_phones = set(), set()
+    for line, record in enumerate(reader, start=2):
+        record = {(key or '').strip(): (value or '').strip() for key, value in record.items()}
+        username = record.get('username', '')
+        grade = GRADE_ALIASES.get(record.get('grade', ''), record.get('grade', ''))
+        phone = record.get('phone') or None
+
+        if not username:
+            errors.append((line, '用户名为空'))
+            continue
+        if len(username) > 150:
+            errors.append((line, f'用户名过长: {username}'))
+            continue
+        if username in seen_usernames:
+            errors.append((line, f'用户名在名单中重复: {username}'))
+            continue
+        if grade not in GRADE_VALUES:
+            errors.append((line, f'年级无效: {record.get("grade", "")}'))
+            continue
+        if phone:
+            try:
+                validate_phone(phone)
+            except ValidationError as e:
+                errors.append((line, f'{phone}: {e.messages[0]}'))
+                continue
+            if phone in seen_phones:
+                errors.append((line, f'手机号在名单中重复: {phone}'))
+                continue
+            seen_phones.add(phone)
+
+        seen_usernames.add(username)
+        password = record.get('password', '')
+        rows.append(RosterRow(
+            line=line,
+            username=username,
+            grade=grade,
+            school=record.get('school') or default_school,
+            phone=phone,
+            email=record.get('email', ''),
+            password=password or generate_password(),
+            generated=not password
+        ))
+    return rows, errors
+
+
+def _exclude_existing(rows, errors):
+    """去掉数据库中已存在的用户名和手机号"""
+    usernames = set()
+    phones = set()
+    for start in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[start:start + INSERT_CHUNK_SIZE]
+        usernames.update(User.objects.filter(username__in=[row.username for row in chunk])
+                         .values_list('username', flat=True))
+        phones.update(UserProfile.objects.filter(phone__in=[row.phone for row in chunk if row.phone])
+                      .values_list('phone', flat=True))
+
+    remaining = []
+    for row in rows:
+        if row.username in usernames:
+            errors.append((row.line, f'用户名已存在: {row.username}'))
+        elif row.phone in phones:
+            errors.append((row.line, f'手机号已被使用: {row.phone}'))
+        else:
+            remaining.append(row)
+    return remaining
+
+
+def import_roster(file, default_school=None, workers=0, progress=None):
+    """
+    导入学生名单
+
+    Args:
+        file: 文本文件对象（CSV）
+        default_school: school列为空时使用的学校，默认 settings.DEFAULT_SCHOOL
+        workers: 哈希进程数，0表示CPU核数
+        progress: 进度回调 progress(已创建账号数, 待创建账号数)
+
+    Returns:
+        RosterImportResult
+    """
+    result = RosterImportResult()
+    rows, result.errors = read_roster(file, settings.DEFAULT_SCHOOL if default_school is None else default_school)
+    rows = _exclude_existing(rows, result.errors)
+    if not rows:
+        return result
+
+    start = time.perf_counter()
+    encoded_passwords = hash_passwords([row.password for row in rows], workers=workers)
+    result.hash_seconds = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for offset in range(0, len(rows), INSERT_CHUNK_SIZE):
+        chunk = rows[offset:offset + INSERT_CHUNK_SIZE]
+        chunk_passwords = encoded_passwords[offset:offset + INSERT_CHUNK_SIZE]
+        try:
+            with transaction.atomic():
+                User.objects.bulk_create([
+                    User(username=row.username, email=row.email, password=encoded)
+                    for row, encoded in zip(chunk, chunk_passwords)
+                ])
+                # MySQL的bulk_create不回填主键，按用户名取回
+                user_ids = dict(User.objects.filter(username__in=[row.username for row in chunk])
+                                .values_list('username', 'id'))
+                UserProfile.objects.bulk_create([
+                    UserProfile(user_id=user_ids[row.username], grade=row.grade, school=row.school, phone=row.phone)
+                    for row in chunk
+                ])
+        except Exception as e:
+            # 并发注册等导致整块失败，记录错误后继续下一块
+            result.errors.extend((row.line, f'写入失败: {e}') for row in chunk)
+            continue
+        result.created.extend(chunk)
+        if progress:
+            progress(len(result.created), len(rows))
+    result.insert_seconds = time.perf_counter() - start
+
+    result.errors.sort()
+    return result
@@ -133,3 +133,8 @@ class TestAIConnectionSerializer(serializers.Serializer):
     api_key = serializers.CharField()
     api_endpoint = serializers.URLField(required=False, allow_blank=True)
 
+
+class FrontendSessionSerializer(serializers.Serializer):
+    """保存前端会话序列化器"""
+    data = serializers.DictField()
+    max_age = serializers.IntegerField(min_value=1)
@@ -0,0 +1,47 @@
+"""
+用户模块信号处理
+"""
+from django.contrib.auth.models import User
+from django.db.models.signals import post_save, post_delete
+from .authentication import invalidate_cached_user
+from .dashboard import invalidate_dashboard
+
+
+def invalidate_user_dashboard(sender, instance, **kwargs):
+    """学习进度或答题记录被单独修改（如后台编辑）时清除该用户的统计缓存"""
+    invalidate_dashboard(instance.user_id)
+
+
+def connect_dashboard_signals():
+    """注册个人中心统计缓存失效信号（批量写入的代码直接调用invalidate_dashboard）"""
+    from apps.courses.models import StudyProgress
+    from apps.exercises.models import AnswerRecord
+
+    for model in (StudyProgress, AnswerRecord):
+        post_save.connect(invalidate_user_dashboard, sender=model, dispatch_uid=f'dashboard_save_{model.__name__}')
+        post_delete.connect(invalidate_user_dashboard, sender=model, dispatch_uid=f'dashboard_delete_{model.__name__}')
+
+
+def invalidate_ai_key_cache(sender, instance, **kwargs):
+    """AI配置保存或删除后，让各进程内存中解密的API Key失效"""
+    from .ai_keys import bump_ai_config_version
+    bump_ai_config_version(instance.user_id)
+
+
+def connect_ai_config_signals():
+    """注册AI配置缓存失效信号"""
+    from .models import AIConfig
+
+    post_save.connect(invalidate_ai_key_cache, sender=AIConfig, dispatch_uid='aiconfig_save')
+    post_delete.connect(invalidate_ai_key_cache, sender=AIConfig, dispatch_uid='aiconfig_delete')
+
+
+def invalidate_auth_user(sender, instance, **kwargs):
+    """用户变化（改密码、停用账号等）后使认证缓存失效"""
+    invalidate_cached_user(instance.pk)
+
+
+def connect_auth_cache_signals():
+    """注册认证缓存失效信号（认证缓存只包含User字段，资料和AI配置的变化无需处理）"""
+    post_save.connect(invalidate_auth_user, sender=User, dispatch_uid='auth_cache_save_User')
+    post_delete.connect(invalidate_auth_user, sender=User, dispatch_uid='auth_cache_delete_User')
@@ -0,0 +1,172 @@
+"""
+用户模块测试
+"""
+from datetime import timedelta
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from apps.courses.models import Subject, Course, StudyProgress
+from apps.exercises.models import AnswerRecord, Exercise
+from .authentication import auth_user_cache_key
+from .dashboard import DASHBOARD_QUERY_BUDGET
+from .models import FrontendSession, UserProfile
+
+User = get_user_model()
+
+LOCMEM_CACHE = {'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'}}
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class DashboardTests(TestCase):
+    """个人中心统计（GET users/dashboard/）"""
+
+    def setUp(self):
+        cache.clear()
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.user = User.objects.create_user(username='student', password='password123')
+        UserProfile.objects.create(user=self.user, grade='grade1', answer_count=3, correct_answer_count=2)
+        User.objects.create_superuser(username='admin', password='password123')
+
+    def create_study_data(self, count):
+        """再创建count门课程（轮流分配到各学科），每门课程有学习进度和一条答题记录"""
+        start = Course.objects.count()
+        for i in range(start, start + count):
+            code = [choice[0] for choice in Subject.CODE_CHOICES][i % len(Subject.CODE_CHOICES)]
+            subject, _ = Subject.objects.get_or_create(code=code, defaults={'name': code, 'order': i})
+            course = Course.objects.create(
+                subject=subject, grade='grade1', course_number=i + 1, title=f'第{i + 1}课',
+                outline='大纲', difficulty='easy'
+            )
+            StudyProgress.objects.create(
+                user=self.user, course=course, status='completed' if i % 2 else 'in_progress', progress=50
+            )
+            exercise = Exercise.objects.create(
+                course=course, question_type='fill', question_text='题目', answer='1',
+                explanation='', difficulty='basic'
+            )
+            AnswerRecord.objects.create(user=self.user, exercise=exercise, user_answer='1', is_correct=True)
+        cache.clear()
+
+    def get_dashboard(self, queries):
+        with self.assertNumQueries(queries):
+            response = self.client.get('/api/v1/users/dashboard/')
+        self.assertEqual(response.status_code, 200)
+        return response.json()['data']
+
+    def test_anonymous_is_rejected(self):
+        response = self.client.get('/api/v1/users/dashboard/')
+        self.assertEqual(response.json()['code'], 401)
+
+    def test_query_count(self):
+        self.client.force_authenticate(self.user)
+        for count in (1, 15):
+            with self.subTest(count=count):
+                self.create_study_data(count)
+                data = self.get_dashboard(DASHBOARD_QUERY_BUDGET)
+                self.assertEqual(data['profile']['total_exercises'], 3)
+                self.assertEqual(data['weekly_trend'][-1]['answers'], StudyProgress.objects.count())
+                self.assertEqual(data['progress']['total_courses'], Course.objects.count())
+
+    def test_cached_dashboard_runs_no_queries(self):
+        self.client.force_authenticate(self.user)
+        self.create_study_data(3)
+        self.get_dashboard(DASHBOARD_QUERY_BUDGET)
+        self.get_dashboard(0)
+
+
+@override_settings(CACHES=LOCMEM_CACHE)
+class CachedAuthenticationTests(TestCase):
+    """带缓存的JWT认证"""
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(username='student', password='password123')
+        UserProfile.objects.create(user=self.user, grade='grade1')
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.credentials(HTTP_AUTHORIZATION=f'Bearer {RefreshToken.for_user(self.user).access_token}')
+
+    def get_dashboard(self):
+        return self.client.get('/api/v1/users/dashboard/').json()
+
+    def test_cache_hit_runs_no_queries(self):
+        self.get_dashboard()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.get_dashboard()['code'], 200)
+
+    def test_cache_has_no_password(self):
+        self.get_dashboard()
+        payload = cache.get(auth_user_cache_key(self.user.id, 0))
+        self.assertEqual(payload['username'], 'student')
+        self.assertNotIn('password', payload)
+
+    def test_study_activity_keeps_cache(self):
+        subject = Subject.objects.create(code='math', name='数学')
+        course = Course.objects.create(
+            subject=subject, grade='grade1', course_number=1, title='第1课', outline='大纲', difficulty='easy'
+        )
+        self.get_dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post('/api/v1/courses/study-progress/heartbeat/', {
+                'events': [{'course_id': course.id, 'seconds': 60}]
+            }, format='json')
+        self.assertEqual(response.json()['code'], 200)
+        self.assertEqual(UserProfile.objects.get(user=self.user).total_study_hours, 60)
+        self.assertIsNotNone(cache.get(auth_user_cache_key(self.user.id, 0)))
+
+    def test_deactivated_user_is_rejected(self):
+        self.get_dashboard()
+        with self.captureOnCommitCallbacks(execute=True):
+            self.user.is_active = False
+            self.user.save()
+        self.assertEqual(self.get_dashboard()['code'], 401)
+
+    def test_change_password(self):
+        self.get_dashboard()
+        response = self.client.post('/api/v1/users/change-password/', {
+            'old_password': 'password123', 'new_password': 'password456', 'new_password_confirm': 'password456'
+        }, format='json')
+        self.assertEqual(response.json()['code'], 200)
+        self.user.refresh_from_db()
+        self.assertTrue(self.user.check_password('password456'))
+
+
+@override_settings(FRONTEND_SESSION_SECRET='frontend-secret')
+class FrontendSessionTests(TestCase):
+    """前端会话接口（users/frontend-sessions/<session_id>/）"""
+
+    URL = '/api/v1/users/frontend-sessions/browser-1/'
+
+    def setUp(self):
+        self.client = APIClient(SERVER_NAME='localhost', HTTP_X_FRONTEND_SECRET='frontend-secret')
+
+    def test_requires_secret(self):
+        for secret in ('', 'wrong'):
+            with self.subTest(secret=secret):
+                client = APIClient(SERVER_NAME='localhost', HTTP_X_FRONTEND_SECRET=secret)
+                self.assertEqual(client.get(self.URL).status_code, 403)
+                self.assertEqual(client.put(self.URL, {'data': {}, 'max_age': 60}, format='json').status_code, 403)
+
+    @override_settings(FRONTEND_SESSION_SECRET='')
+    def test_disabled_without_secret(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 403)
+
+    def test_set_get_delete(self):
+        self.assertEqual(self.client.get(self.URL).status_code, 404)
+
+        data = {'auth': {'username': 'student'}}
+        response = self.client.put(self.URL, {'data': data, 'max_age': 60}, format='json')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.client.get(self.URL).json()['data']['data'], data)
+
+        self.client.delete(self.URL)
+        self.assertEqual(self.client.get(self.URL).status_code, 404)
+
+    def test_expired_session_is_not_returned(self):
+        self.client.put(self.URL, {'data': {'auth': {}}, 'max_age': 60}, format='json')
+        FrontendSession.objects.update(expires_at=timezone.now() - timedelta(seconds=1))
+        self.assertEqual(self.client.get(self.URL).status_code, 404)
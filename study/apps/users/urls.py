@@ -16,9 +16,13 @@ urlpatterns = [
     path('profile/', views.get_profile, name='get-profile'),
     path('profile/update/', views.update_profile, name='update-profile'),
     path('change-password/', views.change_password, name='change-password'),
+    path('dashboard/', views.dashboard, name='dashboard'),
     
     # AI配置
     path('ai-config/', views.save_ai_config, name='save-ai-config'),
     path('test-ai-connection/', views.test_ai_connection, name='test-ai-connection'),
+    
+    # 前端会话（前端服务调用）
+    path('frontend-sessions/<str:session_id>/', views.frontend_session, name='frontend-session'),
 ]
 
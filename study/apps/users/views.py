@@ -1,17 +1,23 @@
 """
 用户模块视图
 """
-from rest_framework.decorators import api_view, permission_classes
+import hmac
+from datetime import timedelta
+
+from rest_framework.decorators import api_view, authentication_classes, permission_classes
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework_simplejwt.tokens import RefreshToken
 from django.contrib.auth import authenticate
+from django.conf import settings
 from django.contrib.auth.models import User
+from django.utils import timezone
 from utils.response import APIResponse
-from .models import UserProfile, AIConfig
+from .dashboard import get_dashboard
+from .models import UserProfile, AIConfig, FrontendSession
 from .serializers import (
     UserDetailSerializer, UserRegisterSerializer, UserLoginSerializer,
     UserProfileSerializer, ChangePasswordSerializer, SaveAIConfigSerializer,
-    TestAIConnectionSerializer, AIConfigSerializer
+    TestAIConnectionSerializer, AIConfigSerializer, FrontendSessionSerializer
 )
 
 
@@ -160,7 +166,8 @@ def change_password(request):
     if not serializer.is_valid():
         return APIResponse.error("参数错误", errors=serializer.errors)
     
-    user = request.user
+    # 认证缓存中的用户不含密码，重新查询
+    user = User.objects.get(pk=request.user.pk)
     old_password = serializer.validated_data['old_password']
     new_password = serializer.validated_data['new_password']
     
@@ -220,3 +227,47 @@ def test_ai_connection(request):
         'test_message': f'成功连接到 {model_type} 模型'
     }, message="AI连接测试成功")
 
+
+@api_view(['GET'])
+@permission_classes([IsAuthenticated])
+def dashboard(request):
+    """
+    个人中心统计
+    
+    一次返回学习进度、答题统计、最近学习的课程、各学科进度和近7天答题趋势
+    """
+    return APIResponse.success(get_dashboard(request.user))
+
+
+@api_view(['GET', 'PUT', 'DELETE'])
+@authentication_classes([])
+@permission_classes([AllowAny])
+def frontend_session(request, session_id):
+    """
+    前端浏览器会话（供前端 SESSION_BACKEND=api 时的会话存储调用，不对浏览器开放）
+
+    请求头 X-Frontend-Secret 须与 FRONTEND_SESSION_SECRET 相同。
+    GET 返回会话数据（不存在或已过期时返回404）；PUT 请求体 {"data": {...}, "max_age": 秒}；DELETE 删除会话。
+    """
+    secret = settings.FRONTEND_SESSION_SECRET
+    if not secret or not hmac.compare_digest(request.headers.get('X-Frontend-Secret', ''), secret):
+        return APIResponse.forbidden()
+    
+    if request.method == 'GET':
+        session = FrontendSession.objects.filter(session_id=session_id, expires_at__gt=timezone.now()).first()
+        if session is None:
+            return APIResponse.not_found("会话不存在")
+        return APIResponse.success({'data': session.data})
+    
+    if request.method == 'DELETE':
+        FrontendSession.objects.filter(session_id=session_id).delete()
+        return APIResponse.success()
+    
+    serializer = FrontendSessionSerializer(data=request.data)
+    if not serializer.is_valid():
+        return APIResponse.error("参数错误", errors=serializer.errors)
+    FrontendSession.objects.update_or_create(session_id=session_id, defaults={
+        'data': serializer.validated_data['data'],
+        'expires_at': timezone.now() + timedelta(seconds=serializer.validated_data['max_age']),
+    })
+    return APIResponse.success()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python
+"""
+课本文字规范化效果对比脚本
+统计每本课本规范化前后的估算token数（汉字按1个token，其余字符按4个字符1个token）
+
+用法：
+    python benchmark_normalization.py                  # 课本清单中已存在的全部PDF
+    python benchmark_normalization.py path/to/book.pdf
+
+PDF文字读取自提取缓存（首次运行会先提取），不会修改数据库。
+"""
+import os
+import sys
+import time
+import django
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'middle_school_system.settings')
+django.setup()
+
+from django.conf import settings
+
+from apps.courses.ingestion.extraction import extract_pages_with_settings
+from apps.courses.ingestion.manifest import get_entries
+from apps.courses.ingestion.normalize import normalize_pages
+
+
+def find_pdfs(args):
+    if args:
+        return [Path(arg) for arg in args]
+    paths = [entry.pdf_path(settings.TEXTBOOK_DIR) for entry in get_entries()]
+    return [path for path in paths if path.exists()]
+
+
+def main():
+    pdf_files = find_pdfs(sys.argv[1:])
+    if not pdf_files:
+        print(f"❌ 未找到PDF文件（TEXTBOOK_DIR={settings.TEXTBOOK_DIR}）")
+        return
+
+    print(f"{'课本':<40} {'页数':>6} {'规范化前':>10} {'规范化后':>10} {'减少':>8} {'耗时':>8}")
+    print("-" * 90)
+
+    total_before = 0
+    total_after = 0
+    for pdf_path in pdf_files:
+        pages = extract_pages_with_settings(pdf_path).pages
+        start = time.perf_counter()
+        _, report = normalize_pages(pages)
+        elapsed = time.perf_counter() - start
+
+        total_before += report.tokens_before
+        total_after += report.tokens_after
+        print(f"{pdf_path.name[:40]:<40} {len(pages):>6} {report.tokens_before:>10} {report.tokens_after:>10} "
+              f"{report.saved_ratio:>8.1%} {elapsed:>7.2f}s")
+
+    print("-" * 90)
+    saved = 1 - total_after / total_before if total_before else 0
+    print(f"{'合计':<40} {'':>6} {total_before:>10} {total_after:>10} {saved:>8.1%}")
+
+
+if __name__ == '__main__':
+    main()
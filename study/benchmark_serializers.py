@@ -0,0 +1,126 @@
+#!/usr/bin/env python
+"""
+列表序列化性能对比脚本
+比较 ExerciseSerializer/AnswerRecordSerializer 与基于 .values() 的快速序列化（行/秒）
+
+用法：
+    python benchmark_serializers.py            # 默认500行，重复5次
+    python benchmark_serializers.py 2000 10
+
+测试数据在事务中创建，运行结束后回滚，不会留在数据库中。
+"""
+import os
+import sys
+import time
+import django
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).parent))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'middle_school_system.settings')
+django.setup()
+
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from apps.courses.models import Subject, Course
+from apps.exercises.models import Exercise, AnswerRecord
+from apps.exercises.serializers import (
+    ExerciseSerializer, AnswerRecordSerializer,
+    serialize_exercise_list, serialize_answer_record_list
+)
+
+
+class Rollback(Exception):
+    """用于回滚测试数据"""
+
+
+def create_fixtures(rows):
+    """创建测试用的课程、练习题和答题记录"""
+    subject = Subject.objects.create(name='性能测试', code='benchmark_subject', order=999)
+    course = Course.objects.create(
+        subject=subject, grade='grade1', semester='first', course_number=9999,
+        title='性能测试课程', outline='性能测试', difficulty='easy'
+    )
+    user = User.objects.create(username='benchmark_user')
+
+    exercises = Exercise.objects.bulk_create([
+        Exercise(
+            course=course,
+            question_type=('choice', 'fill', 'short_answer')[i % 3],
+            question_text=f'第{i + 1}题：计算 {i} + {i + 1} 的值',
+            options=['A. 1', 'B. 2', 'C. 3', 'D. 4'] if i % 3 == 0 else None,
+            answer='A',
+            explanation='略',
+            difficulty=('basic', 'medium', 'advanced')[i % 3],
+            is_ai_generated=True
+        )
+        for i in range(rows)
+    ])
+    # MySQL的bulk_create不返回主键，重新查询
+    exercises = list(Exercise.objects.filter(course=course).order_by('id'))
+    AnswerRecord.objects.bulk_create([
+        AnswerRecord(user=user, exercise=exercise, user_answer='A', is_correct=True, score=100, time_spent=30)
+        for exercise in exercises
+    ])
+    return course, user
+
+
+def measure(label, func, rows, repeat):
+    """重复执行func，返回最好一次的行/秒"""
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    rate = rows / best if best else float('inf')
+    print(f"  {label:<36} {best * 1000:>9.1f} ms   {rate:>12,.0f} 行/秒")
+    return result, rate
+
+
+def run(rows, repeat):
+    course, user = create_fixtures(rows)
+
+    exercises = Exercise.objects.filter(course=course)
+    records = AnswerRecord.objects.filter(user=user).order_by('-submitted_at')
+
+    print(f"\n练习题列表（{rows}行）")
+    slow, slow_rate = measure(
+        'ExerciseSerializer', lambda: ExerciseSerializer(exercises, many=True).data, rows, repeat
+    )
+    fast, fast_rate = measure(
+        'serialize_exercise_list', lambda: serialize_exercise_list(exercises), rows, repeat
+    )
+    print(f"  结果一致: {'✅' if [dict(item) for item in slow] == fast else '❌'}   提升: {fast_rate / slow_rate:.1f}x")
+
+    print(f"\n答题记录列表（{rows}行）")
+    slow_records = records.select_related('exercise', 'exercise__course__subject')
+    slow, slow_rate = measure(
+        'AnswerRecordSerializer', lambda: AnswerRecordSerializer(slow_records, many=True).data, rows, repeat
+    )
+    fast, fast_rate = measure(
+        'serialize_answer_record_list', lambda: serialize_answer_record_list(records), rows, repeat
+    )
+    slow = [dict(item, exercise=dict(item['exercise'])) for item in slow]
+    print(f"  结果一致: {'✅' if slow == fast else '❌'}   提升: {fast_rate / slow_rate:.1f}x\n")
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+
+    print("=" * 70)
+    print("  📊 列表序列化性能对比")
+    print("=" * 70)
+
+    try:
+        with transaction.atomic():
+            run(rows, repeat)
+            raise Rollback()
+    except Rollback:
+        print("🧹 测试数据已回滚")
+
+
+if __name__ == '__main__':
+    main()
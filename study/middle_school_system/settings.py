@@ -38,6 +38,7 @@ INSTALLED_APPS = [
     'apps.courses',
     'apps.exercises',
     'apps.ai_services',
+    'apps.search',
 ]
 
 MIDDLEWARE = [
@@ -89,6 +90,76 @@ DATABASES = {
     }
 }
 
+# 缓存配置
+# CACHE_BACKEND 可选：locmem（单进程内存，默认）、file（本机多worker共享）、redis（多机共享）
+CACHE_BACKEND = config('CACHE_BACKEND', default='locmem')
+
+if CACHE_BACKEND == 'redis':
+    # 需要安装 redis 包，兼容任何Redis协议的服务器
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': config('CACHE_LOCATION', default='redis://127.0.0.1:6379/1'),
+            'KEY_PREFIX': 'mss',
+        }
+    }
+elif CACHE_BACKEND == 'file':
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+            'LOCATION': config('CACHE_LOCATION', default=str(BASE_DIR / 'cache')),
+            'OPTIONS': {
+                'MAX_ENTRIES': 5000,
+            },
+        }
+    }
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'middle-school-system',
+        }
+    }
+
+# 课程目录缓存有效期（秒），目录数据变更时通过版本号自动失效
+CATALOGUE_CACHE_TIMEOUT = config('CATALOGUE_CACHE_TIMEOUT', default=3600, cast=int)
+
+# 个人中心统计缓存有效期（秒），学习进度或答题记录变化时立即失效
+DASHBOARD_CACHE_TIMEOUT = config('DASHBOARD_CACHE_TIMEOUT', default=60, cast=int)
+
+# 重新生成练习题后，旧批次停用多久（秒）且无答题记录才清理（给正在作答旧题目的学生留出提交时间）
+EXERCISE_BATCH_GC_GRACE = config('EXERCISE_BATCH_GC_GRACE', default=3600, cast=int)
+
+# 练习题库存（python manage.py run_exercise_inventory）：每个 (课程, 难度, 题型) 默认备货的题目数
+EXERCISE_INVENTORY_TARGET = config('EXERCISE_INVENTORY_TARGET', default=30, cast=int)
+# 每次调用AI补货的题目数
+EXERCISE_INVENTORY_REFILL_SIZE = config('EXERCISE_INVENTORY_REFILL_SIZE', default=10, cast=int)
+# 按最近多少天的答题和学习记录估计需求
+EXERCISE_INVENTORY_DEMAND_DAYS = config('EXERCISE_INVENTORY_DEMAND_DAYS', default=7, cast=int)
+# 补货使用的服务端AI配置（与学生个人的API Key无关）
+EXERCISE_INVENTORY_API_KEY = config('EXERCISE_INVENTORY_API_KEY', default='')
+EXERCISE_INVENTORY_MODEL = config('EXERCISE_INVENTORY_MODEL', default='deepseek-chat')
+EXERCISE_INVENTORY_API_ENDPOINT = config('EXERCISE_INVENTORY_API_ENDPOINT', default='')
+# 每个AI服务商同时进行的补货请求数上限
+EXERCISE_INVENTORY_PROVIDER_LIMITS = {
+    'deepseek': config('EXERCISE_INVENTORY_DEEPSEEK_CONCURRENCY', default=2, cast=int),
+    'openai': config('EXERCISE_INVENTORY_OPENAI_CONCURRENCY', default=1, cast=int),
+}
+
+# 认证用户的缓存时间（秒），用户变化（改密码、停用账号等）时立即失效
+AUTH_USER_CACHE_TIMEOUT = config('AUTH_USER_CACHE_TIMEOUT', default=300, cast=int)
+
+# 前端会话接口的共享密钥（与前端的 FRONTEND_SESSION_SECRET 相同），为空时不开放该接口
+FRONTEND_SESSION_SECRET = config('FRONTEND_SESSION_SECRET', default='')
+
+# 课本PDF目录和逐页文字缓存目录（缓存按文件sha256+页码+提取器版本存储，重复提取时直接读取）
+TEXTBOOK_DIR = Path(config('TEXTBOOK_DIR', default=str(BASE_DIR.parent / '课本')))
+PDF_TEXT_CACHE_DIR = Path(config('PDF_TEXT_CACHE_DIR', default=str(BASE_DIR / 'pdf_cache')))
+# PDF提取进程数，0表示使用CPU核数
+PDF_EXTRACT_WORKERS = config('PDF_EXTRACT_WORKERS', default=0, cast=int)
+# 课程目录CSV所在目录（按学科分子目录，如 course/数学/数学-初一上.csv）
+COURSE_CSV_DIR = Path(config('COURSE_CSV_DIR', default=str(BASE_DIR.parent / 'course')))
+
 # Password validation
 # https://docs.djangoproject.com/en/4.2/ref/settings/#auth-password-validators
 
@@ -139,7 +210,7 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 # REST Framework配置
 REST_FRAMEWORK = {
     'DEFAULT_AUTHENTICATION_CLASSES': (
-        'rest_framework_simplejwt.authentication.JWTAuthentication',
+        'apps.users.authentication.CachedJWTAuthentication',
     ),
     'DEFAULT_PERMISSION_CLASSES': (
         'rest_framework.permissions.AllowAny',  # 默认允许所有，在view中单独控制
@@ -171,9 +242,12 @@ CORS_ALLOWED_ORIGINS = config(
 )
 CORS_ALLOW_CREDENTIALS = True
 
-# 加密密钥
+# 加密密钥（可用逗号分隔多个，第一个用于加密，其余仅用于解密旧数据，见 rotate_api_keys 命令）
 ENCRYPTION_KEY = config('ENCRYPTION_KEY', default='')
 
+# 解密后的AI API Key在进程内存中的缓存时间（秒），AI配置修改后立即失效
+AI_KEY_CACHE_TIMEOUT = config('AI_KEY_CACHE_TIMEOUT', default=300, cast=int)
+
 # 学校配置（默认为空，用户可自行输入）
 DEFAULT_SCHOOL = config('DEFAULT_SCHOOL', default='')
 
@@ -218,6 +292,11 @@ SIMPLEUI_CONFIG = {
                     'icon': 'fa fa-book-open',
                     'url': 'courses/course/'
                 },
+                {
+                    'name': '课本管理',
+                    'icon': 'fa fa-file-pdf',
+                    'url': 'courses/textbook/'
+                },
                 {
                     'name': '知识点总结',
                     'icon': 'fa fa-lightbulb',
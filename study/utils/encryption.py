@@ -1,32 +1,45 @@
 """
 API密钥加密工具
+
+ENCRYPTION_KEY 支持用逗号分隔多个Fernet密钥：第一个用于加密，全部用于解密。
+轮换密钥时把新密钥放在最前面，运行 python manage.py rotate_api_keys 重新加密后即可移除旧密钥。
 """
-from cryptography.fernet import Fernet
+import base64
+import hashlib
+import logging
+from functools import lru_cache
+
+from cryptography.fernet import Fernet, MultiFernet
 from django.conf import settings
 
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def get_cipher() -> MultiFernet:
+    """进程级共享的加密器（只在第一次使用时解析密钥）"""
+    keys = [key.strip() for key in (settings.ENCRYPTION_KEY or '').split(',') if key.strip()]
+    if not keys:
+        # 未配置时由SECRET_KEY派生（仅用于开发），保证重启后仍能解密
+        logger.warning('未配置ENCRYPTION_KEY，使用由SECRET_KEY派生的开发密钥')
+        digest = hashlib.sha256(f'api-key-encryption:{settings.SECRET_KEY}'.encode()).digest()
+        keys = [base64.urlsafe_b64encode(digest).decode()]
+    return MultiFernet([Fernet(key.encode()) for key in keys])
+
 
 class APIKeyEncryption:
     """API密钥加密工具类"""
-    
+
     def __init__(self):
-        # 从环境变量获取加密密钥
-        key = settings.ENCRYPTION_KEY
-        if not key:
-            # 如果没有配置，生成一个临时密钥（仅用于开发）
-            key = Fernet.generate_key().decode()
-        
-        if isinstance(key, str):
-            key = key.encode()
-        
-        self.cipher = Fernet(key)
-    
+        self.cipher = get_cipher()
+
     def encrypt(self, plain_text: str) -> str:
         """
         加密文本
-        
+
         Args:
             plain_text: 明文
-            
+
         Returns:
             加密后的密文（字符串格式）
         """
@@ -34,14 +47,14 @@ class APIKeyEncryption:
             return ''
         encrypted = self.cipher.encrypt(plain_text.encode())
         return encrypted.decode()
-    
+
     def decrypt(self, encrypted_text: str) -> str:
         """
         解密文本
-        
+
         Args:
             encrypted_text: 密文
-            
+
         Returns:
             解密后的明文
         """
@@ -50,3 +63,16 @@ class APIKeyEncryption:
         decrypted = self.cipher.decrypt(encrypted_text.encode())
         return decrypted.decode()
 
+    def rotate(self, encrypted_text: str) -> str:
+        """
+        用当前主密钥重新加密密文（可以是任一已配置密钥加密的）
+
+        Args:
+            encrypted_text: 密文
+
+        Returns:
+            新密文
+        """
+        if not encrypted_text:
+            return ''
+        return self.cipher.rotate(encrypted_text.encode()).decode()
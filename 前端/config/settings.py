@@ -6,6 +6,7 @@
 # 内网访问：将localhost改为服务器的内网IP（如：192.168.1.100）
 # 本机访问：使用localhost
 import os
+from pathlib import Path
 
 # 支持环境变量配置，方便内网部署
 SERVER_IP = os.getenv('SERVER_IP', 'localhost')
@@ -14,6 +15,20 @@ API_BASE_URL = f"http://{SERVER_IP}:8000/api/v1"
 # 如果需要内网访问，请直接修改为服务器的内网IP地址：
 # API_BASE_URL = "http://192.168.1.100:8000/api/v1"
 
+# 浏览器会话配置（登录状态和AI配置按浏览器保存在服务端）
+# SESSION_BACKEND：sqlite（默认，保存在本机的 SESSION_DB_PATH，同一台机器上的多个前端进程共用）
+#                  api（保存在Django后端，多台机器部署、负载均衡时使用）
+SESSION_BACKEND = os.getenv('SESSION_BACKEND', 'sqlite')
+SESSION_DB_PATH = os.getenv(
+    'SESSION_DB_PATH', str(Path.home() / '.streamlit_learning_system' / 'sessions.sqlite3')
+)
+# Cookie签名密钥，也用于调用后端会话接口（须与后端的 FRONTEND_SESSION_SECRET 相同）
+# sqlite 时可为空（自动生成并保存在数据库旁），api 时必须配置，所有前端副本使用相同的值
+SESSION_SECRET = os.getenv('FRONTEND_SESSION_SECRET', '')
+SESSION_COOKIE_NAME = 'learning_session'
+SESSION_COOKIE_MAX_AGE = 30 * 24 * 3600  # 秒
+SESSION_CACHE_TTL = 30  # 进程内缓存时间（秒）
+
 # 应用配置
 APP_NAME = "上海市初中学习系统"
 APP_VERSION = "1.0.0"
@@ -295,6 +295,36 @@ with col3:
     if st.button("📈 学习统计", use_container_width=True):
         st.info("📊 学习统计功能即将上线...")
 
+# 课本原文（按页分段加载，只获取正在阅读的部分）
+if mock_course.get('has_content'):
+    st.markdown("---")
+    if st.checkbox("📄 阅读课本原文", key=f"show_content_{course_id}"):
+        content_page_key = f"content_page_{course_id}"
+        content_page = st.session_state.get(content_page_key, 1)
+
+        content_response = api_client.get_course_content(course_id, page=content_page)
+        content_data = content_response.get('data') if content_response.get('code') == 200 else None
+
+        if not content_data:
+            st.warning(f"⚠️ 课本内容加载失败：{content_response.get('message', '未知错误')}")
+        else:
+            st.text(content_data.get('content', ''))
+
+            col1, col2, col3 = st.columns([1, 2, 1])
+            with col1:
+                if content_page > 1 and st.button("⬅️ 上一页", key="content_prev", use_container_width=True):
+                    st.session_state[content_page_key] = content_page - 1
+                    st.rerun()
+            with col2:
+                st.markdown(
+                    f"<p style='text-align: center;'>第 {content_page} / {content_data.get('total_pages', 1)} 页</p>",
+                    unsafe_allow_html=True
+                )
+            with col3:
+                if content_data.get('has_next') and st.button("下一页 ➡️", key="content_next", use_container_width=True):
+                    st.session_state[content_page_key] = content_page + 1
+                    st.rerun()
+
 # 课程来源信息
 if mock_course.get('pdf_source'):
     with st.expander("📄 课本来源信息"):
@@ -4,6 +4,7 @@
 
 import streamlit as st
 import sys
+import time
 from pathlib import Path
 
 # 添加父目录到路径
@@ -14,6 +15,7 @@ from utils.styles import load_custom_styles
 from utils.api_client import get_api_client
 from utils.local_storage import load_api_config_to_session
 from utils.math_keyboard import render_math_keyboard, get_math_answer, clear_math_answer
+from utils.exercise_prefetch import format_exercises, get_exercise_prefetcher, get_prefetch_key, prefetch_exercises
 from config.settings import SUBJECTS, QUESTION_TYPES
 
 # 页面配置
@@ -108,10 +110,11 @@ if not has_api_key:
     st.stop()
 
 # Mock练习题数据库 - 按学科分类（备用）
+# 示例题目使用负数ID，不会与服务器题目ID冲突，也不会提交到服务器
 mock_exercises_by_subject = {
     'chinese': [
         {
-            'id': 1,
+            'id': -1,
             'type': 'choice',
             'question': '下列词语中加点字注音完全正确的一项是（ ）',
             'options': [
@@ -124,14 +127,14 @@ mock_exercises_by_subject = {
             'explanation': '选项B的注音完全正确。A项"蹒跚"应读"pán shān"；C项"拆散"应读"chāi sàn"；D项"信服"应读"xìn fú"。'
         },
         {
-            'id': 2,
+            'id': -2,
             'type': 'fill',
             'question': '《散步》一文中，"我"最终选择走大路，是因为___________。',
             'correct_answer': '我伴同儿子的时日还长，伴同母亲的时日已短',
             'explanation': '这道题考查对文章主题的理解。作者选择走大路，体现了对母亲的孝顺和对亲情的珍惜。'
         },
         {
-            'id': 3,
+            'id': -3,
             'type': 'short_answer',
             'question': '请简要分析《散步》一文中环境描写的作用。',
             'correct_answer': '文中的环境描写渲染了温馨和谐的氛围，衬托了一家人其乐融融的情感，同时也象征着生命的传承和延续。',
@@ -140,7 +143,7 @@ mock_exercises_by_subject = {
     ],
     'math': [
         {
-            'id': 1,
+            'id': -1,
             'type': 'choice',
             'question': '下列运算正确的是（ ）',
             'options': [
@@ -153,14 +156,14 @@ mock_exercises_by_subject = {
             'explanation': '合并同类项时，只把系数相加，字母和字母的指数不变。C选项：3x² + 2x² = (3+2)x² = 5x²，正确。'
         },
         {
-            'id': 2,
+            'id': -2,
             'type': 'fill',
             'question': '计算：(2x + 3)(2x - 3) = ___________',
             'correct_answer': '4x² - 9',
             'explanation': '这是平方差公式：(a+b)(a-b) = a² - b²。所以(2x+3)(2x-3) = (2x)² - 3² = 4x² - 9。'
         },
         {
-            'id': 3,
+            'id': -3,
             'type': 'short_answer',
             'question': '化简并求值：2(x² - xy) - 3(x² - xy)，其中x = 2，y = -1。',
             'correct_answer': '先化简：2(x² - xy) - 3(x² - xy) = -1(x² - xy) = -x² + xy。代入x=2, y=-1：-4 + (-2) = -6',
@@ -169,7 +172,7 @@ mock_exercises_by_subject = {
     ],
     'english': [
         {
-            'id': 1,
+            'id': -1,
             'type': 'choice',
             'question': 'I _______ to school every day.',
             'options': [
@@ -182,14 +185,14 @@ mock_exercises_by_subject = {
             'explanation': '主语I是第一人称，谓语动词用原形go。'
         },
         {
-            'id': 2,
+            'id': -2,
             'type': 'fill',
             'question': 'She _______ (like) reading books.',
             'correct_answer': 'likes',
             'explanation': '主语She是第三人称单数，动词要加-s。'
         },
         {
-            'id': 3,
+            'id': -3,
             'type': 'short_answer',
             'question': 'What do you usually do after school?',
             'correct_answer': 'I usually do my homework / play sports / read books after school.',
@@ -198,18 +201,156 @@ mock_exercises_by_subject = {
     ]
 }
 
+# 单题计时上限（秒），长时间离开页面的时间不计入
+QUESTION_TIME_LIMIT = 600
+
+
+def start_exercises(exercises):
+    """开始一组新的练习"""
+    st.session_state.current_exercises = exercises
+    st.session_state.current_question_index = 0
+    st.session_state.user_answers = {}
+    reset_practice_tracking()
+
+
+def reset_practice_tracking():
+    """清空答题计时和上次的判分结果"""
+    st.session_state.question_times = {}
+    st.session_state.question_timer = None
+    st.session_state.practice_result = None
+
+
+def track_question_time(question_id):
+    """累计每道题的作答时间：把上次页面运行以来的时间记到上次显示的题目上"""
+    now = time.time()
+    times = st.session_state.setdefault('question_times', {})
+    previous = st.session_state.get('question_timer')
+    if previous:
+        previous_id, started = previous
+        times[previous_id] = min(QUESTION_TIME_LIMIT, times.get(previous_id, 0) + now - started)
+    st.session_state.question_timer = (question_id, now)
+
+
+def is_server_exercise(question):
+    """服务器上的题目（示例题目的ID为负数）"""
+    return isinstance(question.get('id'), int) and question['id'] > 0
+
+
+def submit_practice() -> bool:
+    """
+    提交整组答案：后端一次完成判分、记录答题和更新学习进度
+
+    Returns:
+        是否由服务器判分成功（示例题目只在本地判分）
+    """
+    if all(is_server_exercise(q) for q in st.session_state.current_exercises):
+        response = send_practice_answers()
+        if response.get('code') == 200:
+            st.session_state.practice_result = response['data']
+            return True
+        reason = response.get('message', '未知错误')
+    else:
+        reason = '示例题目不提交到服务器'
+    
+    grade_practice_locally(reason)
+    return False
+
+
+def send_practice_answers():
+    """把整组答案发送到服务器判分"""
+    times = st.session_state.get('question_times', {})
+    answers = [
+        {
+            'exercise_id': q['id'],
+            'user_answer': st.session_state.user_answers.get(q['id'], ''),
+            'time_spent': int(times.get(q['id'], 0))
+        }
+        for q in st.session_state.current_exercises
+    ]
+    with st.spinner("正在判分..."):
+        return api_client.batch_submit_answers(course_id, answers)
+
+
+def grade_practice_locally(reason):
+    """后端判分失败（未登录、示例题目等）时在本地判分，成绩不会被记录"""
+    correct_count = sum(
+        1 for q in st.session_state.current_exercises
+        if st.session_state.user_answers.get(q['id']) == q['correct_answer']
+    )
+    total_count = len(st.session_state.current_exercises)
+    st.session_state.practice_result = {
+        'total_count': total_count,
+        'correct_count': correct_count,
+        'total_score': int(correct_count / total_count * 100),
+        'results': [],
+        'local_only': reason
+    }
+
+
+def render_practice_result():
+    """显示判分结果"""
+    result = st.session_state.get('practice_result')
+    if not result:
+        return
+    
+    st.success(f"🎉 提交成功！你的得分：{result['total_score']}分（{result['correct_count']}/{result['total_count']}题正确）")
+    if result.get('local_only'):
+        st.warning(f"⚠️ 未由服务器判分（{result['local_only']}），以上为本地判分结果，本次成绩未记录")
+    
+    if result.get('results'):
+        with st.expander("📊 每题结果", expanded=True):
+            for index, item in enumerate(result['results'], 1):
+                mark = "✅" if item['is_correct'] else "❌"
+                st.markdown(f"**第{index}题 {mark}**　你的答案：`{item['user_answer'] or '未作答'}`　标准答案：`{item['standard_answer']}`")
+
+
+def render_next_set_button():
+    """下一组题目已在后台生成好时，显示开始按钮"""
+    prefetch_key = get_prefetch_key(course_id)
+    if prefetcher.has_ready(prefetch_key):
+        if st.button("🆕 下一组题目已准备好，开始新的练习", use_container_width=True):
+            exercises = prefetcher.take(prefetch_key)
+            if exercises:
+                start_exercises(exercises)
+            st.rerun()
+    elif prefetcher.is_pending(prefetch_key):
+        st.caption("⏳ 正在后台准备下一组题目...")
+
+
+prefetcher = get_exercise_prefetcher()
+
 # 获取或初始化练习数据
 if 'current_exercises' not in st.session_state or not st.session_state.current_exercises:
     st.info("📝 **生成练习题**")
     
     # 选择题目数量
-    question_count = st.slider("选择题目数量：", min_value=3, max_value=10, value=5)
+    question_count = st.slider("选择题目数量：", min_value=3, max_value=10, value=5, key="exercise_question_count")
+    prefetch_key = get_prefetch_key(course_id)
+    
+    if prefetcher.has_ready(prefetch_key):
+        st.success("⚡ 已在后台提前生成好一组题目，点击即可开始")
+    elif prefetcher.is_pending(prefetch_key):
+        st.caption("⏳ 正在后台生成题目，点击后将直接使用生成结果")
     
     if st.button("🤖 AI生成练习题", type="primary", use_container_width=True):
         if not has_content:
             st.warning("⚠️ 该课程暂无课本内容，AI将根据课程标题和大纲生成题目")
         
+        # 优先使用服务器题库中已备好的题目（不调用AI，立即开始）
+        inventory_response = api_client.get_inventory_exercises(course_id, question_count)
+        if inventory_response.get('code') == 200:
+            exercises = format_exercises(inventory_response.get('data', {}))
+            if len(exercises) >= question_count:
+                start_exercises(exercises)
+                st.rerun()
+        
         with st.spinner(f"🤖 AI正在生成 {question_count} 道题目..."):
+            # 其次使用后台预生成的题目（正在生成时等待结果，不重复调用AI）
+            exercises = prefetcher.take(prefetch_key, wait=True, timeout=90)
+            if exercises is not None:
+                start_exercises(exercises)
+                st.rerun()
+            
             response = api_client.generate_exercises(course_id, question_count, api_key, api_model)
             
             if response.get('code') != 200:
@@ -218,39 +359,12 @@ if 'current_exercises' not in st.session_state or not st.session_state.current_e
                 
                 # 提供备用Mock数据
                 if st.button("使用示例题目（不调用AI）"):
-                    st.session_state.current_exercises = mock_exercises_by_subject.get(selected_subject, mock_exercises_by_subject['chinese'])
-                    st.session_state.current_question_index = 0
-                    st.session_state.user_answers = {}
+                    start_exercises(mock_exercises_by_subject.get(selected_subject, mock_exercises_by_subject['chinese']))
                     st.rerun()
             else:
-                result = response.get('data', {})
-                # 提取题目列表（API返回格式：{course_id, generated_count, questions: [...]}）
-                exercises = result.get('questions', []) if isinstance(result, dict) else []
-                
-                # 转换API返回的题目格式
-                formatted_exercises = []
-                for idx, ex in enumerate(exercises, 1):
-                    # 确保ex是字典类型
-                    if not isinstance(ex, dict):
-                        continue
-                    
-                    formatted_ex = {
-                        'id': ex.get('id', idx),
-                        'type': ex.get('question_type', 'choice'),
-                        'question': ex.get('question_text', ''),
-                        'correct_answer': ex.get('answer', ''),
-                        'explanation': ex.get('explanation', '')
-                    }
-                    
-                    # 如果是选择题，添加选项
-                    if formatted_ex['type'] == 'choice' and ex.get('options'):
-                        formatted_ex['options'] = ex['options'].split('\n') if isinstance(ex['options'], str) else ex['options']
-                    
-                    formatted_exercises.append(formatted_ex)
-                
-                st.session_state.current_exercises = formatted_exercises
-                st.session_state.current_question_index = 0
-                st.session_state.user_answers = {}
+                # API返回格式：{course_id, generated_count, questions: [...]}
+                formatted_exercises = format_exercises(response.get('data', {}))
+                start_exercises(formatted_exercises)
                 st.success(f"✅ 成功生成 {len(formatted_exercises)} 道题目！")
                 st.rerun()
     
@@ -270,6 +384,7 @@ st.markdown("---")
 if current_index < total_questions:
     question = st.session_state.current_exercises[current_index]
     question_id = question['id']
+    track_question_time(question_id)
     
     # 题型标签
     type_label = QUESTION_TYPES.get(question['type'], '未知题型')
@@ -394,27 +509,15 @@ if current_index < total_questions:
     with col5:
         if current_index == total_questions - 1:
             if st.button("✅ 提交答案", use_container_width=True, type="primary"):
-                # 计算得分
-                correct_count = 0
-                for q in st.session_state.current_exercises:
-                    user_ans = st.session_state.user_answers.get(q['id'], '')
-                    if user_ans and user_ans == q['correct_answer']:
-                        correct_count += 1
-                
-                score = (correct_count / total_questions) * 100
-                
-                # 更新学习进度（完成练习，进度+10%）
-                try:
-                    api_client.update_study_progress(
-                        course_id=course_id,
-                        status='in_progress',
-                        progress=min(100, 10)  # 每次完成练习增加10%进度
-                    )
-                except:
-                    pass  # 静默处理错误
-                
-                st.balloons()
-                st.success(f"🎉 提交成功！你的得分：{score:.1f}分（{correct_count}/{total_questions}题正确）")
+                if submit_practice():
+                    st.balloons()
+    
+    render_practice_result()
+    
+    # 做到最后一题时在后台预取下一组题目（从题库取，不调用AI，不影响正在做的这一组）
+    if current_index == total_questions - 1:
+        prefetch_exercises(course_id, api_client)
+        render_next_set_button()
 
 else:
     # 所有题目已完成
@@ -423,5 +526,9 @@ else:
     if st.button("🔄 重新开始", use_container_width=True):
         st.session_state.current_question_index = 0
         st.session_state.user_answers = {}
+        reset_practice_tracking()
         st.rerun()
+    
+    prefetch_exercises(course_id, api_client)
+    render_next_set_button()
 
@@ -257,58 +257,66 @@ with tab3:
     api_client = get_api_client()
     
     with st.spinner("加载学习统计..."):
-        # 获取学习进度数据
-        progress_response = api_client.get_study_progress()
-        # 获取答题统计数据
-        stats_response = api_client.get_exercise_statistics()
+        # 一次请求获取全部统计数据
+        dashboard_response = api_client.get_dashboard()
     
-    # 解析响应
-    progress_data = None
-    stats_data = None
-    has_error = False
-    
-    if progress_response.get('code') != 200:
-        st.warning(f"⚠️ 学习进度加载失败：{progress_response.get('message', '未知错误')}")
-        has_error = True
-    else:
-        progress_data = progress_response.get('data')
-    
-    if stats_response.get('code') != 200:
-        st.warning(f"⚠️ 答题统计加载失败：{stats_response.get('message', '未知错误')}")
-        has_error = True
+    if dashboard_response.get('code') != 200:
+        st.warning(f"⚠️ 学习统计加载失败：{dashboard_response.get('message', '未知错误')}")
     else:
-        stats_data = stats_response.get('data')
-    
-    if not has_error:
+        dashboard = dashboard_response.get('data') or {}
+        progress_data = dashboard.get('progress', {})
+        stats_data = dashboard.get('profile', {})
+        
         # 显示本周学习数据
         st.markdown("#### 📈 学习数据概览")
         
         col1, col2, col3, col4 = st.columns(4)
         
         with col1:
-            completed = progress_data.get('completed_courses', 0) if progress_data else 0
-            st.metric("完成课程", f"{completed}节")
+            st.metric("完成课程", f"{progress_data.get('completed_courses', 0)}节")
         
         with col2:
-            in_progress = progress_data.get('in_progress_courses', 0) if progress_data else 0
-            st.metric("学习中", f"{in_progress}节")
+            st.metric("学习中", f"{progress_data.get('in_progress_courses', 0)}节")
         
         with col3:
-            total_exercises = stats_data.get('total_exercises', 0) if stats_data else 0
-            st.metric("练习题数", f"{total_exercises}题")
+            st.metric("练习题数", f"{stats_data.get('total_exercises', 0)}题")
         
         with col4:
-            accuracy = stats_data.get('accuracy_rate', 0) if stats_data else 0
-            st.metric("平均正确率", f"{accuracy}%")
+            st.metric("平均正确率", f"{stats_data.get('accuracy_rate', 0)}%")
+        
+        col1, col2 = st.columns(2)
+        with col1:
+            st.metric("累计学习时长", f"{stats_data.get('total_study_time', 0) // 60}分钟")
+        with col2:
+            st.metric("连续学习", f"{stats_data.get('continuous_days', 0)}天")
+        
+        # 近7天答题趋势
+        weekly_trend = dashboard.get('weekly_trend', [])
+        if any(day['answers'] for day in weekly_trend):
+            st.markdown("#### 📅 近7天答题")
+            st.bar_chart(
+                {day['date'][5:]: day['answers'] for day in weekly_trend},
+                height=220
+            )
+        
+        # 最近学习的课程
+        recent_courses = dashboard.get('recent_courses', [])
+        if recent_courses:
+            st.markdown("#### 🕘 最近学习")
+            for course in recent_courses:
+                st.markdown(
+                    f"- **{course.get('course_title', '')}**（{course.get('subject_name', '')}）"
+                    f" {course.get('status_display', '')} · 进度 {course.get('progress', 0)}%"
+                )
         
         st.markdown("---")
         
         # 显示各学科学习进度
         st.markdown("#### 📚 各学科学习进度")
         
-        if progress_data and progress_data.get('subjects_progress'):
+        if dashboard.get('subjects_progress'):
             # 使用真实数据
-            for subject in progress_data['subjects_progress']:
+            for subject in dashboard['subjects_progress']:
                 # 图标映射
                 icon_map = {
                     '语文': '📚',
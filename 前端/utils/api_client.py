@@ -1,11 +1,101 @@
 """
 Django后端API客户端
 用于前端调用后端接口获取真实数据
+
+- 所有用户会话共用一个进程级的HTTP连接池（keep-alive，连接失败时有限次重试）
+- 学科、课程列表、课程详情、知识点总结等只读接口的响应在进程内缓存：
+  有效期内直接使用缓存，过期后带 If-None-Match 向后端验证，未变化时后端返回304
 """
 
-import requests
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
 from typing import Dict, List, Optional
+
+import requests
 import streamlit as st
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+# 只读接口缓存有效期（秒），过期后向后端验证ETag
+SUBJECTS_CACHE_TTL = 300
+COURSES_CACHE_TTL = 60
+COURSE_DETAIL_CACHE_TTL = 30
+SUMMARY_CACHE_TTL = 60
+
+# 响应缓存最多保存的条目数
+RESPONSE_CACHE_SIZE = 512
+
+
+@st.cache_resource
+def get_http_session() -> requests.Session:
+    """
+    进程级共享的HTTP会话（所有用户会话共用连接池）
+
+    - 连接失败最多重试2次；GET遇到502/503/504时重试，POST/PUT不会因读超时被重复提交
+    - 不保存Cookie，避免不同用户之间串用；认证信息由每个请求的请求头携带
+    """
+    session = requests.Session()
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+
+    retry = Retry(
+        total=2,
+        connect=2,
+        read=0,
+        status=2,
+        backoff_factor=0.2,
+        status_forcelist=(502, 503, 504),
+        allowed_methods=frozenset(['GET', 'HEAD']),
+        raise_on_status=False
+    )
+    adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32, max_retries=retry)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    return session
+
+
+class ResponseCache:
+    """只读接口的响应缓存（线程安全，按最近使用淘汰）"""
+
+    def __init__(self, max_size: int = RESPONSE_CACHE_SIZE):
+        self.max_size = max_size
+        self._entries = OrderedDict()  # key -> (etag, data, 验证时间)
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+            return entry
+
+    def set(self, key, etag, data):
+        with self._lock:
+            self._entries[key] = (etag, data, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def touch(self, key):
+        """后端返回304：数据未变化，重新计时"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries[key] = (entry[0], entry[1], time.monotonic())
+
+    def invalidate(self, prefix):
+        """删除URL以prefix开头的缓存"""
+        with self._lock:
+            for key in [key for key in self._entries if key[1].startswith(prefix)]:
+                del self._entries[key]
+
+
+@st.cache_resource
+def get_response_cache() -> ResponseCache:
+    """进程级共享的响应缓存"""
+    return ResponseCache()
 
 
 class APIClient:
@@ -21,6 +111,53 @@ class APIClient:
         self.base_url = base_url
         self.token = None
     
+    @property
+    def session(self) -> requests.Session:
+        """共享的HTTP会话"""
+        return get_http_session()
+    
+    def _cache_key(self, url: str, params: Optional[Dict] = None):
+        """缓存键：用户（token摘要）+ URL + 排序后的查询参数"""
+        user = hashlib.sha1(self.token.encode('utf-8')).hexdigest() if self.token else ''
+        return (user, url, tuple(sorted((params or {}).items())))
+    
+    def _cached_get(self, url: str, ttl: int, params: Optional[Dict] = None, timeout: int = 10) -> Dict:
+        """
+        带缓存的GET请求
+        
+        有效期内直接返回缓存；过期后带If-None-Match请求，304时沿用缓存；
+        后端不可用时返回过期的缓存（若有），否则抛出requests异常由调用方处理。
+        """
+        cache = get_response_cache()
+        key = self._cache_key(url, params)
+        entry = cache.get(key)
+        if entry is not None and time.monotonic() - entry[2] < ttl:
+            return entry[1]
+        
+        headers = self._get_headers()
+        if entry is not None and entry[0]:
+            headers['If-None-Match'] = entry[0]
+        
+        try:
+            response = self.session.get(url, params=params, headers=headers, timeout=timeout)
+            if response.status_code == 304 and entry is not None:
+                cache.touch(key)
+                return entry[1]
+            response.raise_for_status()
+        except requests.exceptions.RequestException:
+            if entry is not None:
+                return entry[1]
+            raise
+        
+        data = response.json()
+        if data.get('code') == 200:
+            cache.set(key, response.headers.get('ETag'), data)
+        return data
+    
+    def invalidate_course_cache(self, course_id: int):
+        """课程数据（进度、知识点总结）变化后清除该课程的缓存"""
+        get_response_cache().invalidate(f"{self.base_url}/courses/courses/{course_id}/")
+    
     def _get_headers(self) -> Dict[str, str]:
         """获取请求头"""
         headers = {
@@ -61,7 +198,7 @@ class APIClient:
             data["school"] = school
         
         try:
-            response = requests.post(url, json=data, headers=self._get_headers())
+            response = self.session.post(url, json=data, headers=self._get_headers())
             response.raise_for_status()
             return response.json()
         
@@ -90,7 +227,7 @@ class APIClient:
         }
         
         try:
-            response = requests.post(url, json=data, headers=self._get_headers())
+            response = self.session.post(url, json=data, headers=self._get_headers())
             response.raise_for_status()
             
             result = response.json()
@@ -120,9 +257,7 @@ class APIClient:
         url = f"{self.base_url}/courses/subjects/"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+            return self._cached_get(url, SUBJECTS_CACHE_TTL)
         
         except requests.exceptions.RequestException as e:
             return {
@@ -152,9 +287,7 @@ class APIClient:
             params['grade'] = grade
         
         try:
-            response = requests.get(url, params=params, headers=self._get_headers(), timeout=10)
-            response.raise_for_status()
-            return response.json()
+            return self._cached_get(url, COURSES_CACHE_TTL, params=params)
         
         except requests.exceptions.ConnectionError as e:
             return {
@@ -170,8 +303,8 @@ class APIClient:
             }
         except requests.exceptions.HTTPError as e:
             return {
-                'code': response.status_code,
-                'message': f'HTTP错误 {response.status_code}: {str(e)}',
+                'code': e.response.status_code,
+                'message': f'HTTP错误 {e.response.status_code}: {str(e)}',
                 'data': []
             }
         except requests.exceptions.RequestException as e:
@@ -200,9 +333,7 @@ class APIClient:
         url = f"{self.base_url}/courses/courses/{course_id}/"
         
         try:
-            response = requests.get(url, headers=self._get_headers())
-            response.raise_for_status()
-            return response.json()
+            return self._cached_get(url, COURSE_DETAIL_CACHE_TTL)
         
         except requests.exceptions.RequestException as e:
             return {
@@ -210,7 +341,66 @@ class APIClient:
                 'message': f'获取课程详情失败: {str(e)}',
                 'data': None
             }
-    
+
+    def get_knowledge_summary(self, course_id: int) -> Dict:
+        """
+        获取课程最新的知识点总结
+        
+        Args:
+            course_id: 课程ID
+        
+        Returns:
+            知识点总结数据（暂无总结时code为404）
+        """
+        url = f"{self.base_url}/courses/courses/{course_id}/summary/"
+        
+        try:
+            return self._cached_get(url, SUMMARY_CACHE_TTL)
+        
+        except requests.exceptions.HTTPError as e:
+            # 暂无总结时后端返回400，响应体中code为404
+            try:
+                return e.response.json()
+            except ValueError:
+                return {
+                    'code': e.response.status_code,
+                    'message': f'获取知识点总结失败: {str(e)}',
+                    'data': None
+                }
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'获取知识点总结失败: {str(e)}',
+                'data': None
+            }
+
+    def get_course_content(self, course_id: int, page: int = 1, page_size: int = 5000) -> Dict:
+        """
+        分段获取课本内容（只获取当前阅读的部分）
+
+        Args:
+            course_id: 课程ID
+            page: 页码（从1开始）
+            page_size: 每页字数
+
+        Returns:
+            课本内容片段数据
+        """
+        url = f"{self.base_url}/courses/courses/{course_id}/content/"
+        params = {'page': page, 'page_size': page_size}
+
+        try:
+            response = self.session.get(url, params=params, headers=self._get_headers(), timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'获取课本内容失败: {str(e)}',
+                'data': None
+            }
+
     def generate_knowledge_summary(self, course_id: int, api_key: str, model: str = 'deepseek-chat', regenerate: bool = False) -> Dict:
         """
         生成知识点总结
@@ -232,8 +422,9 @@ class APIClient:
         }
         
         try:
-            response = requests.post(url, json=data, headers=self._get_headers(), timeout=180)  # 3分钟超时
+            response = self.session.post(url, json=data, headers=self._get_headers(), timeout=180)  # 3分钟超时
             response.raise_for_status()
+            self.invalidate_course_cache(course_id)
             return response.json()
         
         except requests.exceptions.Timeout as e:
@@ -273,7 +464,7 @@ class APIClient:
         }
         
         try:
-            response = requests.post(url, json=data, headers=self._get_headers(), timeout=60)
+            response = self.session.post(url, json=data, headers=self._get_headers(), timeout=60)
             response.raise_for_status()
             return response.json()
         
@@ -284,6 +475,41 @@ class APIClient:
                 'data': None
             }
     
+    def get_inventory_exercises(self, course_id: int, count: int, difficulty: str = 'basic',
+                                exclude_ids: Optional[List[int]] = None) -> Dict:
+        """
+        从题库库存中取一组练习题（不调用AI，立即返回）
+
+        Args:
+            course_id: 课程ID
+            count: 题目数量
+            difficulty: 难度级别
+            exclude_ids: 不要取的题目ID（如正在做的一组）
+
+        Returns:
+            练习题数据（{course_id, total_count, from_inventory_count, questions: [...]}，数量可能不足count）
+        """
+        url = f"{self.base_url}/exercises/exercises/"
+        params = {
+            "course_id": course_id,
+            "count": count,
+            "difficulty": difficulty
+        }
+        if exclude_ids:
+            params["exclude"] = ','.join(str(exercise_id) for exercise_id in exclude_ids)
+
+        try:
+            response = self.session.get(url, params=params, headers=self._get_headers(), timeout=10)
+            response.raise_for_status()
+            return response.json()
+
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'获取练习题失败: {str(e)}',
+                'data': None
+            }
+
     def submit_answer(self, exercise_id: int, user_answer: str) -> Dict:
         """
         提交答案并批改
@@ -302,7 +528,7 @@ class APIClient:
         }
         
         try:
-            response = requests.post(url, json=data, headers=self._get_headers())
+            response = self.session.post(url, json=data, headers=self._get_headers())
             response.raise_for_status()
             return response.json()
         
@@ -313,6 +539,45 @@ class APIClient:
                 'data': None
             }
     
+    def batch_submit_answers(self, course_id: int, answers: List[Dict]) -> Dict:
+        """
+        批量提交一组练习的答案（后端判分、记录答题、更新学习进度）
+        
+        Args:
+            course_id: 课程ID
+            answers: [{"exercise_id": 1, "user_answer": "B", "time_spent": 30}, ...]
+        
+        Returns:
+            判分结果（总分、每道题的结果、更新后的学习进度）
+        """
+        url = f"{self.base_url}/exercises/batch-submit/"
+        data = {
+            "course_id": course_id,
+            "answers": answers
+        }
+        
+        try:
+            response = self.session.post(url, json=data, headers=self._get_headers(), timeout=15)
+            response.raise_for_status()
+            self.invalidate_course_cache(course_id)
+            return response.json()
+        
+        except requests.exceptions.HTTPError as e:
+            try:
+                return e.response.json()
+            except ValueError:
+                return {
+                    'code': e.response.status_code,
+                    'message': f'提交答案失败: {str(e)}',
+                    'data': None
+                }
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'提交答案失败: {str(e)}',
+                'data': None
+            }
+    
     def get_study_progress(self, subject_id: int = None, grade: str = None) -> Dict:
         """
         获取学习进度
@@ -333,7 +598,7 @@ class APIClient:
             params['grade'] = grade
         
         try:
-            response = requests.get(url, params=params, headers=self._get_headers(), timeout=10)
+            response = self.session.get(url, params=params, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
             return response.json()
         
@@ -361,7 +626,7 @@ class APIClient:
             params['subject_id'] = subject_id
         
         try:
-            response = requests.get(url, params=params, headers=self._get_headers(), timeout=10)
+            response = self.session.get(url, params=params, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
             return response.json()
         
@@ -372,6 +637,27 @@ class APIClient:
                 'data': None
             }
     
+    def get_dashboard(self) -> Dict:
+        """
+        获取个人中心统计（学习进度、答题统计、最近学习、各学科进度、近7天趋势，一次请求）
+        
+        Returns:
+            统计数据
+        """
+        url = f"{self.base_url}/users/dashboard/"
+        
+        try:
+            response = self.session.get(url, headers=self._get_headers(), timeout=10)
+            response.raise_for_status()
+            return response.json()
+        
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'获取学习统计失败: {str(e)}',
+                'data': None
+            }
+    
     def update_study_progress(self, course_id: int, status: str = None, progress: int = None, study_time: int = None) -> Dict:
         """
         更新学习进度
@@ -396,8 +682,9 @@ class APIClient:
             data['study_time'] = study_time
         
         try:
-            response = requests.put(url, json=data, headers=self._get_headers(), timeout=10)
+            response = self.session.put(url, json=data, headers=self._get_headers(), timeout=10)
             response.raise_for_status()
+            self.invalidate_course_cache(course_id)
             return response.json()
         
         except requests.exceptions.RequestException as e:
@@ -406,6 +693,30 @@ class APIClient:
                 'message': f'更新学习进度失败: {str(e)}',
                 'data': None
             }
+    
+    def send_study_heartbeat(self, events: List[Dict]) -> Dict:
+        """
+        批量上报学习心跳（建议每分钟上报一次累计的学习时长）
+        
+        Args:
+            events: 心跳事件列表，每项包含 course_id、seconds，可选 status、progress
+        
+        Returns:
+            上报结果
+        """
+        url = f"{self.base_url}/courses/study-progress/heartbeat/"
+        
+        try:
+            response = self.session.post(url, json={'events': events}, headers=self._get_headers(), timeout=10)
+            response.raise_for_status()
+            return response.json()
+        
+        except requests.exceptions.RequestException as e:
+            return {
+                'code': 500,
+                'message': f'上报学习心跳失败: {str(e)}',
+                'data': None
+            }
 
 
 # 创建全局API客户端实例
@@ -4,10 +4,14 @@
 
 import streamlit as st
 from .local_storage import get_local_storage
+from .session_store import sync_session_cookie
 
 
 def check_authentication() -> bool:
     """检查用户是否已认证"""
+    # 新建的浏览器会话需要写入Cookie（登录后会立即重新运行，在这里统一处理）
+    sync_session_cookie()
+
     # 先检查session_state（必须是True才返回，避免False被当作已检查）
     if st.session_state.get('is_authenticated') is True:
         return True
@@ -71,7 +75,7 @@ def login_user(username: str, password: str, remember_me: bool = False) -> bool:
                 storage = get_local_storage()
                 success = storage.save_auth(username, remember_days=7)
                 if success:
-                    print(f"✅ 登录状态已保存到: {storage.auth_file}")
+                    print(f"✅ 登录状态已保存: {username}")
                 else:
                     print(f"❌ 登录状态保存失败")
             except Exception as e:
@@ -110,9 +114,10 @@ def logout_user():
     storage = get_local_storage()
     storage.clear_auth()
     
-    # 清除所有session state
+    # 清除所有session state（保留浏览器会话ID，Cookie仍然有效）
     for key in list(st.session_state.keys()):
-        del st.session_state[key]
+        if key != 'browser_session_id':
+            del st.session_state[key]
     st.rerun()
 
 
@@ -0,0 +1,189 @@
+"""
+练习题后台预取
+
+做到一组题的最后一题时，在后台线程中从服务器题库库存取下一组题目
+（GET /exercises/exercises/?count=，不调用AI、不改变课程当前的题目批次），
+放入按 (用户, 课程, 题目数量) 区分的队列，开始下一组练习时直接取用。
+只在学生进入练习后预取，浏览课程详情页不会触发。线程池和队列由 st.cache_resource 持有，所有会话共用。
+"""
+
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+import streamlit as st
+
+from utils.api_client import APIClient
+
+# 后台预取线程数
+PREFETCH_WORKERS = 2
+# 每个队列最多预存几组题目
+PREFETCH_DEPTH = 1
+# 预取的题目超过这个时间（秒）不再使用（课程内容或Prompt可能已更新）
+PREFETCH_TTL = 30 * 60
+# 后台预取失败（或库存不足一组）后，这段时间（秒）内不再自动重试
+PREFETCH_RETRY_DELAY = 60
+# 默认题目数量（与智能练习页的滑块默认值一致）
+DEFAULT_QUESTION_COUNT = 5
+
+
+def format_exercises(result) -> List[Dict]:
+    """
+    把生成接口或题库接口返回的题目转换为练习页使用的格式
+
+    Args:
+        result: 接口返回的data（{course_id, generated_count, questions: [...]}）
+    """
+    exercises = result.get('questions', []) if isinstance(result, dict) else []
+
+    formatted_exercises = []
+    for idx, ex in enumerate(exercises, 1):
+        # 确保ex是字典类型
+        if not isinstance(ex, dict):
+            continue
+
+        formatted_ex = {
+            'id': ex.get('id', -idx),  # 缺少ID时用负数，避免与服务器题目ID冲突
+            'type': ex.get('question_type', 'choice'),
+            'question': ex.get('question_text', ''),
+            'correct_answer': ex.get('answer', ''),
+            'explanation': ex.get('explanation', '')
+        }
+
+        # 如果是选择题，添加选项
+        if formatted_ex['type'] == 'choice' and ex.get('options'):
+            formatted_ex['options'] = ex['options'].split('\n') if isinstance(ex['options'], str) else ex['options']
+
+        formatted_exercises.append(formatted_ex)
+    return formatted_exercises
+
+
+class ExercisePrefetcher:
+    """练习题预取队列（线程安全）"""
+
+    def __init__(self, workers: int = PREFETCH_WORKERS):
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='exercise-prefetch')
+        self._ready = {}    # key -> deque[(取得时间, 题目列表)]
+        self._pending = {}  # key -> Future
+        self._failed = {}   # key -> 最近一次失败时间
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(username: str, course_id: int, count: int):
+        return username, course_id, count
+
+    def _fresh_sets(self, key) -> deque:
+        """取出key对应的队列，并丢弃过期的题目（调用方需持有锁）"""
+        queue = self._ready.setdefault(key, deque())
+        while queue and time.monotonic() - queue[0][0] > PREFETCH_TTL:
+            queue.popleft()
+        return queue
+
+    def prefetch(self, key, api_client: APIClient, exclude_ids: Optional[List[int]] = None) -> bool:
+        """
+        在后台从题库库存取一组题目（已有预取中或已预存满的题目时不重复预取）
+
+        Args:
+            exclude_ids: 不要取的题目ID（当前正在做的一组）
+
+        Returns:
+            是否提交了新的预取任务
+        """
+        with self._lock:
+            if key in self._pending or len(self._fresh_sets(key)) >= PREFETCH_DEPTH:
+                return False
+            if time.monotonic() - self._failed.get(key, float('-inf')) < PREFETCH_RETRY_DELAY:
+                return False
+            # 后台线程不能访问st.session_state，使用独立的客户端（共用连接池）
+            client = APIClient(api_client.base_url)
+            client.token = api_client.token
+            self._pending[key] = self._executor.submit(self._run, key, client, list(exclude_ids or []))
+        return True
+
+    def _run(self, key, client: APIClient, exclude_ids: List[int]):
+        """
+        后台线程：取题目并放入队列（库存不足一组时视为失败，由练习页按原流程生成）
+
+        在任务结束前入队，等待方从future返回时队列中一定已有结果。
+        """
+        _, course_id, count = key
+        try:
+            response = client.get_inventory_exercises(course_id, count, exclude_ids=exclude_ids)
+            if response.get('code') != 200:
+                raise RuntimeError(response.get('message', '未知错误'))
+            exercises = format_exercises(response.get('data', {}))
+            if len(exercises) < count:
+                raise RuntimeError('题库库存不足')
+            with self._lock:
+                if exercises:
+                    self._fresh_sets(key).append((time.monotonic(), exercises))
+                    self._failed.pop(key, None)
+        except Exception:
+            with self._lock:
+                self._failed[key] = time.monotonic()
+            raise
+        finally:
+            with self._lock:
+                self._pending.pop(key, None)
+
+    def is_pending(self, key) -> bool:
+        with self._lock:
+            return key in self._pending
+
+    def has_ready(self, key) -> bool:
+        with self._lock:
+            return bool(self._fresh_sets(key))
+
+    def take(self, key, wait: bool = False, timeout: Optional[float] = None) -> Optional[List[Dict]]:
+        """
+        取出一组预取的题目
+
+        Args:
+            wait: 没有现成题目但正在预取时，等待预取完成
+            timeout: 等待的最长时间（秒）
+
+        Returns:
+            题目列表，没有可用题目（或后台预取失败）时返回None
+        """
+        with self._lock:
+            queue = self._fresh_sets(key)
+            if queue:
+                return queue.popleft()[1]
+            future = self._pending.get(key)
+
+        if not wait or future is None:
+            return None
+        try:
+            future.result(timeout=timeout)
+        except Exception:
+            return None
+        # 等待期间可能被其他会话取走
+        with self._lock:
+            queue = self._fresh_sets(key)
+            return queue.popleft()[1] if queue else None
+
+
+@st.cache_resource
+def get_exercise_prefetcher() -> ExercisePrefetcher:
+    """进程级共享的预取队列"""
+    return ExercisePrefetcher()
+
+
+def get_prefetch_key(course_id: int):
+    """当前用户、课程对应的预取队列键"""
+    return ExercisePrefetcher.make_key(
+        st.session_state.get('username', ''),
+        course_id,
+        st.session_state.get('exercise_question_count', DEFAULT_QUESTION_COUNT)
+    )
+
+
+def prefetch_exercises(course_id: int, api_client: APIClient) -> bool:
+    """为当前用户在后台预取下一组题目（排除正在做的一组）"""
+    current_ids = [
+        exercise['id'] for exercise in st.session_state.get('current_exercises') or []
+        if isinstance(exercise.get('id'), int) and exercise['id'] > 0
+    ]
+    return get_exercise_prefetcher().prefetch(get_prefetch_key(course_id), api_client, current_ids)
@@ -1,28 +1,43 @@
 """
-本地持久化存储模块
-用于保存登录状态和API配置
+登录状态和API配置持久化模块
+
+数据按浏览器保存在服务端会话存储中（见 utils/session_store.py），
+浏览器只保存一个签名的会话Cookie；不同浏览器/设备的登录状态和API Key互不影响。
 """
 
-import json
-import os
-from pathlib import Path
 from datetime import datetime, timedelta
 import hashlib
 
+import streamlit as st
+
+from config.settings import SESSION_COOKIE_MAX_AGE
+from .session_store import get_browser_session_id, get_session_store
+
 
 class LocalStorage:
-    """本地存储管理器"""
-    
+    """当前浏览器的持久化存储"""
+
     def __init__(self):
-        # 存储目录：用户主目录/.streamlit_learning_system/
-        self.storage_dir = Path.home() / '.streamlit_learning_system'
-        self.storage_dir.mkdir(exist_ok=True)
-        
-        self.auth_file = self.storage_dir / 'auth.json'
-        self.config_file = self.storage_dir / 'config.json'
-    
+        self.store = get_session_store()
+
+    def _load(self) -> dict:
+        """读取当前浏览器的会话数据"""
+        session_id = get_browser_session_id()
+        if not session_id:
+            return {}
+        return self.store.get(session_id) or {}
+
+    def _save(self, data: dict) -> bool:
+        """写入当前浏览器的会话数据（没有会话时新建）"""
+        session_id = get_browser_session_id(create=True)
+        if data:
+            self.store.set(session_id, data, SESSION_COOKIE_MAX_AGE)
+        else:
+            self.store.delete(session_id)
+        return True
+
     # ==================== 认证相关 ====================
-    
+
     def save_auth(self, username: str, remember_days: int = 7):
         """保存登录状态"""
         auth_data = {
@@ -31,53 +46,53 @@ class LocalStorage:
             'expire_time': (datetime.now() + timedelta(days=remember_days)).isoformat(),
             'token': self._generate_token(username)
         }
-        
+
         try:
-            with open(self.auth_file, 'w', encoding='utf-8') as f:
-                json.dump(auth_data, f, ensure_ascii=False, indent=2)
-            return True
+            data = dict(self._load())
+            data['auth'] = auth_data
+            return self._save(data)
         except Exception as e:
             print(f"保存登录状态失败: {e}")
             return False
-    
+
     def load_auth(self):
         """加载登录状态"""
-        if not self.auth_file.exists():
-            return None
-        
         try:
-            with open(self.auth_file, 'r', encoding='utf-8') as f:
-                auth_data = json.load(f)
-            
+            auth_data = self._load().get('auth')
+            if not auth_data:
+                return None
+
             # 检查是否过期
             expire_time = datetime.fromisoformat(auth_data['expire_time'])
             if datetime.now() > expire_time:
-                # 已过期，删除文件
+                # 已过期，删除登录状态
                 self.clear_auth()
                 return None
-            
+
             return auth_data
         except Exception as e:
             print(f"加载登录状态失败: {e}")
             return None
-    
+
     def clear_auth(self):
         """清除登录状态"""
         try:
-            if self.auth_file.exists():
-                self.auth_file.unlink()
+            data = dict(self._load())
+            if data.pop('auth', None) is not None:
+                self._save(data)
             return True
         except Exception as e:
             print(f"清除登录状态失败: {e}")
             return False
-    
+
     def is_authenticated(self):
         """检查是否已登录且未过期"""
         auth_data = self.load_auth()
         return auth_data is not None
-    
+
     # ==================== AI配置相关 ====================
-    
+    # 按用户名分别保存，同一浏览器切换账号时不会用到别人的API Key
+
     def save_ai_config(self, api_key: str, model: str, endpoint: str = None):
         """保存AI配置"""
         config_data = {
@@ -86,53 +101,56 @@ class LocalStorage:
             'endpoint': endpoint,
             'saved_time': datetime.now().isoformat()
         }
-        
+
         try:
-            with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(config_data, f, ensure_ascii=False, indent=2)
-            return True
+            data = dict(self._load())
+            data['ai_config'] = {**data.get('ai_config', {}), self._username(): config_data}
+            return self._save(data)
         except Exception as e:
             print(f"保存AI配置失败: {e}")
             return False
-    
+
     def load_ai_config(self):
         """加载AI配置"""
-        if not self.config_file.exists():
-            return None
-        
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                config_data = json.load(f)
-            return config_data
+            return self._load().get('ai_config', {}).get(self._username())
         except Exception as e:
             print(f"加载AI配置失败: {e}")
             return None
-    
+
     def clear_ai_config(self):
         """清除AI配置"""
         try:
-            if self.config_file.exists():
-                self.config_file.unlink()
+            data = dict(self._load())
+            configs = dict(data.get('ai_config', {}))
+            if configs.pop(self._username(), None) is not None:
+                data['ai_config'] = configs
+                self._save(data)
             return True
         except Exception as e:
             print(f"清除AI配置失败: {e}")
             return False
-    
+
     # ==================== 工具方法 ====================
-    
+
+    @staticmethod
+    def _username() -> str:
+        return st.session_state.get('username', '')
+
     def _generate_token(self, username: str) -> str:
         """生成简单的token"""
         timestamp = datetime.now().isoformat()
         raw = f"{username}:{timestamp}:learning_system"
         return hashlib.sha256(raw.encode()).hexdigest()
-    
+
     def clear_all(self):
-        """清除所有本地存储"""
-        self.clear_auth()
-        self.clear_ai_config()
+        """清除当前浏览器的所有持久化数据"""
+        session_id = get_browser_session_id()
+        if session_id:
+            self.store.delete(session_id)
 
 
-# 全局实例
+# 全局实例（本身不保存数据，按当前浏览器的会话读写）
 _storage = None
 
 def get_local_storage() -> LocalStorage:
@@ -148,21 +166,18 @@ def load_api_config_to_session():
     从本地存储加载API配置到session_state
     在每个需要使用API的页面调用此函数
     """
-    import streamlit as st
-    
     # 如果session_state中已经有API Key，不需要重新加载
     if st.session_state.get('api_key'):
         return True
-    
+
     # 从本地存储加载
     storage = get_local_storage()
     config_data = storage.load_ai_config()
-    
+
     if config_data:
         st.session_state['api_key'] = config_data['api_key']
         st.session_state['api_model'] = config_data['model']
         st.session_state['api_endpoint'] = config_data.get('endpoint')
         return True
-    
-    return False
 
+    return False
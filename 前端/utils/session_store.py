@@ -0,0 +1,267 @@
+"""
+浏览器会话存储
+
+每个浏览器持有一个签名Cookie（会话ID.HMAC签名），登录状态和AI配置按会话ID保存在服务端存储中，
+由 SESSION_BACKEND 选择：
+- sqlite（默认）：SQLite（WAL模式），同一台机器上的多个Streamlit进程共用同一个数据库文件即可共享会话；
+  SQLite文件不能放在网络文件系统上共享，不适用于多台机器
+- api：保存在Django后端（users/frontend-sessions/），负载均衡后面的多个Streamlit副本共享会话；
+  所有副本和后端配置相同的 FRONTEND_SESSION_SECRET
+- 读取经过进程内TTL缓存，页面重新运行时不访问存储；其他进程/副本的修改最多延迟 SESSION_CACHE_TTL 秒可见
+"""
+
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import sqlite3
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from http.cookies import SimpleCookie
+from pathlib import Path
+from typing import Dict, Optional
+
+import streamlit as st
+import streamlit.components.v1 as components
+
+from config.settings import (
+    API_BASE_URL, SESSION_BACKEND, SESSION_CACHE_TTL, SESSION_COOKIE_MAX_AGE, SESSION_COOKIE_NAME,
+    SESSION_DB_PATH, SESSION_SECRET
+)
+from .api_client import get_http_session
+
+# 进程内缓存最多保存的会话数
+SESSION_CACHE_SIZE = 10000
+# 每写入这么多次清理一次过期会话
+PURGE_INTERVAL = 200
+# 调用后端会话接口的超时时间（秒）
+API_TIMEOUT = 5
+
+
+class SessionStore(ABC):
+    """会话存储基类"""
+
+    @abstractmethod
+    def get(self, session_id: str) -> Optional[Dict]:
+        """读取会话数据，不存在或已过期时返回None"""
+        pass
+
+    @abstractmethod
+    def set(self, session_id: str, data: Dict, max_age: int):
+        """保存会话数据，max_age 秒后过期"""
+        pass
+
+    @abstractmethod
+    def delete(self, session_id: str):
+        """删除会话"""
+        pass
+
+
+class SQLiteSessionStore(SessionStore):
+    """SQLite会话存储（每次操作使用独立连接，线程安全）"""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._writes = 0
+        with self._connect() as conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS sessions ('
+                'session_id TEXT PRIMARY KEY, data TEXT NOT NULL, expires_at REAL NOT NULL)'
+            )
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=5)
+
+    def get(self, session_id):
+        with self._connect() as conn:
+            row = conn.execute(
+                'SELECT data FROM sessions WHERE session_id = ? AND expires_at > ?',
+                (session_id, time.time())
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, session_id, data, max_age):
+        with self._connect() as conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO sessions (session_id, data, expires_at) VALUES (?, ?, ?)',
+                (session_id, json.dumps(data, ensure_ascii=False), time.time() + max_age)
+            )
+            self._writes += 1
+            if self._writes % PURGE_INTERVAL == 0:
+                conn.execute('DELETE FROM sessions WHERE expires_at <= ?', (time.time(),))
+
+    def delete(self, session_id):
+        with self._connect() as conn:
+            conn.execute('DELETE FROM sessions WHERE session_id = ?', (session_id,))
+
+
+class APISessionStore(SessionStore):
+    """
+    保存在Django后端的会话存储（多台机器部署时使用）
+
+    过期会话由后端定时运行 python manage.py clear_frontend_sessions 清理。
+    """
+
+    def __init__(self, base_url: str, secret: str):
+        self.base_url = base_url.rstrip('/')
+        self.http = get_http_session()  # 与API客户端共用进程级连接池
+        self.headers = {'X-Frontend-Secret': secret}
+
+    def _url(self, session_id):
+        return f'{self.base_url}/users/frontend-sessions/{session_id}/'
+
+    def get(self, session_id):
+        response = self.http.get(self._url(session_id), headers=self.headers, timeout=API_TIMEOUT)
+        if response.status_code == 404:
+            return None
+        response.raise_for_status()
+        return response.json()['data']['data']
+
+    def set(self, session_id, data, max_age):
+        response = self.http.put(
+            self._url(session_id), json={'data': data, 'max_age': max_age}, headers=self.headers, timeout=API_TIMEOUT
+        )
+        response.raise_for_status()
+
+    def delete(self, session_id):
+        response = self.http.delete(self._url(session_id), headers=self.headers, timeout=API_TIMEOUT)
+        response.raise_for_status()
+
+
+class CachedSessionStore(SessionStore):
+    """在任意存储前加一层进程内TTL缓存（按最近使用淘汰）"""
+
+    def __init__(self, store: SessionStore, ttl: int = SESSION_CACHE_TTL, max_size: int = SESSION_CACHE_SIZE):
+        self.store = store
+        self.ttl = ttl
+        self.max_size = max_size
+        self._entries = OrderedDict()  # session_id -> (数据, 缓存时间)
+        self._lock = threading.Lock()
+
+    def _remember(self, session_id, data):
+        with self._lock:
+            self._entries[session_id] = (data, time.monotonic())
+            self._entries.move_to_end(session_id)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def get(self, session_id):
+        with self._lock:
+            entry = self._entries.get(session_id)
+        if entry is not None and time.monotonic() - entry[1] < self.ttl:
+            return entry[0]
+        data = self.store.get(session_id)
+        self._remember(session_id, data)
+        return data
+
+    def set(self, session_id, data, max_age):
+        self.store.set(session_id, data, max_age)
+        self._remember(session_id, data)
+
+    def delete(self, session_id):
+        self.store.delete(session_id)
+        self._remember(session_id, None)
+
+
+@st.cache_resource
+def get_session_store() -> SessionStore:
+    """进程级共享的会话存储（按 SESSION_BACKEND 选择）"""
+    if SESSION_BACKEND == 'api':
+        return CachedSessionStore(APISessionStore(API_BASE_URL, _get_secret().decode('utf-8')))
+    if SESSION_BACKEND != 'sqlite':
+        raise ValueError(f'未知的 SESSION_BACKEND：{SESSION_BACKEND}（可选 sqlite、api）')
+    return CachedSessionStore(SQLiteSessionStore(SESSION_DB_PATH))
+
+
+@st.cache_resource
+def _get_secret() -> bytes:
+    """Cookie签名密钥：优先使用配置，未配置时在数据库旁生成并保存（共用数据库的进程共用密钥）"""
+    if SESSION_SECRET:
+        return SESSION_SECRET.encode('utf-8')
+    if SESSION_BACKEND == 'api':
+        # 各副本自动生成的密钥不同，签名的Cookie无法在副本之间通用
+        raise RuntimeError('SESSION_BACKEND=api 时必须配置 FRONTEND_SESSION_SECRET')
+    secret_file = Path(SESSION_DB_PATH).with_suffix('.secret')
+    if not secret_file.exists():
+        secret_file.parent.mkdir(parents=True, exist_ok=True)
+        fd = os.open(secret_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, 'w') as f:
+            f.write(secrets.token_hex(32))
+    return secret_file.read_text().strip().encode('utf-8')
+
+
+def sign_session_id(session_id: str) -> str:
+    signature = hmac.new(_get_secret(), session_id.encode('utf-8'), hashlib.sha256).hexdigest()
+    return f'{session_id}.{signature}'
+
+
+def unsign_session_id(value: str) -> Optional[str]:
+    """校验Cookie签名，成功时返回会话ID"""
+    session_id, _, signature = (value or '').partition('.')
+    if not session_id or not signature:
+        return None
+    expected = sign_session_id(session_id).partition('.')[2]
+    return session_id if hmac.compare_digest(signature, expected) else None
+
+
+def _get_request_headers():
+    """当前会话的WebSocket握手请求头"""
+    context = getattr(st, 'context', None)
+    if context is not None:
+        return context.headers
+    # Streamlit 1.37 之前没有 st.context，只能使用内部函数
+    try:
+        from streamlit.web.server.websocket_headers import _get_websocket_headers
+        return _get_websocket_headers() or {}
+    except Exception:
+        return {}
+
+
+def _read_cookie(name: str) -> Optional[str]:
+    """从当前会话的请求头中读取Cookie"""
+    headers = _get_request_headers()
+    cookies = SimpleCookie()
+    try:
+        cookies.load(headers.get('Cookie', ''))
+    except Exception:
+        return None
+    morsel = cookies.get(name)
+    return morsel.value if morsel else None
+
+
+def get_browser_session_id(create: bool = False) -> Optional[str]:
+    """
+    获取当前浏览器的会话ID
+
+    Args:
+        create: 没有会话时新建（并在下次渲染时写入Cookie）
+    """
+    session_id = st.session_state.get('browser_session_id')
+    if session_id:
+        return session_id
+
+    session_id = unsign_session_id(_read_cookie(SESSION_COOKIE_NAME))
+    if session_id is None and create:
+        session_id = secrets.token_urlsafe(32)
+        st.session_state['pending_session_cookie'] = sign_session_id(session_id)
+    if session_id:
+        st.session_state['browser_session_id'] = session_id
+    return session_id
+
+
+def sync_session_cookie():
+    """把新建的会话ID写入浏览器Cookie（不可见的组件，每个会话只执行一次）"""
+    cookie_value = st.session_state.pop('pending_session_cookie', None)
+    if not cookie_value:
+        return
+    components.html(
+        f"""<script>
+        window.parent.document.cookie = "{SESSION_COOKIE_NAME}={cookie_value}; path=/; max-age={SESSION_COOKIE_MAX_AGE}; SameSite=Lax";
+        </script>""",
+        height=0
+    )